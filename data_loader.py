@@ -1,11 +1,17 @@
 """Data Loader CLI STAC_API Ingestion Tool."""
 
+import asyncio
 import os
-from typing import Any
+import random
+import time
+from typing import Any, Iterator, Optional
 
 import click
 import orjson
-from httpx import Client
+from httpx import AsyncClient, Limits, Response, TransportError
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl", ".geojsonl", ".geojsons")
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 def load_data(filepath: str) -> dict[str, Any]:
@@ -18,11 +24,161 @@ def load_data(filepath: str) -> dict[str, Any]:
         raise click.Abort() from e
 
 
-def load_collection(client: Client, collection_id: str, data_dir: str) -> None:
+def find_feature_files(data_dir: str, exclude: Optional[str] = None) -> list[str]:
+    """Find the JSON and newline-delimited JSON files holding features, by name."""
+    exclude = os.path.abspath(exclude) if exclude else None
+    with os.scandir(data_dir) as entries:
+        return sorted(
+            entry.path
+            for entry in entries
+            if entry.is_file()
+            and entry.name != "collection.json"
+            and os.path.abspath(entry.path) != exclude
+            and (entry.name.endswith(".json") or entry.name.endswith(NDJSON_EXTENSIONS))
+        )
+
+
+def read_features(filepath: str) -> Iterator[dict[str, Any]]:
+    """Read the features of a feature collection, feature or NDJSON file."""
+    if filepath.endswith(NDJSON_EXTENSIONS):
+        # Read line by line, so that large files are never held in memory
+        with open(filepath, "rb") as file:
+            for line in file:
+                line = line.strip().lstrip(b"\x1e")
+                if line:
+                    yield orjson.loads(line)
+        return
+
+    data = load_data(filepath)
+    if data.get("type") == "FeatureCollection":
+        yield from data["features"]
+    else:
+        yield data
+
+
+def iter_batches(
+    features: Iterator[dict[str, Any]], batch_size: int, max_batch_bytes: int
+) -> Iterator[list[dict[str, Any]]]:
+    """Split features into batches bounded by a count and a serialized size."""
+    batch: list[dict[str, Any]] = []
+    batch_bytes = 0
+    for feature in features:
+        feature_bytes = len(orjson.dumps(feature))
+        if batch and (
+            len(batch) >= batch_size or batch_bytes + feature_bytes > max_batch_bytes
+        ):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(feature)
+        batch_bytes += feature_bytes
+    if batch:
+        yield batch
+
+
+class Checkpoint:
+    """Batches already loaded, kept in a file so that interrupted loads resume."""
+
+    def __init__(self, path: Optional[str], settings: dict[str, Any]):
+        """Read the checkpoint file, unless it was written with other settings."""
+        self.path = path
+        self.settings = settings
+        self.done: set[str] = set()
+        if path and os.path.exists(path):
+            data = load_data(path)
+            if data.get("settings") == settings:
+                self.done = set(data.get("done", []))
+                click.echo(f"Resuming from {path}: {len(self.done)} batches loaded")
+            else:
+                click.secho(
+                    f"Ignoring {path}, written with other settings",
+                    fg="yellow",
+                    err=True,
+                )
+
+    def add(self, key: str) -> None:
+        """Record a loaded batch."""
+        self.done.add(key)
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(
+                orjson.dumps({"settings": self.settings, "done": sorted(self.done)})
+            )
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Remove the checkpoint file once everything is loaded."""
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Stats:
+    """Counters and request latencies of a load."""
+
+    def __init__(self) -> None:
+        """Start counting."""
+        self.started = time.monotonic()
+        self.items = 0
+        self.skipped = 0
+        self.retries = 0
+        self.failed_batches = 0
+        self.latencies: list[float] = []
+
+    def percentile(self, fraction: float) -> float:
+        """Get a percentile of the request latencies, in seconds."""
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    def report(self) -> None:
+        """Print the throughput and latencies."""
+        elapsed = time.monotonic() - self.started
+        click.echo(
+            f"Loaded {self.items} items in {elapsed:.1f}s "
+            f"({self.items / elapsed if elapsed else 0:.1f} items/s), "
+            f"{self.skipped} already loaded, {len(self.latencies)} requests, "
+            f"p50 {self.percentile(0.5) * 1000:.0f} ms, "
+            f"p95 {self.percentile(0.95) * 1000:.0f} ms, "
+            f"{self.retries} retries, {self.failed_batches} failed batches"
+        )
+
+
+async def post(
+    client: AsyncClient, url: str, body: Any, stats: Stats, max_retries: int
+) -> Response:
+    """Post a JSON body, retrying 429 and 5xx responses with jittered backoff."""
+    content = orjson.dumps(body)
+    for attempt in range(max_retries + 1):
+        backoff = random.uniform(0, min(30.0, 0.5 * 2**attempt))
+        started = time.monotonic()
+        try:
+            resp = await client.post(
+                url, content=content, headers={"content-type": "application/json"}
+            )
+        except TransportError:
+            if attempt == max_retries:
+                raise
+        else:
+            stats.latencies.append(time.monotonic() - started)
+            if resp.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+                return resp
+            retry_after = resp.headers.get("retry-after", "")
+            if retry_after.isdigit():
+                backoff = max(backoff, float(retry_after))
+        stats.retries += 1
+        await asyncio.sleep(backoff)
+    raise AssertionError("max_retries must not be negative")
+
+
+async def load_collection(
+    client: AsyncClient, collection_id: str, data_dir: str
+) -> None:
     """Load a STAC collection into the database."""
     collection = load_data(os.path.join(data_dir, "collection.json"))
     collection["id"] = collection_id
-    resp = client.post("/collections", json=collection)
+    resp = await client.post("/collections", json=collection)
     if resp.status_code == 200 or resp.status_code == 201:
         click.echo(f"Status code: {resp.status_code}")
         click.echo(f"Added collection: {collection['id']}")
@@ -34,25 +190,73 @@ def load_collection(client: Client, collection_id: str, data_dir: str) -> None:
         click.echo(f"Error writing {collection['id']} collection. Message: {resp.text}")
 
 
-def load_items(
-    client: Client, collection_id: str, use_bulk: bool, data_dir: str
-) -> None:
-    """Load STAC items into the database based on the method selected."""
-    with os.scandir(data_dir) as entries:
-        # Attempt to dynamically find a suitable feature collection file
-        # Use the first found feature collection file
-        feature_file = next(
-            (
-                entry.path
-                for entry in entries
-                if entry.is_file()
-                and entry.name.endswith(".json")
-                and entry.name != "collection.json"
-            ),
-            None,
+async def load_batch(
+    client: AsyncClient,
+    collection_id: str,
+    batch: list[dict[str, Any]],
+    use_bulk: bool,
+    stats: Stats,
+    max_retries: int,
+) -> bool:
+    """Load a batch of items, in one request or one request per item."""
+    url = f"/collections/{collection_id}/items"
+    for feature in batch:
+        feature["collection"] = collection_id
+
+    if use_bulk:
+        resp = await post(
+            client,
+            url,
+            {"type": "FeatureCollection", "features": batch},
+            stats,
+            max_retries,
         )
+        if resp.status_code == 409:
+            click.echo("Conflict detected, some items might already exist.")
+            stats.skipped += len(batch)
+            return True
+        if resp.status_code not in (200, 201):
+            click.secho(
+                f"Bulk insert failed with status {resp.status_code}: {resp.text}",
+                fg="red",
+                err=True,
+            )
+            return False
+        stats.items += len(batch)
+        return True
+
+    ok = True
+    for feature in batch:
+        resp = await post(client, url, feature, stats, max_retries)
+        if resp.status_code in (200, 201):
+            stats.items += 1
+        elif resp.status_code == 409:
+            stats.skipped += 1
+        else:
+            click.secho(
+                f"Item {feature['id']} failed with status {resp.status_code}: "
+                f"{resp.text}",
+                fg="red",
+                err=True,
+            )
+            ok = False
+    return ok
+
 
-    if feature_file is None:
+async def load_items(
+    client: AsyncClient,
+    collection_id: str,
+    use_bulk: bool,
+    data_dir: str,
+    concurrency: int = 8,
+    batch_size: int = 500,
+    max_batch_bytes: int = 8 * 1024 * 1024,
+    max_retries: int = 5,
+    checkpoint_path: Optional[str] = None,
+) -> Stats:
+    """Load STAC items into the database with concurrent requests."""
+    feature_files = find_feature_files(data_dir, exclude=checkpoint_path)
+    if not feature_files:
         click.secho(
             "No feature collection files found in the specified directory.",
             fg="red",
@@ -60,46 +264,54 @@ def load_items(
         )
         raise click.Abort()
 
-    feature_collection = load_data(feature_file)
+    await load_collection(client, collection_id, data_dir)
 
-    load_collection(client, collection_id, data_dir)
-    if use_bulk:
-        load_items_bulk_insert(client, collection_id, feature_collection)
-    else:
-        load_items_one_by_one(client, collection_id, feature_collection)
+    checkpoint = Checkpoint(
+        checkpoint_path,
+        {
+            "collection_id": collection_id,
+            "batch_size": batch_size,
+            "max_batch_bytes": max_batch_bytes,
+        },
+    )
+    stats = Stats()
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks: set[asyncio.Task] = set()
 
+    async def run(key: str, batch: list[dict[str, Any]]) -> None:
+        try:
+            if await load_batch(
+                client, collection_id, batch, use_bulk, stats, max_retries
+            ):
+                checkpoint.add(key)
+            else:
+                stats.failed_batches += 1
+        except TransportError as e:
+            click.secho(f"Batch {key} failed: {e}", fg="red", err=True)
+            stats.failed_batches += 1
+        finally:
+            semaphore.release()
 
-def load_items_one_by_one(
-    client: Client, collection_id: str, feature_collection: dict[str, Any]
-) -> None:
-    """Load STAC items into the database one by one."""
-    for feature in feature_collection["features"]:
-        feature["collection"] = collection_id
-        resp = client.post(f"/collections/{collection_id}/items", json=feature)
-        if resp.status_code == 200:
-            click.echo(f"Status code: {resp.status_code}")
-            click.echo(f"Added item: {feature['id']}")
-        elif resp.status_code == 409:
-            click.echo(f"Status code: {resp.status_code}")
-            click.echo(f"Item: {feature['id']} already exists")
+    for feature_file in feature_files:
+        name = os.path.basename(feature_file)
+        for index, batch in enumerate(
+            iter_batches(read_features(feature_file), batch_size, max_batch_bytes)
+        ):
+            key = f"{name}:{index}"
+            if key in checkpoint.done:
+                stats.skipped += len(batch)
+                continue
+            # Wait for a request slot, so that files are read as fast as items are sent
+            await semaphore.acquire()
+            task = asyncio.create_task(run(key, batch))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
 
-
-def load_items_bulk_insert(
-    client: Client, collection_id: str, feature_collection: dict[str, Any]
-) -> None:
-    """Load STAC items into the database via bulk insert."""
-    for feature in feature_collection["features"]:
-        feature["collection"] = collection_id
-    resp = client.post(f"/collections/{collection_id}/items", json=feature_collection)
-    if resp.status_code == 200:
-        click.echo(f"Status code: {resp.status_code}")
-        click.echo("Bulk inserted items successfully.")
-    elif resp.status_code == 204:
-        click.echo(f"Status code: {resp.status_code}")
-        click.echo("Bulk update successful, no content returned.")
-    elif resp.status_code == 409:
-        click.echo(f"Status code: {resp.status_code}")
-        click.echo("Conflict detected, some items might already exist.")
+    if tasks:
+        await asyncio.gather(*tasks)
+    if not stats.failed_batches:
+        checkpoint.clear()
+    return stats
 
 
 @click.command()
@@ -114,12 +326,67 @@ def load_items_bulk_insert(
     "--data-dir",
     type=click.Path(exists=True),
     default="sample_data/",
-    help="Directory containing collection.json and feature collection file",
+    help="Directory containing collection.json and feature collection or NDJSON files",
+)
+@click.option(
+    "--concurrency", default=8, show_default=True, help="Requests in flight at once"
+)
+@click.option(
+    "--batch-size", default=500, show_default=True, help="Maximum items per batch"
+)
+@click.option(
+    "--max-batch-bytes",
+    default=8 * 1024 * 1024,
+    show_default=True,
+    help="Maximum serialized size of a batch",
 )
-def main(base_url: str, collection_id: str, use_bulk: bool, data_dir: str) -> None:
+@click.option(
+    "--max-retries",
+    default=5,
+    show_default=True,
+    help="Retries of requests failing with a 429 or 5xx status",
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="File recording loaded batches, to resume an interrupted load",
+)
+def main(
+    base_url: str,
+    collection_id: str,
+    use_bulk: bool,
+    data_dir: str,
+    concurrency: int,
+    batch_size: int,
+    max_batch_bytes: int,
+    max_retries: int,
+    checkpoint: Optional[str],
+) -> None:
     """Load STAC items into the database."""
-    with Client(base_url=base_url) as client:
-        load_items(client, collection_id, use_bulk, data_dir)
+
+    async def run() -> Stats:
+        async with AsyncClient(
+            base_url=base_url,
+            timeout=120,
+            limits=Limits(max_connections=concurrency),
+        ) as client:
+            return await load_items(
+                client,
+                collection_id,
+                use_bulk,
+                data_dir,
+                concurrency=concurrency,
+                batch_size=batch_size,
+                max_batch_bytes=max_batch_bytes,
+                max_retries=max_retries,
+                checkpoint_path=checkpoint,
+            )
+
+    stats = asyncio.run(run())
+    stats.report()
+    if stats.failed_batches:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+"""Benchmark the assignment of bulk items to datetime partitioned indexes.
+
+Items of a bulk insert are assigned to their index one at a time, selecting the
+indexes of every item (`_get_target_index_internal`), and in a single merge of the
+sorted items with the sorted index date ranges (`prepare_bulk_actions`). The client is
+replaced by an in-memory stand-in serving the aliases, so no cluster is needed and only
+the assignment itself is measured.
+
+Usage:
+    python scripts/benchmark_bulk_index_assignment.py --items 100000 --indexes 120
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from stac_fastapi.sfeos_helpers.database import index_alias_by_collection_id
+from stac_fastapi.sfeos_helpers.search_engine import (
+    DatetimeIndexInserter,
+    IndexOperations,
+)
+from stac_fastapi.sfeos_helpers.search_engine.selection import (
+    DatetimeBasedIndexSelector,
+)
+
+COLLECTION_ID = "benchmark"
+
+
+class Indices:
+    """Stand-in for the indices API, serving the aliases of monthly partitions."""
+
+    def __init__(self, partitions: int):
+        """Build the aliases of contiguous monthly partitions, the last open ended."""
+        collection_alias = index_alias_by_collection_id(COLLECTION_ID)
+        self.aliases: Dict[str, Any] = {}
+        start = date(2000, 1, 1)
+        for number in range(partitions):
+            next_start = (start + timedelta(days=32)).replace(day=1)
+            name = f"{collection_alias}_{start}"
+            if number < partitions - 1:
+                name += f"-{next_start - timedelta(days=1)}"
+            self.aliases[f"index-{number}"] = {
+                "aliases": {collection_alias: {}, name: {}}
+            }
+            start = next_start
+        self.end = start
+
+    async def get_alias(self, index: str) -> Dict[str, Any]:
+        """Get the aliases of every item index."""
+        return self.aliases
+
+    async def stats(self, index: str) -> Dict[str, Any]:
+        """Get the stats of an index, never oversized."""
+        return {"_all": {"primaries": {"store": {"size_in_bytes": 0}}}}
+
+
+class Client:
+    """Stand-in for the search engine client."""
+
+    def __init__(self, partitions: int):
+        """Initialize the indices API."""
+        self.indices = Indices(partitions)
+
+
+def build_items(count: int, end: date) -> List[Dict[str, Any]]:
+    """Build items spread over every partition."""
+    first = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    span = (datetime(end.year, end.month, end.day, tzinfo=timezone.utc) - first).days
+    return [
+        {
+            "id": f"item-{number}",
+            "collection": COLLECTION_ID,
+            "properties": {
+                "datetime": (
+                    first + timedelta(seconds=random.randint(0, span * 86400 - 1))
+                ).strftime("%Y-%m-%dT%H:%M:%SZ")
+            },
+        }
+        for number in range(count)
+    ]
+
+
+async def assign_per_item(
+    inserter: DatetimeIndexInserter, items: List[Dict[str, Any]]
+) -> List[str]:
+    """Assign items one at a time, as done before batching."""
+    items.sort(key=lambda item: item["properties"]["datetime"])
+    index_selector = DatetimeBasedIndexSelector(inserter.client)
+    return [
+        await inserter._get_target_index_internal(
+            index_selector, COLLECTION_ID, item, check_size=False
+        )
+        for item in items
+    ]
+
+
+async def assign_batched(
+    inserter: DatetimeIndexInserter, items: List[Dict[str, Any]]
+) -> List[str]:
+    """Assign items with a single merge pass."""
+    actions = await inserter.prepare_bulk_actions(COLLECTION_ID, items)
+    return [action["_index"] for action in actions]
+
+
+async def run(item_count: int, partitions: int, repeat: int) -> None:
+    """Benchmark both assignments, checking that they agree."""
+    client = Client(partitions)
+    inserter = DatetimeIndexInserter(client, IndexOperations())
+    items = build_items(item_count, client.indices.end)
+
+    print(f"{item_count} items over {partitions} indexes")
+    results = {}
+    for name, assign in (("per item", assign_per_item), ("batched", assign_batched)):
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            results[name] = await assign(inserter, list(items))
+            times.append(time.perf_counter() - started)
+        best = min(times)
+        print(
+            f"{name:<9} {best * 1000:>9.1f}ms "
+            f"{best / item_count * 1_000_000:>7.2f}us/item"
+        )
+    assert results["per item"] == results["batched"]
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--indexes", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    asyncio.run(run(args.items, args.indexes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
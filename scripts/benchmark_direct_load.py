@@ -0,0 +1,117 @@
+"""Benchmark loading items directly into the cluster against loading them through the API.
+
+The same generated items are loaded into two new collections, once with the bulk
+requests of `data_loader.py` to a running API, and once with `load_items.py` writing to
+the cluster of that API. The API and the loader must be configured with the same
+search engine.
+
+Usage:
+    python scripts/benchmark_direct_load.py --backend elasticsearch \
+        --base-url http://localhost:8080 --items 100000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Dict
+
+import orjson
+from httpx import AsyncClient, Limits
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import load_items  # noqa: E402
+
+import data_loader  # noqa: E402
+
+SAMPLE_DATA = os.path.join(os.path.dirname(data_loader.__file__), "sample_data")
+
+
+def write_items(data_dir: str, count: int) -> None:
+    """Write the collection and items, copies of the sample items with new ids."""
+    with open(os.path.join(SAMPLE_DATA, "collection.json"), "rb") as file:
+        collection = orjson.loads(file.read())
+    with open(
+        os.path.join(SAMPLE_DATA, "sentinel-s2-l2a-cogs_0_100.json"), "rb"
+    ) as file:
+        features = orjson.loads(file.read())["features"]
+
+    with open(os.path.join(data_dir, "collection.json"), "wb") as file:
+        file.write(orjson.dumps(collection))
+    with open(os.path.join(data_dir, "items.ndjson"), "wb") as file:
+        for number in range(count):
+            feature: Dict[str, Any] = dict(features[number % len(features)])
+            feature["id"] = f"{feature['id']}-{number}"
+            file.write(orjson.dumps(feature) + b"\n")
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Load the items both ways and compare the throughputs."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_items(data_dir, args.items)
+        suffix = uuid.uuid4().hex[:8]
+        http_collection = f"benchmark-http-{suffix}"
+        direct_collection = f"benchmark-direct-{suffix}"
+
+        async with AsyncClient(
+            base_url=args.base_url,
+            timeout=120,
+            limits=Limits(max_connections=args.concurrency),
+        ) as client:
+            started = time.monotonic()
+            stats = await data_loader.load_items(
+                client,
+                http_collection,
+                True,
+                data_dir,
+                concurrency=args.concurrency,
+                batch_size=args.batch_size,
+            )
+            http_elapsed = time.monotonic() - started
+            # The direct loader writes to an existing collection
+            await data_loader.load_collection(client, direct_collection, data_dir)
+
+        started = time.monotonic()
+        progress = await load_items.load(
+            args.backend,
+            direct_collection,
+            [os.path.join(data_dir, "items.ndjson")],
+            base_url=args.base_url,
+            workers=args.workers,
+            writers=args.concurrency,
+            chunk_size=args.batch_size,
+        )
+        direct_elapsed = time.monotonic() - started
+
+    print(f"{args.items} items, {args.concurrency} requests in flight")
+    for name, written, elapsed in (
+        ("http", stats.items, http_elapsed),
+        ("direct", progress.written, direct_elapsed),
+    ):
+        print(
+            f"{name:<7} {elapsed:>8.1f}s {written / elapsed:>10.0f} items/s "
+            f"({written} written)"
+        )
+    print(f"speedup {http_elapsed / direct_elapsed:.2f}x")
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--backend", choices=("elasticsearch", "opensearch"), required=True
+    )
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
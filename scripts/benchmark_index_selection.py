@@ -0,0 +1,101 @@
+"""Benchmark datetime based index selection.
+
+Selects the indexes of a collection overlapping datetime filters by parsing every index
+name (`filter_indexes_by_datetime`) and with a binary search over the date ranges
+parsed once when the aliases are loaded (`IndexIntervals`). No cluster is needed.
+
+Usage:
+    python scripts/benchmark_index_selection.py --indexes 10000 --iterations 200
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Optional, Tuple
+
+from stac_fastapi.sfeos_helpers.database import (
+    IndexIntervals,
+    filter_indexes_by_datetime,
+)
+
+
+def build_indexes(count: int) -> List[str]:
+    """Build the aliases of contiguous weekly partitions, the last one open ended."""
+    indexes = []
+    start = date(1900, 1, 1)
+    for _ in range(count - 1):
+        end = start + timedelta(days=6)
+        indexes.append(f"items_benchmark_{start}-{end}")
+        start = end + timedelta(days=1)
+    indexes.append(f"items_benchmark_{start}")
+    return indexes
+
+
+def build_filters(
+    indexes: List[str], count: int
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Build datetime filters spanning from a day to a year of partitions."""
+    first = date(1900, 1, 1)
+    last = first + timedelta(weeks=len(indexes))
+    filters = []
+    for _ in range(count):
+        start = first + timedelta(days=random.randint(0, (last - first).days))
+        end = start + timedelta(days=random.choice([0, 30, 365]))
+        filters.append((f"{start}T00:00:00Z", f"{end}T23:59:59Z"))
+    return filters
+
+
+def measure(select: Callable[[], object], iterations: int) -> List[float]:
+    """Run a selection repeatedly, returning the times in microseconds."""
+    times = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        select()
+        times.append((time.perf_counter() - started) * 1_000_000)
+    return times
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--indexes", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    indexes = build_indexes(args.indexes)
+    filters = build_filters(indexes, args.iterations)
+
+    started = time.perf_counter()
+    intervals = IndexIntervals(indexes)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    for gte, lte in filters:
+        assert sorted(intervals.select(gte, lte)) == sorted(
+            filter_indexes_by_datetime(indexes, gte, lte)
+        )
+
+    variants = {
+        "parse every index": lambda gte, lte: filter_indexes_by_datetime(
+            indexes, gte, lte
+        ),
+        "sorted intervals": intervals.select,
+    }
+    print(f"{len(indexes)} indexes, intervals built once in {build_ms:.1f}ms")
+    print(f"{'variant':<18} {'p50':>10} {'p95':>10}")
+    for name, select in variants.items():
+        times = []
+        for gte, lte in filters:
+            times.extend(measure(lambda: select(gte, lte), 1))
+        times.sort()
+        print(
+            f"{name:<18} {statistics.median(times):>8.1f}us "
+            f"{times[min(len(times) - 1, int(len(times) * 0.95))]:>8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Benchmark item searches with and without query compilation.
+
+Every search is built with the filters of the API, then sent to the cluster as built
+by the `apply_*_filter` methods (scoring context, nested bool queries) and as compiled
+by `compile_query` (filter context, flattened bool queries, merged ranges). The shard
+request cache is bypassed so that only query execution is measured.
+
+Usage:
+    python scripts/benchmark_query_compilation.py --backend elasticsearch --iterations 200
+"""
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from stac_fastapi.sfeos_helpers.database.query import compile_query
+from stac_fastapi.sfeos_helpers.mappings import DEFAULT_SORT, ITEM_INDICES
+
+BACKENDS = {
+    "elasticsearch": "stac_fastapi.elasticsearch.database_logic",
+    "opensearch": "stac_fastapi.opensearch.database_logic",
+}
+
+
+def build_searches(database) -> Dict[str, Any]:
+    """Build representative searches with the filters of the API."""
+    searches = {}
+
+    search = database.make_search()
+    search = database.apply_stacql_filter(
+        search, op="gte", field="properties__eo:cloud_cover", value=0
+    )
+    search = database.apply_stacql_filter(
+        search, op="lte", field="properties__eo:cloud_cover", value=50
+    )
+    searches["query ranges"] = search
+
+    search, _ = database.apply_datetime_filter(
+        database.make_search(), "2000-01-01T00:00:00Z/2030-01-01T00:00:00Z"
+    )
+    searches["datetime interval"] = search
+
+    search = database.apply_bbox_filter(database.make_search(), [-180, -90, 180, 90])
+    search, _ = database.apply_datetime_filter(
+        search, "2000-01-01T00:00:00Z/2030-01-01T00:00:00Z"
+    )
+    search = database.apply_stacql_filter(
+        search, op="lte", field="properties__eo:cloud_cover", value=80
+    )
+    searches["bbox, datetime and query"] = search
+
+    search = database.apply_free_text_filter(database.make_search(), ["landsat"])
+    search, _ = database.apply_datetime_filter(
+        search, "2000-01-01T00:00:00Z/2030-01-01T00:00:00Z"
+    )
+    searches["free text and datetime"] = search
+
+    return searches
+
+
+async def run_search(
+    client, backend: str, query: Optional[Dict[str, Any]], limit: int
+) -> Tuple[float, int]:
+    """Run a search, returning the wall time in milliseconds and the cluster `took`."""
+    started = time.perf_counter()
+    if backend == "elasticsearch":
+        response = await client.search(
+            index=ITEM_INDICES,
+            query=query,
+            sort=DEFAULT_SORT,
+            size=limit,
+            request_cache=False,
+        )
+    else:
+        body: Dict[str, Any] = {"sort": DEFAULT_SORT}
+        if query:
+            body["query"] = query
+        response = await client.search(
+            index=ITEM_INDICES, body=body, size=limit, request_cache=False
+        )
+    return (time.perf_counter() - started) * 1000, response["took"]
+
+
+async def measure(
+    run: Callable[[], Any], iterations: int, warmup: int
+) -> Tuple[List[float], List[int]]:
+    """Run a search repeatedly, returning the wall times and `took` values."""
+    for _ in range(warmup):
+        await run()
+    wall_times, took = [], []
+    for _ in range(iterations):
+        wall_time, took_ms = await run()
+        wall_times.append(wall_time)
+        took.append(took_ms)
+    return wall_times, took
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run(backend: str, iterations: int, warmup: int, limit: int) -> None:
+    """Benchmark every search with the raw and the compiled query."""
+    database = importlib.import_module(BACKENDS[backend]).DatabaseLogic()
+    client = database.client
+
+    print(
+        f"{'search':<28} {'variant':<9} {'took p50':>9} {'took p95':>9} "
+        f"{'wall p50':>9} {'wall p95':>9}"
+    )
+    try:
+        for name, search in build_searches(database).items():
+            raw = search.query.to_dict() if search.query else None
+            variants = {"raw": raw, "compiled": compile_query(raw)}
+            for variant, query in variants.items():
+                wall_times, took = await measure(
+                    lambda query=query: run_search(client, backend, query, limit),
+                    iterations,
+                    warmup,
+                )
+                print(
+                    f"{name:<28} {variant:<9} "
+                    f"{statistics.median(took):>7.1f}ms {percentile(took, 0.95):>7.1f}ms "
+                    f"{statistics.median(wall_times):>7.1f}ms "
+                    f"{percentile(wall_times, 0.95):>7.1f}ms"
+                )
+    finally:
+        await client.close()
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="elasticsearch")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.backend, args.iterations, args.warmup, args.limit))
+
+
+if __name__ == "__main__":
+    main()
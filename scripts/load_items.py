@@ -0,0 +1,338 @@
+"""Load STAC item files directly into Elasticsearch/OpenSearch, bypassing the API.
+
+Backfills through the API spend most of their CPU on parsing requests. This loader
+decodes item files and serializes the items with `ItemSerializer.stac_to_db` in a pool
+of worker processes, and writes them with the concurrent bulk requests of
+`DatabaseLogic.bulk_async`, so that items get the index of the configured
+`IndexInsertionFactory` strategy and the ids of `mk_item_id`, as when inserted through
+the API. Serialized items wait in a bounded queue, which holds the workers back while
+the bulk writers catch up.
+
+Item files hold a feature collection, a feature, or newline-delimited features
+(`.ndjson`, `.jsonl`). Newline-delimited files are split into byte ranges decoded by
+different workers. The collection must exist, the engine is configured with the
+environment variables of the API.
+
+Usage:
+    python scripts/load_items.py --backend elasticsearch --collection-id my-collection \
+        --workers 8 /data/items/*.ndjson
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import orjson
+
+from stac_fastapi.core.core import check_ingested_item, get_bulk_failures
+from stac_fastapi.core.serializers import ItemSerializer
+from stac_fastapi.types.stac import Item
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl", ".geojsonl", ".geojsons")
+
+# A task reads a byte range of a file, or a whole file if the range ends at -1
+Task = Tuple[str, int, int]
+
+
+def split_files(paths: List[str], task_bytes: int) -> Iterator[Task]:
+    """Split item files into the byte ranges decoded by the workers."""
+    for path in paths:
+        if not path.endswith(NDJSON_EXTENSIONS):
+            yield path, 0, -1
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, size, task_bytes):
+            yield path, start, min(start + task_bytes, size)
+
+
+def read_lines(path: str, start: int, end: int) -> Iterator[bytes]:
+    """Read the non-empty lines of a byte range of a newline-delimited file.
+
+    A line belongs to the range its first byte is in, so that ranges split in the
+    middle of a line read it once.
+    """
+    with open(path, "rb") as file:
+        if start:
+            file.seek(start - 1)
+            file.readline()
+        while file.tell() < end:
+            line = file.readline()
+            if not line:
+                break
+            line = line.strip().lstrip(b"\x1e")
+            if line:
+                yield line
+
+
+def serialize_task(
+    task: Task, collection_id: str, base_url: str, serializer: Type[ItemSerializer]
+) -> Tuple[List[Item], List[str]]:
+    """Decode and serialize the items of a task, in a worker process.
+
+    Returns:
+        Tuple[List[Item], List[str]]: The serialized items, and the reasons the invalid
+            features were skipped.
+    """
+    path, start, end = task
+    features: Iterable[Any]
+    if end == -1:
+        with open(path, "rb") as file:
+            data = orjson.loads(file.read())
+        features = (
+            data["features"] if data.get("type") == "FeatureCollection" else [data]
+        )
+    else:
+        features = read_lines(path, start, end)
+
+    items = []
+    invalid = []
+    for feature in features:
+        try:
+            if isinstance(feature, bytes):
+                feature = orjson.loads(feature)
+            item = check_ingested_item(feature, collection_id)
+        except ValueError as e:
+            invalid.append(f"{path}: {e}")
+            continue
+        items.append(serializer.stac_to_db(item, base_url))
+    return items, invalid
+
+
+class Progress:
+    """Counters of a load, printed as chunks are written."""
+
+    def __init__(self, interval: float):
+        """Start counting."""
+        self.started = time.monotonic()
+        self.interval = interval
+        self.printed = self.started
+        self.written = 0
+        self.failed = 0
+        self.invalid = 0
+
+    @property
+    def rate(self) -> float:
+        """Get the items written per second."""
+        elapsed = time.monotonic() - self.started
+        return self.written / elapsed if elapsed else 0.0
+
+    async def on_chunk(self, written: int, errors: List[Dict[str, Any]]) -> None:
+        """Count a written chunk, and print the progress now and then."""
+        self.written += written
+        self.failed += len(errors)
+        for failure in get_bulk_failures(errors)[:3]:
+            print(f"Item {failure['id']} failed: {failure['reason']}")
+        now = time.monotonic()
+        if now - self.printed >= self.interval:
+            self.printed = now
+            self.report()
+
+    def report(self) -> None:
+        """Print the counters and the throughput."""
+        print(
+            f"{self.written} items written, {self.failed} failed, "
+            f"{self.invalid} invalid in {time.monotonic() - self.started:.1f}s "
+            f"({self.rate:.0f} items/s)"
+        )
+
+
+async def serialized_items(
+    tasks: Iterator[Task],
+    collection_id: str,
+    base_url: str,
+    serializer: Type[ItemSerializer],
+    workers: int,
+    queue_size: int,
+    progress: Progress,
+) -> AsyncIterator[Item]:
+    """Serialize the items of every task in worker processes.
+
+    At most `queue_size` serialized tasks wait for the bulk writers, besides those
+    being serialized, so that memory use does not depend on the size of the load.
+    """
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Optional[asyncio.Future]]" = asyncio.Queue(queue_size)
+
+    async def submit(executor: ProcessPoolExecutor) -> None:
+        for task in tasks:
+            # Waits while the queue is full, holding back the workers
+            await queue.put(
+                loop.run_in_executor(
+                    executor,
+                    serialize_task,
+                    task,
+                    collection_id,
+                    base_url,
+                    serializer,
+                )
+            )
+        await queue.put(None)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        submitter = asyncio.ensure_future(submit(executor))
+        try:
+            while True:
+                future = await queue.get()
+                if future is None:
+                    break
+                items, invalid = await future
+                progress.invalid += len(invalid)
+                for reason in invalid[:3]:
+                    print(f"Invalid feature skipped, {reason}")
+                for item in items:
+                    yield item
+            await submitter
+        finally:
+            submitter.cancel()
+
+
+def get_database_module(backend: str) -> Any:
+    """Import the database logic of a backend."""
+    if backend == "elasticsearch":
+        from stac_fastapi.elasticsearch import database_logic
+    else:
+        from stac_fastapi.opensearch import database_logic
+    return database_logic
+
+
+async def load(
+    backend: str,
+    collection_id: str,
+    paths: List[str],
+    base_url: str = "http://localhost:8080/",
+    workers: Optional[int] = None,
+    writers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    task_bytes: int = 4 * 1024 * 1024,
+    queue_size: Optional[int] = None,
+    exist_ok: bool = True,
+    ingest_mode: bool = False,
+    progress_interval: float = 10.0,
+) -> Progress:
+    """Load item files into a collection, without going through the API.
+
+    Args:
+        backend (str): `elasticsearch` or `opensearch`.
+        collection_id (str): The collection of the items, which must exist.
+        paths (List[str]): The item files.
+        base_url (str): Base URL of the API, removed from the links of the items.
+        workers (Optional[int]): Worker processes decoding and serializing items,
+            every CPU by default.
+        writers (Optional[int]): Bulk requests in flight, `BULK_CONCURRENCY` by default.
+        chunk_size (Optional[int]): Items per bulk request, `BULK_CHUNK_SIZE` by default.
+        task_bytes (int): Size of the ranges newline-delimited files are split into.
+        queue_size (Optional[int]): Serialized ranges waiting for the writers, twice the
+            number of workers by default.
+        exist_ok (bool): Whether existing items are replaced, rather than reported as
+            failed.
+        ingest_mode (bool): Whether the collection is put in ingest mode while loading,
+            suspending the refreshes and replicas of its indexes.
+        progress_interval (float): Seconds between progress reports.
+
+    Returns:
+        Progress: The counters of the load.
+    """
+    database_logic = get_database_module(backend)
+    workers = workers or os.cpu_count() or 1
+
+    await database_logic.create_index_templates()
+    await database_logic.create_collection_index()
+    database = database_logic.DatabaseLogic()
+    changes = {"concurrency": writers, "chunk_size": chunk_size}
+    database.bulk_settings = database.bulk_settings.replace(
+        **{name: value for name, value in changes.items() if value}
+    )
+    progress = Progress(progress_interval)
+    try:
+        await database.check_collection_exists(collection_id)
+        items = serialized_items(
+            split_files(paths, task_bytes),
+            collection_id,
+            base_url,
+            database.item_serializer,
+            workers,
+            queue_size or 2 * workers,
+            progress,
+        )
+        if ingest_mode:
+            async with database.ingest_mode.session(collection_id):
+                await database.bulk_async(
+                    collection_id,
+                    items,
+                    exist_ok=exist_ok,
+                    on_chunk=progress.on_chunk,
+                    refresh=False,
+                )
+        else:
+            await database.bulk_async(
+                collection_id,
+                items,
+                exist_ok=exist_ok,
+                on_chunk=progress.on_chunk,
+                refresh=False,
+            )
+    finally:
+        await database.client.close()
+    return progress
+
+
+def main() -> None:
+    """Parse the arguments and run the load."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("paths", nargs="+", help="Item files")
+    parser.add_argument(
+        "--backend", choices=("elasticsearch", "opensearch"), required=True
+    )
+    parser.add_argument("--collection-id", required=True)
+    parser.add_argument("--base-url", default="http://localhost:8080/")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--writers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--task-bytes", type=int, default=4 * 1024 * 1024)
+    parser.add_argument("--queue-size", type=int, default=None)
+    parser.add_argument(
+        "--no-overwrite",
+        action="store_true",
+        help="Report existing items as failed instead of replacing them",
+    )
+    parser.add_argument(
+        "--ingest-mode",
+        action="store_true",
+        help="Suspend refreshes and replicas of the collection indexes while loading",
+    )
+    args = parser.parse_args()
+    progress = asyncio.run(
+        load(
+            args.backend,
+            args.collection_id,
+            args.paths,
+            base_url=args.base_url,
+            workers=args.workers,
+            writers=args.writers,
+            chunk_size=args.chunk_size,
+            task_bytes=args.task_bytes,
+            queue_size=args.queue_size,
+            exist_ok=not args.no_overwrite,
+            ingest_mode=args.ingest_mode,
+        )
+    )
+    progress.report()
+    if progress.failed or progress.invalid:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
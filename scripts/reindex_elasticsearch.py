@@ -1,84 +1,65 @@
-import asyncio
-import time
-
-from stac_fastapi.elasticsearch.config import AsyncElasticsearchSettings
-from stac_fastapi.elasticsearch.database_logic import create_index_templates
-from stac_fastapi.sfeos_helpers.mappings import COLLECTIONS_INDEX, ITEMS_INDEX_PREFIX
-
-
-async def reindex(client, index, new_index, aliases):
-    """Reindex STAC index"""
-    print(f"reindexing {index} to {new_index}")
+"""Reindex every STAC index into a new version, to apply mapping changes.
 
-    await client.options(ignore_status=400).indices.create(index=new_index)
+Indexes are copied with concurrent sliced reindex tasks, assets are converted to the
+list stored by `STAC_INDEX_ASSETS` and items get the temporal range field used by
+datetime filters. Aliases are moved to the new indexes once all are reindexed. An
+interrupted run resumes from the state file when started again.
 
-    reindex_resp = await client.reindex(
-        dest={"index": new_index},
-        source={"index": [index]},
-        wait_for_completion=False,
-        script={
-            "source": "if (ctx._source.containsKey('assets')){List l = new ArrayList();for (key in ctx._source.assets.keySet()) {def item = ctx._source.assets[key]; item['es_key'] = key; l.add(item)}ctx._source.assets=l} if (ctx._source.containsKey('item_assets')){ List a = new ArrayList(); for (key in ctx._source.item_assets.keySet()) {def item = ctx._source.item_assets[key]; item['es_key'] = key; a.add(item)}ctx._source.item_assets=a}",
-            "lang": "painless",
-        },
-    )
+Usage:
+    python scripts/reindex_elasticsearch.py --workers 4 --requests-per-second 5000
+"""
 
-    task_id = reindex_resp["task"]
-
-    reindex_complete = False
-    while not reindex_complete:
-        task_resp = await client.tasks.get(task_id=task_id)
-
-        if "completed" in task_resp and task_resp["completed"]:
-            reindex_complete = True
-
-        elif "error" in task_resp:
-            reindex_complete = True
-            print(f"Reindex failed for {index} with error: {task_resp['error']}")
-
-        else:
-            time.sleep(60)
+import argparse
+import asyncio
+import logging
 
-    actions = []
-    for alias in aliases["aliases"]:
-        actions.extend(
-            [
-                {"add": {"index": new_index, "alias": alias}},
-                {"remove": {"index": index, "alias": alias}},
-            ]
-        )
+from stac_fastapi.elasticsearch.config import AsyncElasticsearchSettings
+from stac_fastapi.elasticsearch.database_logic import create_index_templates
+from stac_fastapi.sfeos_helpers.database import TEMPORAL_RANGE_SCRIPT
+from stac_fastapi.sfeos_helpers.search_engine import ReindexOrchestrator, plan_reindex
 
-    await client.indices.update_aliases(actions=actions)
+ASSETS_SCRIPT = "if (ctx._source.containsKey('assets') && ctx._source.assets instanceof Map){List l = new ArrayList();for (key in ctx._source.assets.keySet()) {def item = ctx._source.assets[key]; item['es_key'] = key; l.add(item)}ctx._source.assets=l} if (ctx._source.containsKey('item_assets') && ctx._source.item_assets instanceof Map){ List a = new ArrayList(); for (key in ctx._source.item_assets.keySet()) {def item = ctx._source.item_assets[key]; item['es_key'] = key; a.add(item)}ctx._source.item_assets=a}"
 
 
-async def run():
-    """Reindex all STAC indexes for mapping update"""
+async def run(args: argparse.Namespace) -> bool:
+    """Reindex all STAC indexes for mapping update."""
     client = AsyncElasticsearchSettings().create_client
-
-    await create_index_templates()
-
-    collection_response = await client.indices.get_alias(name=COLLECTIONS_INDEX)
-    collections = await client.search(index=COLLECTIONS_INDEX)
-
-    collection_index, collection_aliases = next(iter(collection_response.items()))
-    collection_index_name, version = collection_index.rsplit("-", 1)
-    new_collection_index = f"{collection_index_name}-{str(int(version) + 1).zfill(6)}"
-
-    await reindex(client, collection_index, new_collection_index, collection_aliases)
-
-    for collection in collections["hits"]["hits"]:
-
-        item_indexes = await client.indices.get_alias(
-            name=f"{ITEMS_INDEX_PREFIX}{collection['_id']}*"
+    try:
+        await create_index_templates()
+        jobs = await plan_reindex(
+            client,
+            collections_script=ASSETS_SCRIPT,
+            # Items also get the temporal range field used by datetime filters
+            items_script=ASSETS_SCRIPT + TEMPORAL_RANGE_SCRIPT,
         )
-
-        for item_index, aliases in item_indexes.items():
-            item_index_name, version = item_index.rsplit("-", 1)
-            new_item_index = f"{item_index_name}-{str(int(version) + 1).zfill(6)}"
-
-            await reindex(client, item_index, new_item_index, aliases)
-
-    await client.close()
+        orchestrator = ReindexOrchestrator(
+            client,
+            workers=args.workers,
+            requests_per_second=args.requests_per_second,
+            slices=args.slices,
+            poll_interval=args.poll_interval,
+            state_path=args.state,
+        )
+        return await orchestrator.run(jobs)
+    finally:
+        await client.close()
+
+
+def main() -> None:
+    """Parse the arguments and run the reindex."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests-per-second", type=float, default=None)
+    parser.add_argument("--slices", default="auto")
+    parser.add_argument("--poll-interval", type=float, default=10.0)
+    parser.add_argument("--state", default="reindex-state.json")
+    args = parser.parse_args()
+    if args.slices != "auto":
+        args.slices = int(args.slices)
+    logging.basicConfig(level=logging.INFO)
+    if not asyncio.run(run(args)):
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
-    asyncio.run(run())
+    main()
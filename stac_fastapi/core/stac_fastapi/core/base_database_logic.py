@@ -115,6 +115,11 @@ class BaseDatabaseLogic(abc.ABC):
         """Patch a collection in the database follows RF6902."""
         pass
 
+    @abc.abstractmethod
+    async def check_collection_exists(self, collection_id: str) -> None:
+        """Check that a collection exists in the database."""
+        pass
+
     @abc.abstractmethod
     async def find_collection(self, collection_id: str) -> Dict:
         """Find a collection in the database."""
@@ -126,3 +131,20 @@ class BaseDatabaseLogic(abc.ABC):
     ) -> None:
         """Delete a collection from the database."""
         pass
+
+    @abc.abstractmethod
+    async def start_ingest_mode(
+        self, collection_id: str, timeout: Optional[float] = None
+    ) -> Dict:
+        """Put a collection in ingest mode for a bulk load."""
+        pass
+
+    @abc.abstractmethod
+    async def stop_ingest_mode(self, collection_id: str) -> Dict:
+        """Take a collection out of ingest mode."""
+        pass
+
+    @abc.abstractmethod
+    async def get_ingest_mode(self, collection_id: str) -> Dict:
+        """Get the status of the ingest mode of a collection."""
+        pass
@@ -1,11 +1,12 @@
 """Core client."""
 
+import asyncio
 import logging
 import os
 from datetime import datetime as datetime_type
 from datetime import timezone
 from enum import Enum
-from typing import List, Optional, Set, Type, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Type, Union
 from urllib.parse import unquote_plus, urljoin
 
 import attr
@@ -23,10 +24,14 @@ from stac_pydantic.version import STAC_VERSION
 from stac_fastapi.core.base_database_logic import BaseDatabaseLogic
 from stac_fastapi.core.base_settings import ApiBaseSettings
 from stac_fastapi.core.datetime_utils import format_datetime_range
-from stac_fastapi.core.models.links import PagingLinks
+from stac_fastapi.core.models.links import BatchSearchLinks, PagingLinks
 from stac_fastapi.core.serializers import CollectionSerializer, ItemSerializer
 from stac_fastapi.core.session import Session
-from stac_fastapi.core.utilities import filter_fields
+from stac_fastapi.core.utilities import (
+    filter_fields,
+    get_bool_env,
+    source_filtered_include,
+)
 from stac_fastapi.extensions.core.transaction import AsyncBaseTransactionsClient
 from stac_fastapi.extensions.core.transaction.request import (
     PartialCollection,
@@ -34,6 +39,7 @@ from stac_fastapi.extensions.core.transaction.request import (
     PatchOperation,
 )
 from stac_fastapi.extensions.third_party.bulk_transactions import (
+    AsyncBaseBulkTransactionsClient,
     BaseBulkTransactionsClient,
     BulkTransactionMethod,
     Items,
@@ -51,6 +57,96 @@ partialItemValidator = TypeAdapter(PartialItem)
 partialCollectionValidator = TypeAdapter(PartialCollection)
 
 
+def get_bulk_failures(errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Get the items a bulk request failed to write.
+
+    Args:
+        errors (List[Dict[str, Any]]): Errors returned by the bulk methods of the
+            database, each keyed by the operation type.
+
+    Returns:
+        List[Dict[str, Any]]: The `id`, `status` and `reason` of every failed item.
+    """
+    failures = []
+    for error in errors:
+        for result in error.values():
+            reason = result.get("error")
+            if isinstance(reason, dict):
+                reason = reason.get("type")
+            failures.append(
+                {
+                    "id": str(result.get("_id", "")).rsplit("|", 1)[0],
+                    "status": result.get("status"),
+                    "reason": reason,
+                }
+            )
+    return failures
+
+
+def describe_bulk_errors(errors: List[Dict[str, Any]], limit: int = 10) -> str:
+    """Describe the items a bulk request failed to write.
+
+    Args:
+        errors (List[Dict[str, Any]]): Errors returned by the bulk methods of the
+            database, each keyed by the operation type.
+        limit (int): Maximum number of items listed.
+
+    Returns:
+        str: The ids of the failed items, with their status and reason.
+    """
+    failures = [
+        f"{failure['id']} ({failure['status']}: {failure['reason']})"
+        for failure in get_bulk_failures(errors[:limit])
+    ]
+    if len(errors) > limit:
+        failures.append(f"and {len(errors) - limit} more")
+    return "Failed items: " + ", ".join(failures) + "."
+
+
+def check_ingested_item(item: Any, collection_id: str) -> stac_types.Item:
+    """Check that a parsed feature can be inserted in a collection.
+
+    Features are not validated with pydantic, which is too slow for large uploads,
+    only the fields the database relies on are checked.
+
+    Args:
+        item (Any): The parsed feature.
+        collection_id (str): The collection it is inserted in.
+
+    Returns:
+        stac_types.Item: The item, with its collection set if missing.
+
+    Raises:
+        ValueError: If the feature cannot be inserted.
+    """
+    if not isinstance(item, dict) or item.get("type") != "Feature":
+        raise ValueError("Not a GeoJSON Feature")
+    if not isinstance(item.get("id"), str) or not item["id"]:
+        raise ValueError("Missing id")
+    if not isinstance(item.get("properties"), dict):
+        raise ValueError(f"Item {item['id']} has no properties")
+    item.setdefault("collection", collection_id)
+    if item["collection"] != collection_id:
+        raise ValueError(
+            f"Item {item['id']} belongs to collection {item['collection']}, "
+            f"not {collection_id}"
+        )
+    return item
+
+
+def search_error(error: Exception) -> Dict[str, Any]:
+    """Describe why a search failed, in the format of API error responses.
+
+    Args:
+        error (Exception): The exception the search failed with.
+
+    Returns:
+        Dict[str, Any]: The error `code` and `description`.
+    """
+    description = error.detail if isinstance(error, HTTPException) else error
+    return {"code": type(error).__name__, "description": str(description)}
+
+
 @attr.s
 class CoreClient(AsyncBaseCoreClient):
     """Client for core endpoints defined by the STAC specification.
@@ -371,7 +467,7 @@ class CoreClient(AsyncBaseCoreClient):
             HTTPException: 404 if the collection does not exist.
         """
         try:
-            await self.get_collection(collection_id=collection_id, request=request)
+            await self.database.check_collection_exists(collection_id=collection_id)
         except Exception:
             raise HTTPException(status_code=404, detail="Collection not found")
 
@@ -428,6 +524,7 @@ class CoreClient(AsyncBaseCoreClient):
         intersects: Optional[str] = None,
         filter_expr: Optional[str] = None,
         filter_lang: Optional[str] = None,
+        number_matched: Optional[str] = None,
         **kwargs,
     ) -> stac_types.ItemCollection:
         """Get search results from the database.
@@ -444,6 +541,7 @@ class CoreClient(AsyncBaseCoreClient):
             sortby (Optional[str]): Sorting options for the results.
             q (Optional[List[str]]): Free text query to filter the results.
             intersects (Optional[str]): GeoJSON geometry to search in.
+            number_matched (Optional[str]): How numberMatched is computed, set by the numberMatched extension.
             kwargs: Additional parameters to be passed to the API.
 
         Returns:
@@ -467,6 +565,9 @@ class CoreClient(AsyncBaseCoreClient):
         if datetime:
             base_args["datetime"] = format_datetime_range(date_str=datetime)
 
+        if number_matched:
+            base_args["number_matched"] = number_matched
+
         if intersects:
             base_args["intersects"] = orjson.loads(unquote_plus(intersects))
 
@@ -512,24 +613,23 @@ class CoreClient(AsyncBaseCoreClient):
 
         return resp
 
-    async def post_search(
-        self, search_request: BaseSearchPostRequest, request: Request
-    ) -> stac_types.ItemCollection:
+    async def build_search(
+        self, search_request: BaseSearchPostRequest
+    ) -> Tuple[Any, Dict[str, Optional[str]], Optional[Dict[str, Dict[str, str]]]]:
         """
-        Perform a POST search on the catalog.
+        Build the database search for a search request.
 
         Args:
             search_request (BaseSearchPostRequest): Request object that includes the parameters for the search.
-            kwargs: Keyword arguments passed to the function.
 
         Returns:
-            ItemCollection: A collection of items matching the search criteria.
+            Tuple[Any, Dict[str, Optional[str]], Optional[Dict[str, Dict[str, str]]]]: The database search
+                with every filter of the request applied, the datetime range used for index selection,
+                and the sort to apply.
 
         Raises:
-            HTTPException: If there is an error with the cql2_json filter.
+            HTTPException: If a filter of the request is invalid.
         """
-        base_url = str(request.base_url)
-
         search = self.database.make_search()
 
         if search_request.ids:
@@ -585,7 +685,9 @@ class CoreClient(AsyncBaseCoreClient):
 
         if cql2_filter is not None:
             try:
-                search = await self.database.apply_cql2_filter(search, cql2_filter)
+                search = await self.database.apply_cql2_filter(
+                    search, cql2_filter, collection_ids=search_request.collections
+                )
             except Exception as e:
                 raise HTTPException(
                     status_code=400, detail=f"Error with cql2_json filter: {e}"
@@ -604,6 +706,49 @@ class CoreClient(AsyncBaseCoreClient):
         if hasattr(search_request, "sortby") and getattr(search_request, "sortby"):
             sort = self.database.populate_sort(getattr(search_request, "sortby"))
 
+        return search, datetime_search, sort
+
+    def get_fields(
+        self, search_request: BaseSearchPostRequest
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Get the fields to include and exclude requested by a search.
+
+        Args:
+            search_request (BaseSearchPostRequest): Request object that includes the parameters for the search.
+
+        Returns:
+            Tuple[Set[str], Set[str]]: The include and exclude sets, empty if the Fields extension is disabled.
+        """
+        fields = (
+            getattr(search_request, "fields", None)
+            if self.extension_is_enabled("FieldsExtension")
+            else None
+        )
+        include: Set[str] = fields.include if fields and fields.include else set()
+        exclude: Set[str] = fields.exclude if fields and fields.exclude else set()
+        return include, exclude
+
+    async def post_search(
+        self, search_request: BaseSearchPostRequest, request: Request
+    ) -> stac_types.ItemCollection:
+        """
+        Perform a POST search on the catalog.
+
+        Args:
+            search_request (BaseSearchPostRequest): Request object that includes the parameters for the search.
+            kwargs: Keyword arguments passed to the function.
+
+        Returns:
+            ItemCollection: A collection of items matching the search criteria.
+
+        Raises:
+            HTTPException: If there is an error with the cql2_json filter.
+        """
+        base_url = str(request.base_url)
+
+        search, datetime_search, sort = await self.build_search(search_request)
+
         limit = 10
         if search_request.limit:
             limit = search_request.limit
@@ -612,6 +757,9 @@ class CoreClient(AsyncBaseCoreClient):
         token_param = getattr(
             search_request, "token", None
         ) or request.query_params.get("token")
+
+        include, exclude = self.get_fields(search_request)
+
         items, maybe_count, next_token = await self.database.execute_search(
             search=search,
             limit=limit,
@@ -619,27 +767,24 @@ class CoreClient(AsyncBaseCoreClient):
             sort=sort,
             collection_ids=getattr(search_request, "collections", None),
             datetime_search=datetime_search,
+            number_matched=getattr(search_request, "number_matched", None),
+            include=include,
+            exclude=exclude,
         )
 
-        fields = (
-            getattr(search_request, "fields", None)
-            if self.extension_is_enabled("FieldsExtension")
-            else None
-        )
-        include: Set[str] = fields.include if fields and fields.include else set()
-        exclude: Set[str] = fields.exclude if fields and fields.exclude else set()
-
+        # Nested fields were filtered by the database already
+        post_include = source_filtered_include(include)
         items = [
             filter_fields(
                 self.item_serializer.db_to_stac(item, base_url=base_url),
-                include,
+                post_include,
                 exclude,
             )
             for item in items
         ]
         links = await PagingLinks(request=request, next=next_token).get_links()
 
-        return stac_types.ItemCollection(
+        item_collection = stac_types.ItemCollection(
             type="FeatureCollection",
             features=items,
             links=links,
@@ -647,6 +792,160 @@ class CoreClient(AsyncBaseCoreClient):
             numberMatched=maybe_count,
         )
 
+        # Return the request sent to the database, for query tuning
+        if get_bool_env("ENABLE_SEARCH_DEBUG") and request.query_params.get(
+            "debug", ""
+        ).lower() in ("true", "1"):
+            item_collection["debug"] = await self.database.compile_search(
+                search=search,
+                sort=sort,
+                collection_ids=getattr(search_request, "collections", None),
+                datetime_search=datetime_search,
+            )
+
+        return item_collection
+
+    async def stream_search(
+        self,
+        search_request: BaseSearchPostRequest,
+        request: Request,
+        page_size: int = 1000,
+    ) -> AsyncIterator[stac_types.Item]:
+        """
+        Stream every item matching a search, without a limit on the number of results.
+
+        The search is built, and invalid requests rejected, before this method returns.
+        Items are then read from the database one page at a time while the returned
+        iterator is consumed.
+
+        Args:
+            search_request (BaseSearchPostRequest): Request object that includes the parameters for the search.
+                The `limit` and `token` of the request are ignored.
+            request (Request): The incoming request.
+            page_size (int): Number of items read from the database at a time.
+
+        Returns:
+            AsyncIterator[stac_types.Item]: The matching items, serialized and with the requested fields applied.
+
+        Raises:
+            HTTPException: If a filter of the request is invalid.
+        """
+        base_url = str(request.base_url)
+
+        search, datetime_search, sort = await self.build_search(search_request)
+
+        include, exclude = self.get_fields(search_request)
+        post_include = source_filtered_include(include)
+
+        async def items() -> AsyncIterator[stac_types.Item]:
+            async for item in self.database.stream_search(
+                search=search,
+                sort=sort,
+                collection_ids=getattr(search_request, "collections", None),
+                datetime_search=datetime_search,
+                page_size=page_size,
+                include=include,
+                exclude=exclude,
+            ):
+                yield filter_fields(
+                    self.item_serializer.db_to_stac(item, base_url=base_url),
+                    post_include,
+                    exclude,
+                )
+
+        return items()
+
+    async def batch_search(
+        self,
+        search_requests: List[Union[BaseSearchPostRequest, Exception]],
+        request: Request,
+    ) -> List[Union[stac_types.ItemCollection, Dict[str, Any]]]:
+        """
+        Perform several POST searches with a single database request.
+
+        Every search is built like in `post_search`, then all of them are sent to the
+        database together.
+
+        Args:
+            search_requests (List[Union[BaseSearchPostRequest, Exception]]): The searches to
+                perform. Exceptions, such as validation errors of a search body, are reported
+                as the result of their search.
+            request (Request): The incoming request.
+
+        Returns:
+            List[Union[stac_types.ItemCollection, Dict[str, Any]]]: For every search, in order,
+                the matching items or an error with a `code` and a `description`.
+        """
+        base_url = str(request.base_url)
+
+        results: List[Any] = [None] * len(search_requests)
+        positions: List[int] = []
+        searches: List[Dict[str, Any]] = []
+        fields: List[Tuple[Set[str], Set[str]]] = []
+
+        for position, search_request in enumerate(search_requests):
+            if isinstance(search_request, Exception):
+                results[position] = search_error(search_request)
+                continue
+            try:
+                search, datetime_search, sort = await self.build_search(search_request)
+            except HTTPException as e:
+                results[position] = search_error(e)
+                continue
+
+            include, exclude = self.get_fields(search_request)
+            positions.append(position)
+            fields.append((include, exclude))
+            searches.append(
+                {
+                    "search": search,
+                    "limit": search_request.limit or 10,
+                    "token": getattr(search_request, "token", None),
+                    "sort": sort,
+                    "collection_ids": getattr(search_request, "collections", None),
+                    "datetime_search": datetime_search,
+                    "number_matched": getattr(search_request, "number_matched", None),
+                    "include": include,
+                    "exclude": exclude,
+                }
+            )
+
+        outcomes = (
+            await self.database.execute_search_batch(searches) if searches else []
+        )
+
+        for position, (include, exclude), outcome in zip(positions, fields, outcomes):
+            if isinstance(outcome, Exception):
+                results[position] = search_error(outcome)
+                continue
+
+            items, maybe_count, next_token = outcome
+            post_include = source_filtered_include(include)
+            items = [
+                filter_fields(
+                    self.item_serializer.db_to_stac(item, base_url=base_url),
+                    post_include,
+                    exclude,
+                )
+                for item in items
+            ]
+            body = search_requests[position].model_dump(
+                mode="json", by_alias=True, exclude_none=True, exclude={"token"}
+            )
+            links = BatchSearchLinks(
+                request=request, body=body, next=next_token
+            ).create_links()
+
+            results[position] = stac_types.ItemCollection(
+                type="FeatureCollection",
+                features=items,
+                links=links,
+                numberReturned=len(items),
+                numberMatched=maybe_count,
+            )
+
+        return results
+
 
 @attr.s
 class TransactionsClient(AsyncBaseTransactionsClient):
@@ -684,13 +983,10 @@ class TransactionsClient(AsyncBaseTransactionsClient):
 
         # Handle FeatureCollection (bulk insert)
         if item_dict["type"] == "FeatureCollection":
-            bulk_client = BulkTransactionsClient(
-                database=self.database, settings=self.settings
-            )
             features = item_dict["features"]
             processed_items = [
-                bulk_client.preprocess_item(
-                    feature, base_url, BulkTransactionMethod.INSERT
+                await self.database.bulk_async_prep_create_item(
+                    item=feature, base_url=base_url
                 )
                 for feature in features
             ]
@@ -699,6 +995,7 @@ class TransactionsClient(AsyncBaseTransactionsClient):
             success, errors = await self.database.bulk_async(
                 collection_id=collection_id,
                 processed_items=processed_items,
+                exist_ok=False,
                 **kwargs,
             )
             if errors:
@@ -1039,6 +1336,7 @@ class BulkTransactionsClient(BaseBulkTransactionsClient):
         success, errors = self.database.bulk_sync(
             collection_id,
             processed_items,
+            exist_ok=items.method == BulkTransactionMethod.UPSERT,
             **kwargs,
         )
         if errors:
@@ -1047,3 +1345,201 @@ class BulkTransactionsClient(BaseBulkTransactionsClient):
             logger.info(f"Bulk sync operation succeeded with {success} actions.")
 
         return f"Successfully added/updated {success} Items. {attempted - success} errors occurred."
+
+
+@attr.s
+class AsyncBulkTransactionsClient(AsyncBaseBulkTransactionsClient):
+    """A client for posting bulk transactions without blocking the event loop.
+
+    Items are sent with concurrent bulk requests, see `bulk_async` of the database, and
+    can be inserted with any index insertion strategy.
+
+    Attributes:
+        session: An instance of `Session` to use for database connection.
+        database: An instance of `DatabaseLogic` to perform database operations.
+    """
+
+    database: BaseDatabaseLogic = attr.ib()
+    settings: ApiBaseSettings = attr.ib()
+    session: Session = attr.ib(default=attr.Factory(Session.create_from_env))
+
+    @overrides
+    async def bulk_item_insert(
+        self, items: Items, chunk_size: Optional[int] = None, **kwargs
+    ) -> str:
+        """Perform a bulk insertion of items into the database.
+
+        Args:
+            items: The items to insert.
+            chunk_size: The maximum number of items per bulk request.
+            **kwargs: Additional keyword arguments, such as `request` and `refresh`.
+
+        Returns:
+            A string indicating the number of items successfully added, and the items
+            that failed with their reason.
+        """
+        request = kwargs.get("request")
+        base_url = str(request.base_url) if request else ""
+
+        processed_items = []
+        for item in items.items.values():
+            # Raise on the first invalid item (strict mode)
+            validated = Item(**item) if not isinstance(item, Item) else item
+            processed_items.append(
+                await self.database.bulk_async_prep_create_item(
+                    item=validated.model_dump(mode="json"), base_url=base_url
+                )
+            )
+        if not processed_items:
+            return "Successfully added/updated 0 Items. 0 errors occurred."
+
+        collection_id = processed_items[0]["collection"]
+        attempted = len(processed_items)
+        success, errors = await self.database.bulk_async(
+            collection_id,
+            processed_items,
+            exist_ok=items.method == BulkTransactionMethod.UPSERT,
+            chunk_size=chunk_size,
+            **kwargs,
+        )
+        message = f"Successfully added/updated {success} Items. {attempted - success} errors occurred."
+        if errors:
+            logger.error(f"Bulk async operation encountered errors: {errors}")
+            message += " " + describe_bulk_errors(errors)
+        else:
+            logger.info(f"Bulk async operation succeeded with {success} actions.")
+        return message
+
+    async def stream_item_insert(
+        self,
+        collection_id: str,
+        lines: AsyncIterator[Tuple[int, Optional[bytes]]],
+        base_url: str = "",
+        method: BulkTransactionMethod = BulkTransactionMethod.INSERT,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Insert items read from newline-delimited JSON, reporting progress per chunk.
+
+        The collection is checked before this method returns. Items are then parsed,
+        checked with `check_ingested_item` and written in bulk chunks while the
+        returned iterator is consumed, so lines are read no faster than written.
+
+        Args:
+            collection_id (str): The collection to insert the items in.
+            lines (AsyncIterator[Tuple[int, Optional[bytes]]]): The numbered lines, one
+                feature per line, None for lines too long to be read.
+            base_url (str): The base URL used to create the item's self URL.
+            method (BulkTransactionMethod): Whether existing items are replaced.
+            **kwargs: Additional keyword arguments, such as `refresh`.
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: A record per written chunk with the number of
+                items written and failed so far, the failed items and the invalid lines,
+                then a summary record with `done` set.
+
+        Raises:
+            NotFoundError: If the collection does not exist.
+        """
+        await self.database.check_collection_exists(collection_id=collection_id)
+
+        progress: asyncio.Queue = asyncio.Queue()
+        totals = {"written": 0, "failed": 0, "invalid": 0}
+        invalid_lines: List[Dict[str, Any]] = []
+
+        async def items() -> AsyncIterator[stac_types.Item]:
+            async for number, line in lines:
+                try:
+                    if line is None:
+                        raise ValueError("Line too long")
+                    item = check_ingested_item(orjson.loads(line), collection_id)
+                    item = self.database.item_serializer.stac_to_db(item, base_url)
+                except ValueError as e:
+                    # orjson.JSONDecodeError is a ValueError
+                    reason = str(e)
+                except Exception as e:
+                    # A single malformed item must not abort the whole stream
+                    reason = f"Item could not be serialized: {e!r}"
+                else:
+                    yield item
+                    continue
+                totals["invalid"] += 1
+                invalid_lines.append({"line": number, "reason": reason})
+
+        async def on_chunk(written: int, errors: List[Dict[str, Any]]) -> None:
+            totals["written"] += written
+            totals["failed"] += len(errors)
+            record = {**totals, "errors": get_bulk_failures(errors)}
+            record["invalid_lines"] = invalid_lines[:]
+            invalid_lines.clear()
+            await progress.put(record)
+
+        async def insert() -> None:
+            try:
+                await self.database.bulk_async(
+                    collection_id,
+                    items(),
+                    exist_ok=method == BulkTransactionMethod.UPSERT,
+                    on_chunk=on_chunk,
+                    **kwargs,
+                )
+            finally:
+                await progress.put(None)
+
+        async def records() -> AsyncIterator[Dict[str, Any]]:
+            task = asyncio.ensure_future(insert())
+            try:
+                while True:
+                    record = await progress.get()
+                    if record is None:
+                        break
+                    yield record
+                summary: Dict[str, Any] = {**totals, "done": True}
+                try:
+                    await task
+                except Exception as e:
+                    logger.error(f"Ingest into collection {collection_id} failed: {e}")
+                    summary["done"] = False
+                    summary["error"] = str(e)
+                summary["invalid_lines"] = invalid_lines[:]
+                yield summary
+            finally:
+                task.cancel()
+
+        return records()
+
+    async def start_ingest_mode(
+        self, collection_id: str, timeout: Optional[float] = None, **kwargs
+    ) -> Dict[str, Any]:
+        """Put a collection in ingest mode for a bulk load.
+
+        Args:
+            collection_id (str): The collection to load items into.
+            timeout (Optional[float]): Seconds after which the collection leaves ingest
+                mode, the configured timeout by default.
+
+        Returns:
+            Dict[str, Any]: The status of the ingest mode of the collection.
+        """
+        return await self.database.start_ingest_mode(collection_id, timeout)
+
+    async def stop_ingest_mode(self, collection_id: str, **kwargs) -> Dict[str, Any]:
+        """Take a collection out of ingest mode, restoring its index settings.
+
+        Args:
+            collection_id (str): The collection.
+
+        Returns:
+            Dict[str, Any]: The status of the ingest mode of the collection.
+        """
+        return await self.database.stop_ingest_mode(collection_id)
+
+    async def get_ingest_mode(self, collection_id: str, **kwargs) -> Dict[str, Any]:
+        """Get the status of the ingest mode of a collection.
+
+        Args:
+            collection_id (str): The collection.
+
+        Returns:
+            Dict[str, Any]: The status of the ingest mode of the collection.
+        """
+        return await self.database.get_ingest_mode(collection_id)
@@ -1,9 +1,13 @@
 """Utility functions to handle datetime parsing."""
 
 from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
 from stac_fastapi.types.rfc3339 import rfc3339_str_to_datetime
 
+# Item property holding the time range an item covers, as a `date_range` field
+TEMPORAL_RANGE_FIELD = "_temporal"
+
 
 def format_datetime_range(date_str: str) -> str:
     """
@@ -73,3 +77,29 @@ def now_in_utc() -> datetime:
 def now_to_rfc3339_str() -> str:
     """Return an RFC 3339 string representing now."""
     return datetime_to_str(now_in_utc())
+
+
+def temporal_range(properties: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Get the time range an item covers, as indexed in `TEMPORAL_RANGE_FIELD`.
+
+    Args:
+        properties (Dict[str, Any]): The properties of the item.
+
+    Returns:
+        Optional[Dict[str, str]]: The `gte` and `lte` bounds of the range: the `datetime` of the
+            item if set, its `start_datetime` and `end_datetime` otherwise. None if the item has
+            no complete range or if the start of the range is after its end.
+    """
+    if properties.get("datetime"):
+        lower = upper = properties["datetime"]
+    else:
+        lower = properties.get("start_datetime")
+        upper = properties.get("end_datetime")
+        if not lower or not upper:
+            return None
+        try:
+            if rfc3339_str_to_datetime(lower) > rfc3339_str_to_datetime(upper):
+                return None
+        except (ValueError, TypeError):
+            return None
+    return {"gte": lower, "lte": upper}
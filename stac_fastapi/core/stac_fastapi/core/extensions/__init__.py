@@ -1,5 +1,18 @@
 """elasticsearch extensions modifications."""
 
+from .batch import BatchSearchExtension
+from .export import ExportExtension
+from .ingest import IngestExtension, IngestModeExtension
+from .number_matched import NumberMatchedExtension
 from .query import Operator, QueryableTypes, QueryExtension
 
-__all__ = ["Operator", "QueryableTypes", "QueryExtension"]
+__all__ = [
+    "BatchSearchExtension",
+    "ExportExtension",
+    "IngestExtension",
+    "IngestModeExtension",
+    "NumberMatchedExtension",
+    "Operator",
+    "QueryableTypes",
+    "QueryExtension",
+]
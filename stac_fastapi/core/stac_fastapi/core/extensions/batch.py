@@ -0,0 +1,116 @@
+"""Batch search extension."""
+
+import logging
+from typing import Any, Dict, List, Optional, Type, Union
+
+import attr
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from pydantic import BaseModel, ValidationError
+
+from stac_fastapi.api.routes import create_async_endpoint
+from stac_fastapi.core.utilities import get_number_env
+from stac_fastapi.types.extension import ApiExtension
+from stac_fastapi.types.search import BaseSearchPostRequest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SEARCH_MAX_SEARCHES = 100
+
+
+def get_batch_search_max_searches() -> int:
+    """Get the maximum number of searches of a batch from the environment.
+
+    Returns:
+        int: The BATCH_SEARCH_MAX_SEARCHES environment variable, or the default if unset or invalid.
+    """
+    return int(
+        get_number_env(
+            "BATCH_SEARCH_MAX_SEARCHES", DEFAULT_BATCH_SEARCH_MAX_SEARCHES, minimum=1
+        )
+    )
+
+
+class BatchSearchRequest(BaseModel):
+    """Body of a batch search, a list of `POST /search` bodies."""
+
+    searches: List[Dict[str, Any]]
+
+
+class BatchSearchResponse(BaseModel):
+    """Results of a batch search, in the order of the searches."""
+
+    results: List[Dict[str, Any]]
+
+
+@attr.s
+class BatchSearchExtension(ApiExtension):
+    """Batch Search Extension.
+
+    The batch search extension adds the `POST /search/batch` endpoint, which accepts a
+    list of `POST /search` bodies and runs every search with a single multi-search
+    request to the database. Results are returned in the order of the searches, each
+    being either an ItemCollection or an error with a `code` and a `description`, so
+    that an invalid search does not fail the others.
+    """
+
+    client = attr.ib()
+    search_post_request_model: Type[BaseSearchPostRequest] = attr.ib(
+        default=BaseSearchPostRequest
+    )
+    max_searches: int = attr.ib(factory=get_batch_search_max_searches)
+    conformance_classes: List[str] = attr.ib(factory=list)
+    schema_href: Optional[str] = attr.ib(default=None)
+
+    async def batch_search(
+        self, batch_request: BatchSearchRequest, request: Request
+    ) -> Dict[str, Any]:
+        """Run several searches.
+
+        Args:
+            batch_request (BatchSearchRequest): The searches to run.
+            request (Request): The incoming request.
+
+        Returns:
+            Dict[str, Any]: The result of every search, in order, under `results`.
+
+        Raises:
+            HTTPException: If the batch has more searches than allowed.
+        """
+        if len(batch_request.searches) > self.max_searches:
+            raise HTTPException(
+                status_code=400,
+                detail=f"A batch may contain at most {self.max_searches} searches, "
+                f"got {len(batch_request.searches)}",
+            )
+
+        search_requests: List[Union[BaseSearchPostRequest, Exception]] = []
+        for body in batch_request.searches:
+            try:
+                search_requests.append(
+                    self.search_post_request_model.model_validate(body)
+                )
+            except ValidationError as e:
+                search_requests.append(e)
+
+        results = await self.client.batch_search(search_requests, request=request)
+        return {"results": results}
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        router = APIRouter(prefix=app.state.router_prefix)
+        router.add_api_route(
+            name="Batch Search",
+            path="/search/batch",
+            response_model=BatchSearchResponse,
+            response_model_exclude_unset=True,
+            methods=["POST"],
+            endpoint=create_async_endpoint(self.batch_search, BatchSearchRequest),
+        )
+        app.include_router(router, tags=["Batch Search Extension"])
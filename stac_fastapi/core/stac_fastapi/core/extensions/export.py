@@ -0,0 +1,142 @@
+"""Export extension."""
+
+from typing import AsyncIterator, List, Optional, Type
+
+import attr
+import orjson
+from fastapi import APIRouter, FastAPI, Request
+from starlette.responses import StreamingResponse
+
+from stac_fastapi.api.routes import create_async_endpoint
+from stac_fastapi.core.utilities import get_number_env
+from stac_fastapi.types.extension import ApiExtension
+from stac_fastapi.types.search import BaseSearchPostRequest
+from stac_fastapi.types.stac import Item
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+GEOJSON_SEQ_MEDIA_TYPE = "application/geo+json-seq"
+
+# RFC 8142 prefixes every GeoJSON text sequence record with an ASCII record separator
+RECORD_SEPARATOR = b"\x1e"
+
+
+async def encode_features(
+    features: AsyncIterator[Item],
+    record_separator: bytes = b"",
+    chunk_size: int = 64 * 1024,
+) -> AsyncIterator[bytes]:
+    """Encode features as newline-delimited JSON.
+
+    Args:
+        features (AsyncIterator[Item]): The features to encode.
+        record_separator (bytes): Prefix written before every feature.
+        chunk_size (int): Approximate number of bytes buffered before a chunk is emitted.
+
+    Yields:
+        bytes: Chunks made of whole lines, one feature per line.
+    """
+    buffer: List[bytes] = []
+    buffered = 0
+
+    async for feature in features:
+        line = record_separator + orjson.dumps(feature) + b"\n"
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= chunk_size:
+            yield b"".join(buffer)
+            buffer.clear()
+            buffered = 0
+
+    if buffer:
+        yield b"".join(buffer)
+
+
+@attr.s
+class ExportExtension(ApiExtension):
+    """Export Extension.
+
+    The export extension adds the `POST /search/export` endpoint, which accepts the same
+    body as `POST /search` and streams every matching item, ignoring `limit` and
+    `token`, as newline-delimited GeoJSON features. Items are read from the database
+    one page at a time and sent with chunked transfer encoding, so memory use does not
+    depend on the size of the result.
+
+    Features are sent as NDJSON (`application/x-ndjson`) unless the request accepts
+    `application/geo+json-seq`, in which case RFC 8142 GeoJSON text sequences are sent.
+    """
+
+    client = attr.ib()
+    search_post_request_model: Type[BaseSearchPostRequest] = attr.ib(
+        default=BaseSearchPostRequest
+    )
+    page_size: int = attr.ib(
+        factory=lambda: int(get_number_env("EXPORT_PAGE_SIZE", 1000, minimum=1))
+    )
+    conformance_classes: List[str] = attr.ib(factory=list)
+    schema_href: Optional[str] = attr.ib(default=None)
+
+    async def export_search(
+        self, search_request: BaseSearchPostRequest, request: Request
+    ) -> StreamingResponse:
+        """Stream every item matching a search.
+
+        Args:
+            search_request (BaseSearchPostRequest): The search parameters.
+            request (Request): The incoming request.
+
+        Returns:
+            StreamingResponse: A streamed response with one feature per line.
+        """
+        features = await self.client.stream_search(
+            search_request, request, page_size=self.page_size
+        )
+
+        media_type = NDJSON_MEDIA_TYPE
+        record_separator = b""
+        if GEOJSON_SEQ_MEDIA_TYPE in request.headers.get("accept", ""):
+            media_type = GEOJSON_SEQ_MEDIA_TYPE
+            record_separator = RECORD_SEPARATOR
+
+        chunks = encode_features(features, record_separator)
+
+        # Read the first chunk before responding so that errors such as unknown
+        # collections are returned with a proper status code
+        try:
+            first_chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            first_chunk = b""
+
+        async def body() -> AsyncIterator[bytes]:
+            if first_chunk:
+                yield first_chunk
+            async for chunk in chunks:
+                yield chunk
+
+        return StreamingResponse(body(), media_type=media_type)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        router = APIRouter(prefix=app.state.router_prefix)
+        router.add_api_route(
+            name="Export Search",
+            path="/search/export",
+            response_class=StreamingResponse,
+            methods=["POST"],
+            endpoint=create_async_endpoint(
+                self.export_search, self.search_post_request_model
+            ),
+            responses={
+                200: {
+                    "content": {NDJSON_MEDIA_TYPE: {}, GEOJSON_SEQ_MEDIA_TYPE: {}},
+                    "description": "Newline-delimited GeoJSON features.",
+                }
+            },
+        )
+        app.include_router(router, tags=["Export Extension"])
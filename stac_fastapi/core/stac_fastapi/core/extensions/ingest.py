@@ -0,0 +1,262 @@
+"""Ingest extension."""
+
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import attr
+import orjson
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from stac_fastapi.extensions.third_party.bulk_transactions import BulkTransactionMethod
+from stac_fastapi.types.extension import ApiExtension
+
+from .export import GEOJSON_SEQ_MEDIA_TYPE, NDJSON_MEDIA_TYPE, RECORD_SEPARATOR
+
+DEFAULT_INGEST_MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+async def read_lines(
+    stream: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Split a byte stream into lines, without reading it all.
+
+    Empty lines are skipped, and the RFC 8142 record separator prefixing GeoJSON text
+    sequence records is removed.
+
+    Args:
+        stream (AsyncIterator[bytes]): The chunks of the stream.
+        max_line_bytes (int): Maximum length of a line. Longer lines are dropped.
+
+    Yields:
+        Tuple[int, Optional[bytes]]: The number of every line, starting at 1, and the
+            line, or None if it was longer than `max_line_bytes`.
+    """
+    buffer = bytearray()
+    # Bytes of the buffer known not to hold a line end
+    scanned = 0
+    number = 0
+    dropping = False
+
+    async for chunk in stream:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", max(start, scanned))
+            if end == -1:
+                break
+            too_long = dropping or end - start > max_line_bytes
+            line = b"" if too_long else bytes(buffer[start:end])
+            start = end + 1
+            number += 1
+            if too_long:
+                dropping = False
+                yield number, None
+                continue
+            line = line.strip().lstrip(RECORD_SEPARATOR)
+            if line:
+                yield number, line
+        del buffer[:start]
+        scanned = len(buffer)
+        if len(buffer) > max_line_bytes:
+            # Keep reading up to the end of the line, without holding it
+            dropping = True
+            buffer.clear()
+            scanned = 0
+
+    number += 1
+    if dropping or len(buffer) > max_line_bytes:
+        yield number, None
+    else:
+        line = bytes(buffer).strip().lstrip(RECORD_SEPARATOR)
+        if line:
+            yield number, line
+
+
+async def encode_records(
+    records: AsyncIterator[Dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    """Encode records as newline-delimited JSON, one chunk per record.
+
+    Args:
+        records (AsyncIterator[Dict[str, Any]]): The records to encode.
+
+    Yields:
+        bytes: A line per record.
+    """
+    async for record in records:
+        yield orjson.dumps(record) + b"\n"
+
+
+class IngestResponse(StreamingResponse):
+    """Streamed response sent while the request body is still being read.
+
+    `StreamingResponse` receives ASGI messages to detect disconnections, which would
+    take the chunks of the request body away from the ingest. Disconnections are
+    noticed by the ingest reading the body instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Send the response."""
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@attr.s
+class IngestExtension(ApiExtension):
+    """Ingest Extension.
+
+    The ingest extension adds the `POST /collections/{collection_id}/ingest` endpoint,
+    which inserts newline-delimited GeoJSON features (`application/x-ndjson`, or
+    `application/geo+json-seq`) while the request body is read. Features are sent to
+    the database in bulk chunks as they arrive, so memory use does not depend on the
+    size of the upload, and a progress record is streamed back for every chunk,
+    followed by a summary record.
+
+    Items are inserted, or replaced with `?method=upsert`.
+    """
+
+    client = attr.ib()
+    max_line_bytes: int = attr.ib(
+        factory=lambda: int(
+            os.getenv("INGEST_MAX_LINE_BYTES", str(DEFAULT_INGEST_MAX_LINE_BYTES))
+        )
+    )
+    conformance_classes: List[str] = attr.ib(factory=list)
+    schema_href: Optional[str] = attr.ib(default=None)
+
+    async def ingest_items(
+        self,
+        collection_id: str,
+        request: Request,
+        method: BulkTransactionMethod = BulkTransactionMethod.INSERT,
+    ) -> IngestResponse:
+        """Insert the features of a newline-delimited request body.
+
+        Args:
+            collection_id (str): The collection to insert the features in.
+            request (Request): The incoming request.
+            method (BulkTransactionMethod): Whether existing items are replaced.
+
+        Returns:
+            IngestResponse: A streamed response with a progress record per bulk chunk.
+        """
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        if content_type not in (NDJSON_MEDIA_TYPE, GEOJSON_SEQ_MEDIA_TYPE):
+            raise HTTPException(
+                status_code=415,
+                detail=f"Features must be sent as {NDJSON_MEDIA_TYPE} or "
+                f"{GEOJSON_SEQ_MEDIA_TYPE}.",
+            )
+
+        records = await self.client.stream_item_insert(
+            collection_id,
+            read_lines(request.stream(), self.max_line_bytes),
+            base_url=str(request.base_url),
+            method=method,
+        )
+        return IngestResponse(encode_records(records), media_type=NDJSON_MEDIA_TYPE)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        router = APIRouter(prefix=app.state.router_prefix)
+        router.add_api_route(
+            name="Ingest Items",
+            path="/collections/{collection_id}/ingest",
+            response_class=IngestResponse,
+            methods=["POST"],
+            endpoint=self.ingest_items,
+            openapi_extra={
+                "requestBody": {
+                    "required": True,
+                    "content": {NDJSON_MEDIA_TYPE: {}, GEOJSON_SEQ_MEDIA_TYPE: {}},
+                }
+            },
+            responses={
+                200: {
+                    "content": {NDJSON_MEDIA_TYPE: {}},
+                    "description": "A progress record per bulk chunk, then a summary.",
+                }
+            },
+        )
+        app.include_router(router, tags=["Ingest Extension"])
+
+
+@attr.s
+class IngestModeExtension(ApiExtension):
+    """Ingest Mode Extension.
+
+    The ingest mode extension adds the `/collections/{collection_id}/ingest-mode`
+    endpoint, to prepare a collection for a bulk load. `PUT` stops the refreshes and
+    the replicas of the item indexes of the collection, and writes to the collection
+    no longer refresh. `DELETE` restores the index settings, refreshes and force merges
+    the indexes, which also happens once the timeout of the mode is reached. `GET`
+    returns the status of the mode.
+
+    Changing index settings affects the whole cluster, the endpoints should only be
+    enabled for administrators.
+    """
+
+    client = attr.ib()
+    conformance_classes: List[str] = attr.ib(factory=list)
+    schema_href: Optional[str] = attr.ib(default=None)
+
+    async def start_ingest_mode(
+        self,
+        collection_id: str,
+        timeout: Optional[float] = Query(
+            None,
+            gt=0,
+            description="Seconds after which the collection leaves ingest mode.",
+        ),
+    ) -> Dict[str, Any]:
+        """Put a collection in ingest mode, or extend its timeout."""
+        return await self.client.start_ingest_mode(collection_id, timeout)
+
+    async def stop_ingest_mode(self, collection_id: str) -> Dict[str, Any]:
+        """Take a collection out of ingest mode."""
+        return await self.client.stop_ingest_mode(collection_id)
+
+    async def get_ingest_mode(self, collection_id: str) -> Dict[str, Any]:
+        """Get the status of the ingest mode of a collection."""
+        return await self.client.get_ingest_mode(collection_id)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        router = APIRouter(prefix=app.state.router_prefix)
+        path = "/collections/{collection_id}/ingest-mode"
+        router.add_api_route(
+            name="Get Ingest Mode",
+            path=path,
+            methods=["GET"],
+            endpoint=self.get_ingest_mode,
+        )
+        router.add_api_route(
+            name="Start Ingest Mode",
+            path=path,
+            methods=["PUT"],
+            endpoint=self.start_ingest_mode,
+        )
+        router.add_api_route(
+            name="Stop Ingest Mode",
+            path=path,
+            methods=["DELETE"],
+            endpoint=self.stop_ingest_mode,
+        )
+        app.include_router(router, tags=["Ingest Mode Extension"])
@@ -0,0 +1,69 @@
+"""numberMatched strategy extension."""
+
+from typing import Optional
+
+import attr
+from fastapi import FastAPI, Query
+from pydantic import BaseModel, Field
+from typing_extensions import Annotated
+
+from stac_fastapi.types.extension import ApiExtension
+from stac_fastapi.types.search import APIRequest
+
+NUMBER_MATCHED_PATTERN = r"^(exact|estimate|none|[1-9][0-9]*)$"
+NUMBER_MATCHED_DESCRIPTION = (
+    "How numberMatched is computed: `exact`, `estimate`, `none`, or a positive "
+    "integer up to which hits are counted exactly. Defaults to the "
+    "NUMBER_MATCHED_STRATEGY environment variable."
+)
+
+
+@attr.s
+class NumberMatchedExtensionGetRequest(APIRequest):
+    """numberMatched Extension GET request model."""
+
+    number_matched: Annotated[
+        Optional[str],
+        Query(
+            description=NUMBER_MATCHED_DESCRIPTION,
+            pattern=NUMBER_MATCHED_PATTERN,
+            openapi_examples={
+                "user-provided": {"value": None},
+                "estimate": {"value": "estimate"},
+                "threshold": {"value": "10000"},
+            },
+        ),
+    ] = attr.ib(default=None)
+
+
+class NumberMatchedExtensionPostRequest(BaseModel):
+    """numberMatched Extension POST request model."""
+
+    number_matched: Optional[str] = Field(
+        None,
+        description=NUMBER_MATCHED_DESCRIPTION,
+        pattern=NUMBER_MATCHED_PATTERN,
+    )
+
+
+@attr.s
+class NumberMatchedExtension(ApiExtension):
+    """numberMatched Extension.
+
+    Adds the `number_matched` parameter to `GET /search` and `POST /search`, choosing
+    per search how the total number of matching items is counted.
+    """
+
+    GET = NumberMatchedExtensionGetRequest
+    POST = NumberMatchedExtensionPostRequest
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        pass
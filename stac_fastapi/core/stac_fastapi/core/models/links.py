@@ -203,3 +203,38 @@ class PagingLinks(BaseLinks):
                 }
 
         return None
+
+
+@attr.s
+class BatchSearchLinks(BaseLinks):
+    """Create links for one search of a batch, pointing to `POST /search`."""
+
+    body: Dict[str, Any] = attr.ib()
+    next: Optional[str] = attr.ib(kw_only=True, default=None)
+
+    @property
+    def search_url(self) -> str:
+        """Get the url of the search endpoint."""
+        return urljoin(self.base_url, "search")
+
+    def link_self(self) -> Dict[str, Any]:
+        """Return the self link."""
+        return {
+            "rel": Relations.self.value,
+            "type": MimeTypes.json.value,
+            "method": "POST",
+            "href": self.search_url,
+            "body": self.body,
+        }
+
+    def link_next(self) -> Optional[Dict[str, Any]]:
+        """Create link for next page."""
+        if self.next is None:
+            return None
+        return {
+            "rel": Relations.next.value,
+            "type": MimeTypes.json.value,
+            "method": "POST",
+            "href": self.search_url,
+            "body": {**self.body, "token": self.next},
+        }
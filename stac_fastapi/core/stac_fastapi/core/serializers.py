@@ -7,7 +7,11 @@ from typing import Any, List, Optional
 import attr
 from starlette.requests import Request
 
-from stac_fastapi.core.datetime_utils import now_to_rfc3339_str
+from stac_fastapi.core.datetime_utils import (
+    TEMPORAL_RANGE_FIELD,
+    now_to_rfc3339_str,
+    temporal_range,
+)
 from stac_fastapi.core.models.links import CollectionLinks
 from stac_fastapi.core.utilities import get_bool_env
 from stac_fastapi.types import stac as stac_types
@@ -76,6 +80,13 @@ class ItemSerializer(Serializer):
         if "created" not in stac_data["properties"]:
             stac_data["properties"]["created"] = now
         stac_data["properties"]["updated"] = now
+
+        # Lets datetime filters run as a single range query
+        time_range = temporal_range(stac_data["properties"])
+        if time_range is not None:
+            stac_data["properties"][TEMPORAL_RANGE_FIELD] = time_range
+        else:
+            stac_data["properties"].pop(TEMPORAL_RANGE_FIELD, None)
         return stac_data
 
     @classmethod
@@ -105,6 +116,9 @@ class ItemSerializer(Serializer):
         else:
             assets = item.get("assets", {})
 
+        properties = item.get("properties", {})
+        properties.pop(TEMPORAL_RANGE_FIELD, None)
+
         return stac_types.Item(
             type="Feature",
             stac_version=item.get("stac_version", ""),
@@ -113,7 +127,7 @@ class ItemSerializer(Serializer):
             collection=item.get("collection", ""),
             geometry=item.get("geometry", {}),
             bbox=item.get("bbox", []),
-            properties=item.get("properties", {}),
+            properties=properties,
             links=item_links,
             assets=assets,
         )
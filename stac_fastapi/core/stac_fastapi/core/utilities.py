@@ -5,6 +5,7 @@ such as converting bounding boxes to polygon representations.
 """
 
 import logging
+import math
 import os
 from typing import Any, Dict, List, Optional, Set, Union
 
@@ -63,6 +64,59 @@ def get_bool_env(name: str, default: Union[bool, str] = False) -> bool:
         return default_str in true_values
 
 
+def get_number_env(
+    name: str,
+    default: float,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+    exclusive_minimum: bool = False,
+) -> float:
+    """
+    Retrieve a number from an environment variable.
+
+    Args:
+        name (str): The name of the environment variable.
+        default (float): The value to use if the variable is not set or invalid.
+        minimum (Optional[float]): Smallest valid value, if any.
+        maximum (Optional[float]): Largest valid value, if any.
+        exclusive_minimum (bool): Whether `minimum` itself is invalid, e.g. for values
+            that must be positive.
+
+    Returns:
+        float: The number parsed from the environment variable.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+
+    bounds = []
+    if minimum is not None:
+        bounds.append(
+            f"greater than {minimum}" if exclusive_minimum else f"at least {minimum}"
+        )
+    if maximum is not None:
+        bounds.append(f"at most {maximum}")
+
+    try:
+        number = float(value)
+        if (
+            math.isnan(number)
+            or (minimum is not None and number < minimum)
+            or (minimum is not None and exclusive_minimum and number == minimum)
+            or (maximum is not None and number > maximum)
+        ):
+            raise ValueError(f"{name} out of range: {number}")
+        return number
+    except ValueError:
+        logger = logging.getLogger(__name__)
+        logger.warning(
+            f"Invalid value for {name} environment variable: '{value}'. "
+            f"Must be a number{' ' + ' and '.join(bounds) if bounds else ''}. "
+            f"Using default value {default}."
+        )
+    return default
+
+
 def bbox2polygon(b0: float, b1: float, b2: float, b3: float) -> List[List[List[float]]]:
     """Transform a bounding box represented by its four coordinates `b0`, `b1`, `b2`, and `b3` into a polygon.
 
@@ -171,6 +225,32 @@ def filter_fields(  # noqa: C901
     return Item(**clean_item)
 
 
+def source_filtered_include(include: Optional[Set[str]]) -> Set[str]:
+    """Get the include set still to apply to items whose `_source` was already filtered.
+
+    When the include set is pushed down to the database, nested paths are already
+    trimmed from the returned documents. Only the top-level keys added back by the
+    item serializer, such as `links`, `type` or the fields always fetched to build
+    links, still have to be filtered, so the include set is reduced to the root of
+    every path. Paths containing a wildcard are not pushed down and are kept as is, as
+    are paths below `assets` and `item_assets`, which are only fetched whole when
+    STAC_INDEX_ASSETS is true.
+
+    Args:
+        include (Optional[Set[str]]): The Fields extension include set.
+
+    Returns:
+        Set[str]: The include set to pass to `filter_fields`.
+    """
+    if not include or any("*" in field for field in include):
+        return include or set()
+    asset_fields = {"assets", "item_assets"}
+    roots = {field.split(".", 1)[0] for field in include}
+    return (roots - asset_fields) | {
+        field for field in include if field.split(".", 1)[0] in asset_fields
+    }
+
+
 def dict_deep_update(merge_to: Dict[str, Any], merge_from: Dict[str, Any]) -> None:
     """Perform a deep update of two dicts.
 
@@ -2,20 +2,35 @@
 
 import asyncio
 import logging
-from base64 import urlsafe_b64decode, urlsafe_b64encode
 from copy import deepcopy
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NoReturn,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import attr
 import elasticsearch.helpers as helpers
-import orjson
 from elasticsearch.dsl import Q, Search
 from elasticsearch.exceptions import BadRequestError
+from elasticsearch.exceptions import ConflictError as ESConflictError
 from elasticsearch.exceptions import NotFoundError as ESNotFoundError
 from fastapi import HTTPException
 from starlette.requests import Request
 
 from stac_fastapi.core.base_database_logic import BaseDatabaseLogic
+from stac_fastapi.core.datetime_utils import TEMPORAL_RANGE_FIELD
 from stac_fastapi.core.serializers import CollectionSerializer, ItemSerializer
 from stac_fastapi.core.utilities import bbox2polygon, get_bool_env, get_max_limit
 from stac_fastapi.elasticsearch.config import AsyncElasticsearchSettings
@@ -28,11 +43,27 @@ from stac_fastapi.extensions.core.transaction.request import (
     PatchOperation,
 )
 from stac_fastapi.sfeos_helpers import filter as filter_module
+from stac_fastapi.sfeos_helpers.cache import (
+    CollectionRegistry,
+    QueryablesMappingCache,
+    RequestCoalescer,
+    SearchResultCache,
+    copy_json,
+    make_key,
+)
 from stac_fastapi.sfeos_helpers.database import (
+    TEMPORAL_RANGE_SCRIPT,
+    BulkSettings,
     apply_free_text_filter_shared,
     apply_intersects_filter_shared,
+    build_source_filter,
     create_index_templates_shared,
+    decode_pagination_token,
     delete_item_index_shared,
+    encode_pagination_token,
+    get_bulk_conflicts,
+    get_number_matched_strategy,
+    get_pit_keep_alive,
     get_queryables_mapping_shared,
     index_alias_by_collection_id,
     index_by_collection_id,
@@ -40,11 +71,13 @@ from stac_fastapi.sfeos_helpers.database import (
     mk_item_id,
     populate_sort_shared,
     return_date,
+    streaming_bulk_shared,
     validate_refresh,
 )
 from stac_fastapi.sfeos_helpers.database.query import (
     ES_MAX_URL_LENGTH,
     add_collections_to_body,
+    compile_query,
 )
 from stac_fastapi.sfeos_helpers.database.utils import (
     merge_to_operations,
@@ -62,7 +95,9 @@ from stac_fastapi.sfeos_helpers.search_engine import (
     BaseIndexInserter,
     BaseIndexSelector,
     IndexInsertionFactory,
+    IndexMaintenance,
     IndexSelectorFactory,
+    IngestMode,
 )
 from stac_fastapi.types.errors import ConflictError, NotFoundError
 from stac_fastapi.types.links import resolve_links
@@ -133,6 +168,25 @@ async def delete_item_index(collection_id: str):
     )
 
 
+def raise_bulk_conflicts(collection_id: str, error: Exception) -> NoReturn:
+    """Raise a failed bulk request, as a `ConflictError` if items already existed.
+
+    Args:
+        collection_id (str): The collection of the items.
+        error (Exception): The `BulkIndexError` raised by the bulk helpers.
+
+    Raises:
+        ConflictError: If items were not created because they already exist.
+        Exception: The bulk error otherwise.
+    """
+    conflicts = get_bulk_conflicts(error.errors)
+    if conflicts:
+        raise ConflictError(
+            f"Items {', '.join(conflicts)} in collection {collection_id} already exist"
+        ) from error
+    raise error
+
+
 @attr.s
 class DatabaseLogic(BaseDatabaseLogic):
     """Database logic."""
@@ -145,6 +199,16 @@ class DatabaseLogic(BaseDatabaseLogic):
     )
     async_index_selector: BaseIndexSelector = attr.ib(init=False)
     async_index_inserter: BaseIndexInserter = attr.ib(init=False)
+    index_maintenance: IndexMaintenance = attr.ib(init=False)
+    ingest_mode: IngestMode = attr.ib(init=False)
+
+    queryables_cache: QueryablesMappingCache = attr.ib(
+        factory=QueryablesMappingCache.shared
+    )
+    search_cache: SearchResultCache = attr.ib(factory=SearchResultCache.shared)
+    request_coalescer: RequestCoalescer = attr.ib(factory=RequestCoalescer.shared)
+    bulk_settings: BulkSettings = attr.ib(factory=BulkSettings.from_env)
+    collection_registry: CollectionRegistry = attr.ib(factory=CollectionRegistry.shared)
 
     client = attr.ib(init=False)
     sync_client = attr.ib(init=False)
@@ -157,6 +221,10 @@ class DatabaseLogic(BaseDatabaseLogic):
             self.client
         )
         self.async_index_selector = IndexSelectorFactory.create_selector(self.client)
+        self.ingest_mode = IngestMode(self.client)
+        self.index_maintenance = IndexMaintenance(
+            self.async_index_inserter, ingest_mode=self.ingest_mode
+        )
 
     item_serializer: Type[ItemSerializer] = attr.ib(default=ItemSerializer)
     collection_serializer: Type[CollectionSerializer] = attr.ib(
@@ -295,24 +363,30 @@ class DatabaseLogic(BaseDatabaseLogic):
             The Item is retrieved from the Elasticsearch database using the `client.get` method,
             with the index for the Collection as the target index and the combined `mk_item_id` as the document id.
         """
-        try:
-            response = await self.client.search(
-                index=index_alias_by_collection_id(collection_id),
-                body={
-                    "query": {"term": {"_id": mk_item_id(item_id, collection_id)}},
-                    "size": 1,
-                },
-            )
-            if response["hits"]["total"]["value"] == 0:
+
+        async def fetch() -> Dict:
+            try:
+                response = await self.client.search(
+                    index=index_alias_by_collection_id(collection_id),
+                    body={
+                        "query": {"term": {"_id": mk_item_id(item_id, collection_id)}},
+                        "size": 1,
+                    },
+                )
+                if response["hits"]["total"]["value"] == 0:
+                    raise NotFoundError(
+                        f"Item {item_id} does not exist inside Collection {collection_id}"
+                    )
+
+                return response["hits"]["hits"][0]["_source"]
+            except ESNotFoundError:
                 raise NotFoundError(
                     f"Item {item_id} does not exist inside Collection {collection_id}"
                 )
 
-            return response["hits"]["hits"][0]["_source"]
-        except ESNotFoundError:
-            raise NotFoundError(
-                f"Item {item_id} does not exist inside Collection {collection_id}"
-            )
+        return await self.request_coalescer.run(
+            "get_one_item", (collection_id, item_id), fetch, copy=copy_json
+        )
 
     async def get_queryables_mapping(self, collection_id: str = "*") -> dict:
         """Retrieve mapping of Queryables for search.
@@ -324,9 +398,17 @@ class DatabaseLogic(BaseDatabaseLogic):
         Returns:
             dict: A dictionary containing the Queryables mappings.
         """
-        mappings = await self.client.indices.get_mapping(
-            index=f"{ITEMS_INDEX_PREFIX}{collection_id}",
-        )
+        if collection_id == "*":
+            mappings = await self.client.indices.get_mapping(
+                index=f"{ITEMS_INDEX_PREFIX}{collection_id}"
+            )
+        else:
+            # The collection alias covers every item index of the collection only
+            mappings = await self.client.indices.get_mapping(
+                index=index_alias_by_collection_id(collection_id),
+                ignore_unavailable=True,
+                allow_no_indices=True,
+            )
         return await get_queryables_mapping_shared(
             collection_id=collection_id, mappings=mappings
         )
@@ -369,6 +451,33 @@ class DatabaseLogic(BaseDatabaseLogic):
         if not datetime_search:
             return search, datetime_search
 
+        if USE_DATETIME and get_bool_env("USE_TEMPORAL_RANGE_FIELD"):
+            # The range indexed by `ItemSerializer.stac_to_db` is the datetime of the
+            # item, or its start/end datetime if null, so one range query matches both
+            if "eq" in datetime_search:
+                bounds = {"gte": datetime_search["eq"], "lte": datetime_search["eq"]}
+            else:
+                bounds = {
+                    key: datetime_search[key]
+                    for key in ("gte", "lte")
+                    if datetime_search.get(key) is not None
+                }
+            return (
+                search.filter(
+                    Q(
+                        {
+                            "range": {
+                                f"properties.{TEMPORAL_RANGE_FIELD}": {
+                                    **bounds,
+                                    "relation": "intersects",
+                                }
+                            }
+                        }
+                    )
+                ),
+                datetime_search,
+            )
+
         if USE_DATETIME:
             if "eq" in datetime_search:
                 # For exact matches, include:
@@ -575,7 +684,10 @@ class DatabaseLogic(BaseDatabaseLogic):
         )
 
     async def apply_cql2_filter(
-        self, search: Search, _filter: Optional[Dict[str, Any]]
+        self,
+        search: Search,
+        _filter: Optional[Dict[str, Any]],
+        collection_ids: Optional[List[str]] = None,
     ):
         """
         Apply a CQL2 filter to an Elasticsearch Search object.
@@ -590,13 +702,19 @@ class DatabaseLogic(BaseDatabaseLogic):
                                                 to the search. The dictionary should follow the structure
                                                 required by the `to_es` function which converts it
                                                 to an Elasticsearch query.
+            collection_ids (Optional[List[str]]): Collections the search is restricted to. Only the
+                                                  queryables mappings of these collections are loaded.
+                                                  Defaults to all collections.
 
         Returns:
             Search: The modified Search object with the filter applied if a filter is provided,
                     otherwise the original Search object.
         """
         if _filter is not None:
-            es_query = filter_module.to_es(await self.get_queryables_mapping(), _filter)
+            queryables_mapping = await self.queryables_cache.get_mapping(
+                collection_ids, self.get_queryables_mapping
+            )
+            es_query = filter_module.to_es(queryables_mapping, _filter)
             search = search.query(es_query)
 
         return search
@@ -616,6 +734,55 @@ class DatabaseLogic(BaseDatabaseLogic):
         """
         return populate_sort_shared(sortby=sortby)
 
+    async def _select_search_target(
+        self,
+        search: Search,
+        collection_ids: Optional[List[str]],
+        datetime_search: Dict[str, Optional[str]],
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Select the indexes a search runs on and compile its query.
+
+        Args:
+            search (Search): The search query.
+            collection_ids (Optional[List[str]]): The collection ids to search.
+            datetime_search (Dict[str, Optional[str]]): Datetime range used for index selection.
+
+        Returns:
+            Tuple[str, Optional[Dict[str, Any]]]: The indexes and the compiled query, which also
+                filters on the collections when their indexes do not fit in the request URL.
+        """
+        query = compile_query(search.query.to_dict() if search.query else None)
+        index_param = await self.async_index_selector.select_indexes(
+            collection_ids, datetime_search
+        )
+        if len(index_param) > ES_MAX_URL_LENGTH - 300:
+            index_param = ITEM_INDICES
+            query = add_collections_to_body(collection_ids, query)
+        return index_param, query
+
+    async def compile_search(
+        self,
+        search: Search,
+        sort: Optional[Dict[str, Dict[str, str]]],
+        collection_ids: Optional[List[str]],
+        datetime_search: Dict[str, Optional[str]],
+    ) -> Dict[str, Any]:
+        """Get the indexes, query and sort a search is sent to the database with.
+
+        Args:
+            search (Search): The search query.
+            sort (Optional[Dict[str, Dict[str, str]]]): Specifies how the results should be sorted.
+            collection_ids (Optional[List[str]]): The collection ids to search.
+            datetime_search (Dict[str, Optional[str]]): Datetime range used for index selection.
+
+        Returns:
+            Dict[str, Any]: The `index`, compiled `query` and `sort` of the search request.
+        """
+        index_param, query = await self._select_search_target(
+            search, collection_ids, datetime_search
+        )
+        return {"index": index_param, "query": query, "sort": sort or DEFAULT_SORT}
+
     async def execute_search(
         self,
         search: Search,
@@ -625,6 +792,10 @@ class DatabaseLogic(BaseDatabaseLogic):
         collection_ids: Optional[List[str]],
         datetime_search: Dict[str, Optional[str]],
         ignore_unavailable: bool = True,
+        number_matched: Optional[str] = None,
+        point_in_time: Optional[bool] = None,
+        include: Optional[Set[str]] = None,
+        exclude: Optional[Set[str]] = None,
     ) -> Tuple[Iterable[Dict[str, Any]], Optional[int], Optional[str]]:
         """Execute a search query with limit and other optional parameters.
 
@@ -636,6 +807,12 @@ class DatabaseLogic(BaseDatabaseLogic):
             collection_ids (Optional[List[str]]): The collection ids to search.
             datetime_search (Dict[str, Optional[str]]): Datetime range used for index selection.
             ignore_unavailable (bool, optional): Whether to ignore unavailable collections. Defaults to True.
+            number_matched (Optional[str]): How numberMatched is computed: "exact", "estimate", "none" or a
+                `track_total_hits` threshold. Defaults to the NUMBER_MATCHED_STRATEGY environment variable.
+            point_in_time (Optional[bool]): Whether the first page opens a point in time that following pages
+                are read from. Defaults to the ENABLE_PIT_PAGINATION environment variable.
+            include (Optional[Set[str]]): Fields extension include set, pushed down to `_source` filtering.
+            exclude (Optional[Set[str]]): Fields extension exclude set, pushed down to `_source` filtering.
 
         Returns:
             Tuple[Iterable[Dict[str, Any]], Optional[int], Optional[str]]: A tuple containing:
@@ -647,70 +824,460 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         Raises:
             NotFoundError: If the collections specified in `collection_ids` do not exist.
+            HTTPException: If `number_matched` is not a valid strategy.
         """
+        params: Dict[str, Any] = dict(
+            limit=limit,
+            token=token,
+            sort=sort,
+            collection_ids=collection_ids,
+            datetime_search=datetime_search,
+            ignore_unavailable=ignore_unavailable,
+            number_matched=number_matched,
+            point_in_time=point_in_time,
+            include=include,
+            exclude=exclude,
+        )
+
+        async def fetch() -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+            items, matched, next_token = await self._execute_search(search, **params)
+            return list(items), matched, next_token
+
+        key = make_key("execute_search", search=search.to_dict(), **params)
+        return await self.request_coalescer.run(
+            "execute_search", key, fetch, copy=lambda result: tuple(copy_json(result))
+        )
+
+    async def _execute_search(
+        self,
+        search: Search,
+        limit: int,
+        token: Optional[str],
+        sort: Optional[Dict[str, Dict[str, str]]],
+        collection_ids: Optional[List[str]],
+        datetime_search: Dict[str, Optional[str]],
+        ignore_unavailable: bool = True,
+        number_matched: Optional[str] = None,
+        point_in_time: Optional[bool] = None,
+        include: Optional[Set[str]] = None,
+        exclude: Optional[Set[str]] = None,
+    ) -> Tuple[Iterable[Dict[str, Any]], Optional[int], Optional[str]]:
+        """Execute a search query, see `execute_search`."""
+        try:
+            number_matched_strategy = get_number_matched_strategy(number_matched)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
         search_after = None
+        pit_id = None
+        keep_alive = None
 
         if token:
-            search_after = orjson.loads(urlsafe_b64decode(token))
+            search_after, pit_id, keep_alive = decode_pagination_token(token)
 
-        query = search.query.to_dict() if search.query else None
+        index_param = None
+        if pit_id is None:
+            index_param, query = await self._select_search_target(
+                search, collection_ids, datetime_search
+            )
 
-        index_param = await self.async_index_selector.select_indexes(
-            collection_ids, datetime_search
+            if point_in_time is None:
+                point_in_time = get_bool_env("ENABLE_PIT_PAGINATION")
+            if not token and point_in_time:
+                keep_alive = get_pit_keep_alive()
+                pit_id = await self.open_point_in_time(
+                    index_param, keep_alive, ignore_unavailable
+                )
+        else:
+            query = compile_query(search.query.to_dict() if search.query else None)
+
+        # Pages read from a point in time skip index selection and see a consistent snapshot
+        target: Dict[str, Any] = (
+            {"pit": {"id": pit_id, "keep_alive": keep_alive}}
+            if pit_id is not None
+            else {"index": index_param, "ignore_unavailable": ignore_unavailable}
         )
-        if len(index_param) > ES_MAX_URL_LENGTH - 300:
-            index_param = ITEM_INDICES
-            query = add_collections_to_body(collection_ids, query)
 
         max_result_window = get_max_limit()
 
         size_limit = min(limit + 1, max_result_window)
 
-        search_task = asyncio.create_task(
-            self.client.search(
+        source = build_source_filter(include, exclude)
+
+        track_total_hits: Optional[Union[bool, int]] = None
+        if number_matched_strategy == "exact":
+            track_total_hits = True
+        elif number_matched_strategy == "none":
+            track_total_hits = False
+        elif isinstance(number_matched_strategy, int):
+            track_total_hits = number_matched_strategy
+
+        # Pages read from a point in time are not cached, their tokens reference it
+        cache_key = None
+        if pit_id is None and self.search_cache.enabled:
+            cache_key = self.search_cache.make_key(
                 index=index_param,
                 ignore_unavailable=ignore_unavailable,
                 query=query,
                 sort=sort or DEFAULT_SORT,
+                search_after=search_after,
+                track_total_hits=track_total_hits,
+                number_matched=number_matched_strategy,
+                source=source,
+                limit=limit,
+            )
+            if (cached := await self.search_cache.get(cache_key)) is not None:
+                return cached
+            cache_generation = self.search_cache.generation
+
+        search_task = asyncio.create_task(
+            self.client.search(
+                **target,
+                query=query,
+                sort=sort or DEFAULT_SORT,
                 **({"search_after": search_after} if search_after is not None else {}),
+                **(
+                    {"track_total_hits": track_total_hits}
+                    if track_total_hits is not None
+                    else {}
+                ),
+                **({"source": source} if source else {}),
                 size=size_limit,
             )
         )
 
-        count_task = asyncio.create_task(
-            self.client.count(
-                index=index_param,
-                ignore_unavailable=ignore_unavailable,
-                body=search.to_dict(count=True),
+        count_task = None
+        if number_matched_strategy == "estimate" and index_param is not None:
+            count_task = asyncio.create_task(
+                self.client.count(
+                    index=index_param,
+                    ignore_unavailable=ignore_unavailable,
+                    body={"query": query} if query else {},
+                )
             )
-        )
 
         try:
             es_response = await search_task
         except ESNotFoundError:
+            if index_param is None:
+                # The point in time expired, continue paging without it
+                return await self._execute_search(
+                    search=search,
+                    limit=limit,
+                    token=encode_pagination_token(
+                        search_after[: len(sort or DEFAULT_SORT)]
+                    ),
+                    sort=sort,
+                    collection_ids=collection_ids,
+                    datetime_search=datetime_search,
+                    ignore_unavailable=ignore_unavailable,
+                    number_matched=number_matched,
+                    point_in_time=point_in_time,
+                    include=include,
+                    exclude=exclude,
+                )
             raise NotFoundError(f"Collections '{collection_ids}' do not exist")
+        finally:
+            # Never leave the count running on the cluster once the page is served
+            if count_task is not None and not count_task.done():
+                count_task.cancel()
 
         hits = es_response["hits"]["hits"]
         items = (hit["_source"] for hit in hits[:limit])
 
+        if pit_id is not None:
+            pit_id = es_response.get("pit_id", pit_id)
+
         next_token = None
         if len(hits) > limit and limit < max_result_window:
             if hits and (sort_array := hits[limit - 1].get("sort")):
-                next_token = urlsafe_b64encode(orjson.dumps(sort_array)).decode()
+                next_token = encode_pagination_token(sort_array, pit_id, keep_alive)
 
+        if pit_id is not None and not next_token:
+            # PITs abandoned by clients expire with their keep-alive
+            await self.close_point_in_time(pit_id)
+
+        total = es_response["hits"].get("total")
         matched = (
-            es_response["hits"]["total"]["value"]
-            if es_response["hits"]["total"]["relation"] == "eq"
+            total["value"]
+            if number_matched_strategy != "none" and total and total["relation"] == "eq"
             else None
         )
-        if count_task.done():
+        if count_task is not None and count_task.done() and not count_task.cancelled():
             try:
                 matched = count_task.result().get("count")
             except Exception as e:
                 logger.error(f"Count task failed: {e}")
 
+        if cache_key is not None:
+            items = list(items)
+            await self.search_cache.set(
+                cache_key,
+                (items, matched, next_token),
+                collection_ids,
+                cache_generation,
+            )
+
         return items, matched, next_token
 
+    async def stream_search(
+        self,
+        search: Search,
+        sort: Optional[Dict[str, Dict[str, str]]],
+        collection_ids: Optional[List[str]],
+        datetime_search: Dict[str, Optional[str]],
+        page_size: int = 1000,
+        ignore_unavailable: bool = True,
+        include: Optional[Set[str]] = None,
+        exclude: Optional[Set[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over every result of a search query, one page at a time.
+
+        Pages are read from a point in time with `search_after`, so memory use does not
+        depend on the number of results and no result window limits the iteration.
+
+        Args:
+            search (Search): The search query to be executed.
+            sort (Optional[Dict[str, Dict[str, str]]]): Specifies how the results should be sorted.
+            collection_ids (Optional[List[str]]): The collection ids to search.
+            datetime_search (Dict[str, Optional[str]]): Datetime range used for index selection.
+            page_size (int, optional): Number of results read per request. Defaults to 1000.
+            ignore_unavailable (bool, optional): Whether to ignore unavailable collections. Defaults to True.
+            include (Optional[Set[str]]): Fields extension include set, pushed down to `_source` filtering.
+            exclude (Optional[Set[str]]): Fields extension exclude set, pushed down to `_source` filtering.
+
+        Yields:
+            Dict[str, Any]: The source document of each result.
+
+        Raises:
+            NotFoundError: If the collections specified in `collection_ids` do not exist.
+        """
+        page_size = max(1, min(page_size, get_max_limit() - 1))
+        token = None
+
+        while True:
+            items, _, token = await self.execute_search(
+                search=search,
+                limit=page_size,
+                token=token,
+                sort=sort,
+                collection_ids=collection_ids,
+                datetime_search=datetime_search,
+                ignore_unavailable=ignore_unavailable,
+                number_matched="none",
+                point_in_time=True,
+                include=include,
+                exclude=exclude,
+            )
+            for item in items:
+                yield item
+            if not token:
+                break
+
+    async def execute_search_batch(
+        self,
+        searches: List[Dict[str, Any]],
+        ignore_unavailable: bool = True,
+    ) -> List[
+        Union[Tuple[List[Dict[str, Any]], Optional[int], Optional[str]], Exception]
+    ]:
+        """Execute several search queries with a single multi-search request.
+
+        Args:
+            searches (List[Dict[str, Any]]): Keyword arguments of `execute_search` for every
+                search: `search`, `limit`, `token`, `sort`, `collection_ids`, `datetime_search`
+                and optionally `number_matched`, `include` and `exclude`.
+            ignore_unavailable (bool, optional): Whether to ignore unavailable collections. Defaults to True.
+
+        Returns:
+            List[Union[Tuple[List[Dict[str, Any]], Optional[int], Optional[str]], Exception]]: For every
+                search, in order, the same tuple as `execute_search` or the exception the search failed with.
+
+        Notes:
+            Searches with the "estimate" numberMatched strategy are counted by a second multi-search
+            request running alongside the first one, which is cancelled if it has not finished when
+            the searches return. Batched searches do not open points in time, pages of a
+            point in time referenced by a token are read with `execute_search`.
+        """
+        results: List[Any] = [None] * len(searches)
+        max_result_window = get_max_limit()
+
+        planned: List[Tuple[int, Dict[str, Any], Union[str, int]]] = []
+        search_lines: List[Dict[str, Any]] = []
+        count_positions: List[int] = []
+        count_lines: List[Dict[str, Any]] = []
+        pit_positions: List[int] = []
+
+        for position, params in enumerate(searches):
+            try:
+                strategy = get_number_matched_strategy(params.get("number_matched"))
+            except ValueError as e:
+                results[position] = HTTPException(status_code=400, detail=str(e))
+                continue
+
+            search_after = None
+            if token := params.get("token"):
+                search_after, pit_id, _ = decode_pagination_token(token)
+                if pit_id is not None:
+                    pit_positions.append(position)
+                    continue
+
+            index_param, query = await self._select_search_target(
+                params["search"],
+                params.get("collection_ids"),
+                params.get("datetime_search") or {},
+            )
+
+            header = {"index": index_param, "ignore_unavailable": ignore_unavailable}
+            search_body: Dict[str, Any] = {
+                "size": min(params["limit"] + 1, max_result_window),
+                "sort": params.get("sort") or DEFAULT_SORT,
+            }
+            if query:
+                search_body["query"] = query
+            if search_after:
+                search_body["search_after"] = search_after
+            if strategy == "exact":
+                search_body["track_total_hits"] = True
+            elif strategy == "none":
+                search_body["track_total_hits"] = False
+            elif isinstance(strategy, int):
+                search_body["track_total_hits"] = strategy
+            if source := build_source_filter(
+                params.get("include"), params.get("exclude")
+            ):
+                search_body["_source"] = source
+
+            planned.append((position, params, strategy))
+            search_lines.extend([header, search_body])
+
+            if strategy == "estimate":
+                count_positions.append(position)
+                count_lines.extend(
+                    [
+                        header,
+                        {
+                            "size": 0,
+                            "track_total_hits": True,
+                            **({"query": query} if query else {}),
+                        },
+                    ]
+                )
+
+        pit_tasks = [
+            asyncio.ensure_future(self.execute_search(**searches[position]))
+            for position in pit_positions
+        ]
+        count_task = (
+            asyncio.create_task(self.client.msearch(searches=count_lines))
+            if count_lines
+            else None
+        )
+
+        try:
+            responses = (
+                (await self.client.msearch(searches=search_lines))["responses"]
+                if search_lines
+                else []
+            )
+        finally:
+            # Never leave the counts running on the cluster once the pages are served
+            if count_task is not None and not count_task.done():
+                count_task.cancel()
+
+        counts: Dict[int, Optional[int]] = {}
+        if count_task is not None and count_task.done() and not count_task.cancelled():
+            try:
+                for position, response in zip(
+                    count_positions, count_task.result()["responses"]
+                ):
+                    if "error" not in response:
+                        counts[position] = response["hits"]["total"]["value"]
+            except Exception as e:
+                logger.error(f"Count task failed: {e}")
+
+        for (position, params, strategy), response in zip(planned, responses):
+            if "error" in response:
+                if response.get("status") == 404:
+                    results[position] = NotFoundError(
+                        f"Collections '{params.get('collection_ids')}' do not exist"
+                    )
+                else:
+                    error = response["error"]
+                    results[position] = HTTPException(
+                        status_code=response.get("status") or 500,
+                        detail=error.get("reason", str(error))
+                        if isinstance(error, dict)
+                        else str(error),
+                    )
+                continue
+
+            limit = params["limit"]
+            hits = response["hits"]["hits"]
+            items = [hit["_source"] for hit in hits[:limit]]
+
+            next_token = None
+            if len(hits) > limit and limit < max_result_window:
+                if hits and (sort_array := hits[limit - 1].get("sort")):
+                    next_token = encode_pagination_token(sort_array)
+
+            total = response["hits"].get("total")
+            matched = (
+                total["value"]
+                if strategy != "none" and total and total["relation"] == "eq"
+                else None
+            )
+            if position in counts:
+                matched = counts[position]
+            results[position] = (items, matched, next_token)
+
+        for position, outcome in zip(
+            pit_positions, await asyncio.gather(*pit_tasks, return_exceptions=True)
+        ):
+            if isinstance(outcome, Exception):
+                results[position] = outcome
+            else:
+                items, matched, next_token = outcome
+                results[position] = (list(items), matched, next_token)
+
+        return results
+
+    async def open_point_in_time(
+        self, index: str, keep_alive: str, ignore_unavailable: bool = True
+    ) -> Optional[str]:
+        """Open a point in time to paginate through a search.
+
+        Args:
+            index (str): The indexes the point in time covers.
+            keep_alive (str): How long the point in time is kept between two pages.
+            ignore_unavailable (bool, optional): Whether to ignore unavailable indexes. Defaults to True.
+
+        Returns:
+            Optional[str]: The point in time id, or None if it could not be opened.
+        """
+        try:
+            response = await self.client.open_point_in_time(
+                index=index,
+                keep_alive=keep_alive,
+                ignore_unavailable=ignore_unavailable,
+            )
+        except Exception as e:
+            logger.warning(f"Could not open point in time, paginating without it: {e}")
+            return None
+
+        return response["id"]
+
+    async def close_point_in_time(self, pit_id: str) -> None:
+        """Close a point in time, ignoring points in time that already expired.
+
+        Args:
+            pit_id (str): The point in time id.
+        """
+        try:
+            await self.client.close_point_in_time(id=pit_id)
+        except Exception as e:
+            logger.debug(f"Failed to close point in time: {e}")
+
     """ AGGREGATE LOGIC """
 
     async def aggregate(
@@ -729,7 +1296,7 @@ class DatabaseLogic(BaseDatabaseLogic):
     ):
         """Return aggregations of STAC Items."""
         search_body: Dict[str, Any] = {}
-        query = search.query.to_dict() if search.query else None
+        query = compile_query(search.query.to_dict() if search.query else None)
         if query:
             search_body["query"] = query
 
@@ -782,10 +1349,37 @@ class DatabaseLogic(BaseDatabaseLogic):
     """ TRANSACTION LOGIC """
 
     async def check_collection_exists(self, collection_id: str):
-        """Database logic to check if a collection exists."""
-        if not await self.client.exists(index=COLLECTIONS_INDEX, id=collection_id):
+        """Database logic to check if a collection exists.
+
+        The result is cached in the collection registry, so that writing or reading the
+        items of a collection does not look the collection up every time.
+        """
+
+        async def load(collection_id: str) -> bool:
+            return bool(
+                await self.client.exists(index=COLLECTIONS_INDEX, id=collection_id)
+            )
+
+        if not await self.collection_registry.exists(collection_id, load):
             raise NotFoundError(f"Collection {collection_id} does not exist")
 
+    async def populate_collection_registry(self) -> None:
+        """Record the id of every collection in the collection registry."""
+        if not self.collection_registry.enabled:
+            return
+        body: Dict[str, Any] = {
+            "_source": False,
+            "sort": [{"id": {"order": "asc"}}],
+            "size": 1000,
+        }
+        while True:
+            response = await self.client.search(index=COLLECTIONS_INDEX, body=body)
+            hits = response["hits"]["hits"]
+            self.collection_registry.populate(hit["_id"] for hit in hits)
+            if len(hits) < body["size"]:
+                break
+            body["search_after"] = hits[-1]["sort"]
+
     async def async_prep_create_item(
         self, item: Item, base_url: str, exist_ok: bool = False
     ) -> Item:
@@ -805,21 +1399,24 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         """
         await self.check_collection_exists(collection_id=item["collection"])
-        alias = index_alias_by_collection_id(item["collection"])
-        doc_id = mk_item_id(item["id"], item["collection"])
 
         if not exist_ok:
-            alias_exists = await self.client.indices.exists_alias(name=alias)
-
-            if alias_exists:
-                alias_info = await self.client.indices.get_alias(name=alias)
-                indices = list(alias_info.keys())
-
-                for index in indices:
-                    if await self.client.exists(index=index, id=doc_id):
-                        raise ConflictError(
-                            f"Item {item['id']} in collection {item['collection']} already exists"
-                        )
+            # Look the item up in every index of the collection at once, in real time
+            indexes = await self.async_index_selector.select_indexes(
+                [item["collection"]], {}
+            )
+            doc_id = mk_item_id(item["id"], item["collection"])
+            docs = [
+                {"_index": index, "_id": doc_id, "_source": False}
+                for index in indexes.split(",")
+                if index
+            ]
+            if docs:
+                response = await self.client.mget(docs=docs)
+                if any(doc.get("found") for doc in response["docs"]):
+                    raise ConflictError(
+                        f"Item {item['id']} in collection {item['collection']} already exists"
+                    )
 
         return self.item_serializer.stac_to_db(item, base_url)
 
@@ -831,43 +1428,28 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         This method performs pre-insertion preparation on the given `item`, such as:
         - Verifying that the collection the item belongs to exists.
-        - Optionally checking if an item with the same ID already exists in the database.
         - Serializing the item into a database-compatible format.
 
+        Items that already exist are detected by the engine, when the bulk actions create
+        the items, see `exist_ok` of the bulk methods.
+
         Args:
             item (Item): The item to be prepared for insertion.
             base_url (str): The base URL used to construct the item's self URL.
             exist_ok (bool): Indicates whether the item can already exist in the database.
-                            If False, a `ConflictError` is raised if the item exists.
+                            Unused, kept for compatibility.
 
         Returns:
             Item: The prepared item, serialized into a database-compatible format.
 
         Raises:
             NotFoundError: If the collection that the item belongs to does not exist in the database.
-            ConflictError: If an item with the same ID already exists in the collection and `exist_ok` is False,
-                        and `RAISE_ON_BULK_ERROR` is set to `true`.
         """
         logger.debug(f"Preparing item {item['id']} in collection {item['collection']}.")
 
         # Check if the collection exists
         await self.check_collection_exists(collection_id=item["collection"])
 
-        # Check if the item already exists in the database
-        if not exist_ok and await self.client.exists(
-            index=index_alias_by_collection_id(item["collection"]),
-            id=mk_item_id(item["id"], item["collection"]),
-        ):
-            error_message = (
-                f"Item {item['id']} in collection {item['collection']} already exists."
-            )
-            if self.async_settings.raise_on_bulk_error:
-                raise ConflictError(error_message)
-            else:
-                logger.warning(
-                    f"{error_message} Continuing as `RAISE_ON_BULK_ERROR` is set to false."
-                )
-
         # Serialize the item into a database-compatible format
         prepped_item = self.item_serializer.stac_to_db(item, base_url)
         logger.debug(f"Item {item['id']} prepared successfully.")
@@ -881,43 +1463,34 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         This method performs pre-insertion preparation on the given `item`, such as:
         - Verifying that the collection the item belongs to exists.
-        - Optionally checking if an item with the same ID already exists in the database.
         - Serializing the item into a database-compatible format.
 
+        Items that already exist are detected by the engine, when the bulk actions create
+        the items, see `exist_ok` of the bulk methods.
+
         Args:
             item (Item): The item to be prepared for insertion.
             base_url (str): The base URL used to construct the item's self URL.
             exist_ok (bool): Indicates whether the item can already exist in the database.
-                            If False, a `ConflictError` is raised if the item exists.
+                            Unused, kept for compatibility.
 
         Returns:
             Item: The prepared item, serialized into a database-compatible format.
 
         Raises:
             NotFoundError: If the collection that the item belongs to does not exist in the database.
-            ConflictError: If an item with the same ID already exists in the collection and `exist_ok` is False,
-                        and `RAISE_ON_BULK_ERROR` is set to `true`.
         """
         logger.debug(f"Preparing item {item['id']} in collection {item['collection']}.")
 
         # Check if the collection exists
-        if not self.sync_client.exists(index=COLLECTIONS_INDEX, id=item["collection"]):
-            raise NotFoundError(f"Collection {item['collection']} does not exist")
-
-        # Check if the item already exists in the database
-        if not exist_ok and self.sync_client.exists(
-            index=index_alias_by_collection_id(item["collection"]),
-            id=mk_item_id(item["id"], item["collection"]),
-        ):
-            error_message = (
-                f"Item {item['id']} in collection {item['collection']} already exists."
+        exists = self.collection_registry.get(item["collection"])
+        if exists is None:
+            exists = bool(
+                self.sync_client.exists(index=COLLECTIONS_INDEX, id=item["collection"])
             )
-            if self.sync_settings.raise_on_bulk_error:
-                raise ConflictError(error_message)
-            else:
-                logger.warning(
-                    f"{error_message} Continuing as `RAISE_ON_BULK_ERROR` is set to false."
-                )
+            self.collection_registry.set(item["collection"], exists)
+        if not exists:
+            raise NotFoundError(f"Collection {item['collection']} does not exist")
 
         # Serialize the item into a database-compatible format
         prepped_item = self.item_serializer.stac_to_db(item, base_url)
@@ -956,6 +1529,9 @@ class DatabaseLogic(BaseDatabaseLogic):
         # Resolve the `refresh` parameter
         refresh = kwargs.get("refresh", self.async_settings.database_refresh)
         refresh = validate_refresh(refresh)
+        # Collections in ingest mode are refreshed when the mode is left
+        if self.ingest_mode.is_active(collection_id):
+            refresh = "false"
 
         # Log the creation attempt
         logger.info(
@@ -971,12 +1547,22 @@ class DatabaseLogic(BaseDatabaseLogic):
             collection_id, item
         )
         # Index the item in the database
-        await self.client.index(
-            index=target_index,
-            id=mk_item_id(item_id, collection_id),
-            document=item,
-            refresh=refresh,
-        )
+        try:
+            await self.client.index(
+                index=target_index,
+                id=mk_item_id(item_id, collection_id),
+                document=item,
+                refresh=refresh,
+                op_type="index" if exist_ok else "create",
+            )
+        except ESConflictError:
+            # Created meanwhile in the target index
+            raise ConflictError(
+                f"Item {item_id} in collection {collection_id} already exists"
+            )
+        self.queryables_cache.invalidate_for_item(item)
+        self.request_coalescer.invalidate()
+        await self.search_cache.invalidate([collection_id])
 
     async def merge_patch_item(
         self,
@@ -1051,6 +1637,8 @@ class DatabaseLogic(BaseDatabaseLogic):
                 script_operations.append(operation)
 
         script = operations_to_script(script_operations, create_nest=create_nest)
+        # Keep the indexed time range in line with the patched datetimes
+        script["source"] += TEMPORAL_RANGE_SCRIPT
 
         try:
             search_response = await self.client.search(
@@ -1080,6 +1668,7 @@ class DatabaseLogic(BaseDatabaseLogic):
                 status_code=400, detail=exc.info["error"]["caused_by"]
             ) from exc
 
+        self.request_coalescer.invalidate()
         item = await self.get_one_item(collection_id, item_id)
 
         if new_collection_id:
@@ -1124,6 +1713,10 @@ class DatabaseLogic(BaseDatabaseLogic):
                 refresh=refresh,
             )
 
+        self.queryables_cache.invalidate_for_item(item)
+        self.request_coalescer.invalidate()
+        await self.search_cache.invalidate([collection_id])
+
         return item
 
     async def delete_item(self, item_id: str, collection_id: str, **kwargs: Any):
@@ -1166,6 +1759,8 @@ class DatabaseLogic(BaseDatabaseLogic):
             raise NotFoundError(
                 f"Item {item_id} in collection {collection_id} not found"
             )
+        self.request_coalescer.invalidate()
+        await self.search_cache.invalidate([collection_id])
 
     async def get_items_mapping(self, collection_id: str) -> Dict[str, Any]:
         """Get the mapping for the specified collection's items index.
@@ -1263,6 +1858,10 @@ class DatabaseLogic(BaseDatabaseLogic):
                 self.client, collection_id
             )
 
+        await self.collection_registry.add(collection_id)
+        self.queryables_cache.invalidate(collection_id)
+        self.request_coalescer.invalidate()
+
     async def find_collection(self, collection_id: str) -> Collection:
         """Find and return a collection from the database.
 
@@ -1280,14 +1879,22 @@ class DatabaseLogic(BaseDatabaseLogic):
             This function searches for a collection in the database using the specified `collection_id` and returns the found
             collection as a `Collection` object. If the collection is not found, a `NotFoundError` is raised.
         """
-        try:
-            collection = await self.client.get(
-                index=COLLECTIONS_INDEX, id=collection_id
-            )
-        except ESNotFoundError:
-            raise NotFoundError(f"Collection {collection_id} not found")
 
-        return collection["_source"]
+        async def fetch() -> Collection:
+            try:
+                collection = await self.client.get(
+                    index=COLLECTIONS_INDEX, id=collection_id
+                )
+            except ESNotFoundError:
+                self.collection_registry.set(collection_id, False)
+                raise NotFoundError(f"Collection {collection_id} not found")
+
+            self.collection_registry.set(collection_id, True)
+            return collection["_source"]
+
+        return await self.request_coalescer.run(
+            "find_collection", collection_id, fetch, copy=copy_json
+        )
 
     async def update_collection(
         self, collection_id: str, collection: Collection, **kwargs: Any
@@ -1348,6 +1955,8 @@ class DatabaseLogic(BaseDatabaseLogic):
                 wait_for_completion=True,
                 refresh=refresh,
             )
+            self.request_coalescer.invalidate()
+            await self.search_cache.invalidate([collection["id"]])
 
             # Delete the old collection
             await self.delete_collection(collection_id)
@@ -1360,6 +1969,7 @@ class DatabaseLogic(BaseDatabaseLogic):
                 document=collection,
                 refresh=refresh,
             )
+            self.request_coalescer.invalidate()
 
     async def merge_patch_collection(
         self,
@@ -1438,6 +2048,7 @@ class DatabaseLogic(BaseDatabaseLogic):
                 status_code=400, detail=exc.info["error"]["caused_by"]
             ) from exc
 
+        self.request_coalescer.invalidate()
         collection = await self.find_collection(collection_id)
 
         if new_collection_id:
@@ -1483,12 +2094,22 @@ class DatabaseLogic(BaseDatabaseLogic):
         await self.client.delete(
             index=COLLECTIONS_INDEX, id=collection_id, refresh=refresh
         )
+        # Item writes stop finding the collection before its items are deleted
+        await self.collection_registry.remove(collection_id)
         await delete_item_index(collection_id)
+        self.ingest_mode.discard(collection_id)
+        self.queryables_cache.invalidate(collection_id)
+        self.request_coalescer.invalidate()
+        await self.search_cache.invalidate([collection_id])
 
     async def bulk_async(
         self,
         collection_id: str,
-        processed_items: List[Item],
+        processed_items: Union[Iterable[Item], AsyncIterable[Item]],
+        exist_ok: bool = True,
+        on_chunk: Optional[
+            Callable[[int, List[Dict[str, Any]]], Awaitable[None]]
+        ] = None,
         **kwargs: Any,
     ) -> Tuple[int, List[Dict[str, Any]]]:
         """
@@ -1496,24 +2117,31 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         Args:
             collection_id (str): The ID of the collection to which the items belong.
-            processed_items (List[Item]): A list of `Item` objects to be inserted into the database.
+            processed_items (Union[Iterable[Item], AsyncIterable[Item]]): The items to be
+                inserted into the database, which may be streamed.
+            exist_ok (bool): Whether items may replace existing ones. If False, items that
+                already exist are reported as errors with a 409 status, or raise a
+                `ConflictError` if `RAISE_ON_BULK_ERROR` is set.
+            on_chunk (Optional[Callable]): Coroutine function called once every chunk is
+                written, with the number of items written and the errors, to report progress.
             **kwargs (Any): Additional keyword arguments, including:
                 - refresh (str, optional): Whether to refresh the index after the bulk insert.
                 Can be "true", "false", or "wait_for". Defaults to the value of `self.sync_settings.database_refresh`.
                 - refresh (bool, optional): Whether to refresh the index after the bulk insert.
-                - raise_on_error (bool, optional): Whether to raise an error if any of the bulk operations fail.
-                Defaults to the value of `self.async_settings.raise_on_bulk_error`.
+                - chunk_size (int, optional): Maximum number of items per bulk request.
+                Defaults to the `BULK_CHUNK_SIZE` environment variable.
 
         Returns:
             Tuple[int, List[Dict[str, Any]]]: A tuple containing:
                 - The number of successfully processed actions (`success`).
-                - A list of errors encountered during the bulk operation (`errors`).
+                - An error per failed item (`errors`), with its id, status and reason.
 
         Notes:
-            This function performs a bulk insert of `processed_items` into the database using the specified `collection_id`.
-            The insert is performed synchronously and blocking, meaning that the function does not return until the insert has
-            completed. The `mk_actions` function is called to generate a list of actions for the bulk insert. The `refresh`
-            parameter determines whether the index is refreshed after the bulk insert:
+            Items are sent in chunks bounded by `BULK_CHUNK_SIZE` items and `BULK_MAX_CHUNK_BYTES`,
+            with up to `BULK_CONCURRENCY` bulk requests in flight. Items rejected with a 429 status
+            are retried with jittered backoff, up to `BULK_MAX_RETRIES` times. If `RAISE_ON_BULK_ERROR`
+            is set, no more chunks are sent once an item failed and the errors are raised.
+            The `refresh` parameter applies to every bulk request:
                 - "true": Forces an immediate refresh of the index.
                 - "false": Does not refresh the index immediately (default behavior).
                 - "wait_for": Waits for the next refresh cycle to make the changes visible.
@@ -1524,28 +2152,56 @@ class DatabaseLogic(BaseDatabaseLogic):
         # Resolve the `refresh` parameter
         refresh = kwargs.get("refresh", self.async_settings.database_refresh)
         refresh = validate_refresh(refresh)
+        # Collections in ingest mode are refreshed when the mode is left
+        if self.ingest_mode.is_active(collection_id):
+            refresh = "false"
 
         # Log the bulk insert attempt
         logger.info(
             f"Performing bulk insert for collection {collection_id} with refresh={refresh}"
         )
 
-        # Handle empty processed_items
-        if not processed_items:
-            logger.warning(f"No items to insert for collection {collection_id}")
-            return 0, []
-
-        # Perform the bulk insert
+        settings = self.bulk_settings
+        if kwargs.get("chunk_size"):
+            settings = settings.replace(chunk_size=kwargs["chunk_size"])
         raise_on_error = self.async_settings.raise_on_bulk_error
-        actions = await self.async_index_inserter.prepare_bulk_actions(
-            collection_id, processed_items
-        )
-        success, errors = await helpers.async_bulk(
+
+        async def prepare_actions(items: List[Item]) -> List[Dict[str, Any]]:
+            actions = await self.async_index_inserter.prepare_bulk_actions(
+                collection_id, items
+            )
+            if not exist_ok:
+                for action in actions:
+                    action["_op_type"] = "create"
+            return actions
+
+        async def after_chunk(
+            items: List[Item], written: int, errors: List[Dict[str, Any]]
+        ) -> None:
+            self.queryables_cache.invalidate_for_items(items)
+            self.request_coalescer.invalidate()
+            await self.search_cache.invalidate_for_items(items)
+            await self.ingest_mode.track(collection_id)
+            if on_chunk is not None:
+                await on_chunk(written, errors)
+
+        success, errors = await streaming_bulk_shared(
             self.client,
-            actions,
+            helpers.async_streaming_bulk,
+            processed_items,
+            prepare_actions,
+            settings,
+            after_chunk=after_chunk,
+            stop_on_error=raise_on_error,
             refresh=refresh,
-            raise_on_error=raise_on_error,
         )
+        if errors and raise_on_error:
+            raise_bulk_conflicts(
+                collection_id,
+                helpers.BulkIndexError(
+                    f"{len(errors)} document(s) failed to index.", errors
+                ),
+            )
 
         # Log the result
         logger.info(
@@ -1558,6 +2214,7 @@ class DatabaseLogic(BaseDatabaseLogic):
         self,
         collection_id: str,
         processed_items: List[Item],
+        exist_ok: bool = True,
         **kwargs: Any,
     ) -> Tuple[int, List[Dict[str, Any]]]:
         """
@@ -1566,6 +2223,9 @@ class DatabaseLogic(BaseDatabaseLogic):
         Args:
             collection_id (str): The ID of the collection to which the items belong.
             processed_items (List[Item]): A list of `Item` objects to be inserted into the database.
+            exist_ok (bool): Whether items may replace existing ones. If False, items that
+                already exist are reported as errors with a 409 status, or raise a
+                `ConflictError` if `RAISE_ON_BULK_ERROR` is set.
             **kwargs (Any): Additional keyword arguments, including:
                 - refresh (str, optional): Whether to refresh the index after the bulk insert.
                 Can be "true", "false", or "wait_for". Defaults to the value of `self.sync_settings.database_refresh`.
@@ -1593,6 +2253,9 @@ class DatabaseLogic(BaseDatabaseLogic):
         # Resolve the `refresh` parameter
         refresh = kwargs.get("refresh", self.async_settings.database_refresh)
         refresh = validate_refresh(refresh)
+        # Collections in ingest mode are refreshed when the mode is left
+        if self.ingest_mode.is_active(collection_id):
+            refresh = "false"
 
         # Log the bulk insert attempt
         logger.info(
@@ -1606,12 +2269,18 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         # Perform the bulk insert
         raise_on_error = self.sync_settings.raise_on_bulk_error
-        success, errors = helpers.bulk(
-            self.sync_client,
-            mk_actions(collection_id, processed_items),
-            refresh=refresh,
-            raise_on_error=raise_on_error,
-        )
+        try:
+            success, errors = helpers.bulk(
+                self.sync_client,
+                mk_actions(collection_id, processed_items, exist_ok=exist_ok),
+                refresh=refresh,
+                raise_on_error=raise_on_error,
+            )
+        except helpers.BulkIndexError as e:
+            raise_bulk_conflicts(collection_id, e)
+        self.queryables_cache.invalidate_for_items(processed_items)
+        self.request_coalescer.invalidate()
+        self.search_cache.invalidate_sync({collection_id})
 
         # Log the result
         logger.info(
@@ -1620,6 +2289,54 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         return success, errors
 
+    async def start_ingest_mode(
+        self, collection_id: str, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Put a collection in ingest mode for a bulk load.
+
+        The item indexes of the collection stop refreshing and lose their replicas, and
+        writes to the collection do not refresh, until the mode is left or times out.
+
+        Args:
+            collection_id (str): The ID of the collection.
+            timeout (Optional[float]): Seconds after which the collection leaves ingest
+                mode. Defaults to the `INGEST_MODE_TIMEOUT` environment variable.
+
+        Returns:
+            Dict[str, Any]: The status of the ingest mode of the collection.
+
+        Raises:
+            NotFoundError: If the collection does not exist.
+        """
+        await self.check_collection_exists(collection_id)
+        return await self.ingest_mode.enter(collection_id, timeout)
+
+    async def stop_ingest_mode(self, collection_id: str) -> Dict[str, Any]:
+        """Take a collection out of ingest mode.
+
+        The settings of the item indexes of the collection are restored, and the
+        indexes are refreshed and force merged.
+
+        Args:
+            collection_id (str): The ID of the collection.
+
+        Returns:
+            Dict[str, Any]: The status of the ingest mode of the collection.
+        """
+        return await self.ingest_mode.exit(collection_id)
+
+    async def get_ingest_mode(self, collection_id: str) -> Dict[str, Any]:
+        """Get the status of the ingest mode of a collection.
+
+        Args:
+            collection_id (str): The ID of the collection.
+
+        Returns:
+            Dict[str, Any]: Whether the mode is active, when it times out, and the
+                suspended indexes.
+        """
+        return await self.ingest_mode.status(collection_id)
+
     # DANGER
     async def delete_items(self) -> None:
         """Danger. this is only for tests."""
@@ -1628,6 +2345,8 @@ class DatabaseLogic(BaseDatabaseLogic):
             body={"query": {"match_all": {}}},
             wait_for_completion=True,
         )
+        self.request_coalescer.invalidate()
+        await self.search_cache.invalidate()
 
     # DANGER
     async def delete_collections(self) -> None:
@@ -1637,3 +2356,4 @@ class DatabaseLogic(BaseDatabaseLogic):
             body={"query": {"match_all": {}}},
             wait_for_completion=True,
         )
+        await self.collection_registry.invalidate()
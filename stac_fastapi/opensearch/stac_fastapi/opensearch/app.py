@@ -14,11 +14,18 @@ from stac_fastapi.api.models import (
     create_request_model,
 )
 from stac_fastapi.core.core import (
-    BulkTransactionsClient,
+    AsyncBulkTransactionsClient,
     CoreClient,
     TransactionsClient,
 )
-from stac_fastapi.core.extensions import QueryExtension
+from stac_fastapi.core.extensions import (
+    BatchSearchExtension,
+    ExportExtension,
+    IngestExtension,
+    IngestModeExtension,
+    NumberMatchedExtension,
+    QueryExtension,
+)
 from stac_fastapi.core.extensions.aggregation import (
     EsAggregationExtensionGetRequest,
     EsAggregationExtensionPostRequest,
@@ -50,6 +57,7 @@ from stac_fastapi.opensearch.database_logic import (
     create_index_templates,
 )
 from stac_fastapi.sfeos_helpers.aggregation import EsAsyncBaseAggregationClient
+from stac_fastapi.sfeos_helpers.cache import InvalidationBus
 from stac_fastapi.sfeos_helpers.filter import EsAsyncBaseFiltersClient
 
 logging.basicConfig(level=logging.INFO)
@@ -57,8 +65,18 @@ logger = logging.getLogger(__name__)
 
 TRANSACTIONS_EXTENSIONS = get_bool_env("ENABLE_TRANSACTIONS_EXTENSIONS", default=True)
 ENABLE_COLLECTIONS_SEARCH = get_bool_env("ENABLE_COLLECTIONS_SEARCH", default=True)
+ENABLE_EXPORT_EXTENSION = get_bool_env("ENABLE_EXPORT_EXTENSION", default=True)
+ENABLE_BATCH_SEARCH_EXTENSION = get_bool_env(
+    "ENABLE_BATCH_SEARCH_EXTENSION", default=True
+)
+ENABLE_INGEST_MODE_EXTENSION = get_bool_env(
+    "ENABLE_INGEST_MODE_EXTENSION", default=False
+)
 logger.info("TRANSACTIONS_EXTENSIONS is set to %s", TRANSACTIONS_EXTENSIONS)
 logger.info("ENABLE_COLLECTIONS_SEARCH is set to %s", ENABLE_COLLECTIONS_SEARCH)
+logger.info("ENABLE_EXPORT_EXTENSION is set to %s", ENABLE_EXPORT_EXTENSION)
+logger.info("ENABLE_BATCH_SEARCH_EXTENSION is set to %s", ENABLE_BATCH_SEARCH_EXTENSION)
+logger.info("ENABLE_INGEST_MODE_EXTENSION is set to %s", ENABLE_INGEST_MODE_EXTENSION)
 
 settings = OpensearchSettings()
 session = Session.create_from_settings(settings)
@@ -90,6 +108,7 @@ search_extensions = [
     TokenPaginationExtension(),
     filter_extension,
     FreeTextExtension(),
+    NumberMatchedExtension(),
 ]
 
 
@@ -103,16 +122,19 @@ if TRANSACTIONS_EXTENSIONS:
             settings=settings,
         ),
     )
+    bulk_transactions_client = AsyncBulkTransactionsClient(
+        database=database_logic,
+        session=session,
+        settings=settings,
+    )
     search_extensions.insert(
-        1,
-        BulkTransactionExtension(
-            client=BulkTransactionsClient(
-                database=database_logic,
-                session=session,
-                settings=settings,
-            )
-        ),
+        1, BulkTransactionExtension(client=bulk_transactions_client)
     )
+    search_extensions.insert(2, IngestExtension(client=bulk_transactions_client))
+    if ENABLE_INGEST_MODE_EXTENSION:
+        search_extensions.insert(
+            3, IngestModeExtension(client=bulk_transactions_client)
+        )
 
 extensions = [aggregation_extension] + search_extensions
 
@@ -157,18 +179,34 @@ items_get_request_model = create_request_model(
     request_type="GET",
 )
 
+core_client = CoreClient(
+    database=database_logic,
+    session=session,
+    post_request_model=post_request_model,
+    landing_page_id=os.getenv("STAC_FASTAPI_LANDING_PAGE_ID", "stac-fastapi"),
+)
+
+if ENABLE_EXPORT_EXTENSION:
+    extensions.append(
+        ExportExtension(
+            client=core_client, search_post_request_model=post_request_model
+        )
+    )
+
+if ENABLE_BATCH_SEARCH_EXTENSION:
+    extensions.append(
+        BatchSearchExtension(
+            client=core_client, search_post_request_model=post_request_model
+        )
+    )
+
 app_config = {
     "title": os.getenv("STAC_FASTAPI_TITLE", "stac-fastapi-opensearch"),
     "description": os.getenv("STAC_FASTAPI_DESCRIPTION", "stac-fastapi-opensearch"),
     "api_version": os.getenv("STAC_FASTAPI_VERSION", "6.0.0"),
     "settings": settings,
     "extensions": extensions,
-    "client": CoreClient(
-        database=database_logic,
-        session=session,
-        post_request_model=post_request_model,
-        landing_page_id=os.getenv("STAC_FASTAPI_LANDING_PAGE_ID", "stac-fastapi"),
-    ),
+    "client": core_client,
     "search_get_request_model": create_get_request_model(search_extensions),
     "search_post_request_model": post_request_model,
     "items_get_request_model": items_get_request_model,
@@ -184,10 +222,19 @@ api = StacApi(**app_config)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Lifespan handler for FastAPI app. Initializes index templates and collections at startup."""
+    """Lifespan handler for FastAPI app. Initializes index templates and collections, records the existing collections, picks up the ingest modes of the collections and starts polling cache invalidations from other workers and the datetime index maintenance at startup, stops the ingest mode timeouts and logs request coalescing stats at shutdown."""
     await create_index_templates()
     await create_collection_index()
+    await database_logic.populate_collection_registry()
+    await database_logic.ingest_mode.recover()
+    InvalidationBus.shared().start()
+    database_logic.index_maintenance.start()
     yield
+    await database_logic.index_maintenance.close()
+    await database_logic.ingest_mode.close()
+    await InvalidationBus.shared().close()
+    if stats := database_logic.request_coalescer.stats():
+        logger.info("Request coalescing stats: %s", stats)
 
 
 app = api.app
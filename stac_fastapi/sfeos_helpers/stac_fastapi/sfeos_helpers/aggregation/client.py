@@ -364,7 +364,9 @@ class EsAsyncBaseAggregationClient(AsyncBaseAggregationClient):
         if aggregate_request.filter_expr:
             try:
                 search = await self.database.apply_cql2_filter(
-                    search, aggregate_request.filter_expr
+                    search,
+                    aggregate_request.filter_expr,
+                    collection_ids=aggregate_request.collections,
                 )
             except Exception as e:
                 raise HTTPException(
@@ -0,0 +1,51 @@
+"""Shared in-process caches for stac-fastapi elasticsearch and opensearch backends.
+
+This package provides caches that sit in front of expensive search engine calls
+made by both the Elasticsearch and OpenSearch implementations of STAC FastAPI.
+
+The cache package is organized as follows:
+- collections.py: Registry of the collections known to exist
+- queryables.py: Per-collection cache of the queryables mapping used by CQL2 filters
+- search.py: Item search result cache with per-collection invalidation and pluggable backends
+- coalescing.py: Single-flight execution of identical concurrent reads
+- invalidation.py: Invalidations shared between the worker processes of a deployment
+- keys.py: Key building functions
+
+When adding new functionality to this package, consider:
+1. Can the cached data be invalidated explicitly by the write paths that change it?
+2. Is the cache safe to share between `DatabaseLogic` instances in the same process?
+3. Is there a way to disable the cache through configuration?
+"""
+
+from .coalescing import RequestCoalescer, copy_json
+from .collections import CollectionRegistry
+from .invalidation import (
+    ALIASES,
+    COLLECTIONS,
+    QUERYABLES,
+    SEARCH,
+    FileInvalidationBackend,
+    InvalidationBackend,
+    InvalidationBus,
+)
+from .keys import make_key
+from .queryables import QueryablesMappingCache
+from .search import InMemorySearchCacheBackend, SearchCacheBackend, SearchResultCache
+
+__all__ = [
+    "CollectionRegistry",
+    "QueryablesMappingCache",
+    "RequestCoalescer",
+    "InvalidationBus",
+    "InvalidationBackend",
+    "FileInvalidationBackend",
+    "ALIASES",
+    "COLLECTIONS",
+    "QUERYABLES",
+    "SEARCH",
+    "InMemorySearchCacheBackend",
+    "SearchCacheBackend",
+    "SearchResultCache",
+    "copy_json",
+    "make_key",
+]
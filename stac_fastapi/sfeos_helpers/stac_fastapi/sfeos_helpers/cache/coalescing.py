@@ -0,0 +1,163 @@
+"""Request coalescing (single-flight) for identical concurrent database reads."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import orjson
+
+from stac_fastapi.core.utilities import get_bool_env
+
+T = TypeVar("T")
+
+
+def copy_json(value: Any) -> Any:
+    """Deep copy a JSON-compatible value, faster than `copy.deepcopy`.
+
+    Args:
+        value (Any): The value to copy. Tuples are copied as lists.
+
+    Returns:
+        Any: An equal value sharing no mutable object with the original.
+    """
+    return orjson.loads(orjson.dumps(value))
+
+
+class CoalescingStats:
+    """Counters of a coalesced operation."""
+
+    __slots__ = ("calls", "executions")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.calls = 0
+        self.executions = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Get the number of calls served by another call's execution."""
+        return self.calls - self.executions
+
+    @property
+    def ratio(self) -> float:
+        """Get the share of calls that were coalesced, between 0 and 1."""
+        return self.coalesced / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the counters as a dictionary.
+
+        Returns:
+            Dict[str, Any]: The calls, executions, coalesced calls and coalescing ratio.
+        """
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "ratio": round(self.ratio, 4),
+        }
+
+
+class RequestCoalescer:
+    """Shares one in-flight execution between identical concurrent calls.
+
+    The first call for a key runs the operation, calls made with the same key while
+    it is running await its result instead of sending their own request. Writes call
+    `invalidate` once done, so that reads started afterwards never join an execution
+    that started before the write.
+    """
+
+    _shared_instance: Optional["RequestCoalescer"] = None
+
+    def __init__(self, enabled: Optional[bool] = None):
+        """Initialize the coalescer.
+
+        Args:
+            enabled (Optional[bool]): Whether calls are coalesced. Defaults to the
+                ENABLE_REQUEST_COALESCING environment variable.
+        """
+        self.enabled = (
+            enabled
+            if enabled is not None
+            else get_bool_env("ENABLE_REQUEST_COALESCING", default=True)
+        )
+        self._inflight: Dict[Tuple[str, int, Hashable], asyncio.Future] = {}
+        self._stats: Dict[str, CoalescingStats] = {}
+        self._generation = 0
+
+    @classmethod
+    def shared(cls) -> "RequestCoalescer":
+        """Get the process-wide coalescer instance.
+
+        Returns:
+            RequestCoalescer: Coalescer shared by every `DatabaseLogic` in the process.
+        """
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+    async def run(
+        self,
+        operation: str,
+        key: Hashable,
+        fn: Callable[[], Awaitable[T]],
+        copy: Optional[Callable[[T], T]] = None,
+    ) -> T:
+        """Run an operation, or join the identical one already in flight.
+
+        Args:
+            operation (str): Name of the operation, used to group the statistics.
+            key (Hashable): Identifies identical calls of the operation.
+            fn (Callable[[], Awaitable[T]]): Coroutine function running the operation.
+            copy (Optional[Callable[[T], T]]): Applied to the result of every call, so
+                that callers never share mutable results, even with calls joining after
+                the execution returned.
+
+        Returns:
+            T: The result of the operation.
+
+        Raises:
+            Exception: Any exception raised by the operation, to every joined call.
+        """
+        if not self.enabled:
+            return await fn()
+
+        stats = self._stats.setdefault(operation, CoalescingStats())
+        stats.calls += 1
+
+        flight_key = (operation, self._generation, key)
+        flight = self._inflight.get(flight_key)
+        if flight is not None:
+            # Shielded, so that a cancelled caller does not cancel the others
+            result = await asyncio.shield(flight)
+            return copy(result) if copy is not None else result
+
+        stats.executions += 1
+        flight = asyncio.ensure_future(fn())
+        self._inflight[flight_key] = flight
+        flight.add_done_callback(lambda task: self._finish(flight_key, task))
+        result = await asyncio.shield(flight)
+        return copy(result) if copy is not None else result
+
+    def _finish(
+        self, flight_key: Tuple[str, int, Hashable], task: asyncio.Task
+    ) -> None:
+        """Forget a finished execution."""
+        self._inflight.pop(flight_key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller was cancelled
+            task.exception()
+
+    def invalidate(self) -> None:
+        """Stop later calls from joining the executions currently in flight."""
+        self._generation += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the coalescing statistics of every operation.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Counters and coalescing ratio keyed by operation.
+        """
+        return {operation: stats.to_dict() for operation, stats in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        """Reset the coalescing statistics."""
+        self._stats.clear()
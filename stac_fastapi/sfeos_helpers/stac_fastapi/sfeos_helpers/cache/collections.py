@@ -0,0 +1,218 @@
+"""Registry of the collections known to exist, used by existence checks."""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from stac_fastapi.core.utilities import get_number_env
+
+from .invalidation import COLLECTIONS, InvalidationBus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COLLECTION_REGISTRY_TTL = 300.0
+DEFAULT_COLLECTION_REGISTRY_UNSHARED_TTL = 10.0
+DEFAULT_COLLECTION_REGISTRY_NEGATIVE_TTL = 5.0
+
+ExistenceLoader = Callable[[str], Awaitable[bool]]
+
+
+class CollectionRegistry:
+    """Caches whether collections exist, so that item writes and reads skip the lookup.
+
+    The registry is populated at startup with every collection id, and kept up to date
+    by the collection write paths of this worker. Collections created or deleted by
+    other workers are dropped through the invalidation bus, or once their entry
+    expires. Without a shared bus, existing collections are only remembered for a
+    short time by default, so that a collection deleted by another worker is soon
+    seen, and so are missing collections, for collections created by other workers.
+    A read that started before this worker deleted a collection does not record it
+    as existing again.
+    """
+
+    _shared_instance: Optional["CollectionRegistry"] = None
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        negative_ttl_seconds: Optional[float] = None,
+        invalidation_bus: Optional[InvalidationBus] = None,
+    ):
+        """Initialize the registry.
+
+        Args:
+            ttl_seconds (Optional[float]): Seconds a collection is known to exist.
+                Defaults to the COLLECTION_REGISTRY_TTL environment variable, itself
+                defaulting to a short TTL if invalidations are not shared with other
+                workers. A value of 0 disables the registry.
+            negative_ttl_seconds (Optional[float]): Seconds a collection is known not to
+                exist. Defaults to the COLLECTION_REGISTRY_NEGATIVE_TTL environment
+                variable.
+            invalidation_bus (Optional[InvalidationBus]): Bus sharing invalidations with
+                other workers. Defaults to the process-wide bus.
+        """
+        self._entries: Dict[str, Tuple[float, bool]] = {}
+        self._loads: Dict[str, "asyncio.Future[bool]"] = {}
+        self.invalidation_bus = (
+            invalidation_bus
+            if invalidation_bus is not None
+            else InvalidationBus.shared()
+        )
+        self._ttl = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else get_number_env(
+                "COLLECTION_REGISTRY_TTL",
+                (
+                    DEFAULT_COLLECTION_REGISTRY_TTL
+                    if self.invalidation_bus.enabled
+                    else DEFAULT_COLLECTION_REGISTRY_UNSHARED_TTL
+                ),
+                minimum=0,
+            )
+        )
+        self._negative_ttl = (
+            negative_ttl_seconds
+            if negative_ttl_seconds is not None
+            else get_number_env(
+                "COLLECTION_REGISTRY_NEGATIVE_TTL",
+                DEFAULT_COLLECTION_REGISTRY_NEGATIVE_TTL,
+                minimum=0,
+            )
+        )
+        self.invalidation_bus.subscribe(COLLECTIONS, self._drop)
+
+    @classmethod
+    def shared(cls) -> "CollectionRegistry":
+        """Get the process-wide registry instance.
+
+        Returns:
+            CollectionRegistry: Registry shared by every `DatabaseLogic` in the process.
+        """
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+    @property
+    def enabled(self) -> bool:
+        """Whether collection existence is cached."""
+        return self._ttl > 0
+
+    def get(self, collection_id: str) -> Optional[bool]:
+        """Get whether a collection is known to exist.
+
+        Args:
+            collection_id (str): Collection identifier.
+
+        Returns:
+            Optional[bool]: Whether the collection exists, None if unknown or expired.
+        """
+        entry = self._entries.get(collection_id)
+        if entry is None:
+            return None
+        expires_at, exists = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(collection_id, None)
+            return None
+        return exists
+
+    def set(self, collection_id: str, exists: bool) -> None:
+        """Record whether a collection exists, as read from the search engine.
+
+        Args:
+            collection_id (str): Collection identifier.
+            exists (bool): Whether the collection exists.
+        """
+        if not self.enabled:
+            return
+        if exists and self.get(collection_id) is False:
+            # Read before the collection was deleted
+            return
+        ttl = self._ttl if exists else self._negative_ttl
+        if ttl > 0:
+            self._entries[collection_id] = (time.monotonic() + ttl, exists)
+        else:
+            self._entries.pop(collection_id, None)
+
+    def populate(self, collection_ids: Iterable[str]) -> None:
+        """Record that collections exist, e.g. every collection at startup.
+
+        Args:
+            collection_ids (Iterable[str]): Identifiers of existing collections.
+        """
+        for collection_id in collection_ids:
+            self._entries.pop(collection_id, None)
+            self.set(collection_id, True)
+
+    async def exists(self, collection_id: str, loader: ExistenceLoader) -> bool:
+        """Get whether a collection exists, loading it once on a miss.
+
+        Args:
+            collection_id (str): Collection identifier.
+            loader (ExistenceLoader): Coroutine function checking the search engine.
+
+        Returns:
+            bool: Whether the collection exists.
+        """
+        if not self.enabled:
+            return await loader(collection_id)
+        exists = self.get(collection_id)
+        if exists is not None:
+            return exists
+
+        load = self._loads.get(collection_id)
+        if load is None:
+            load = asyncio.ensure_future(loader(collection_id))
+            self._loads[collection_id] = load
+            load.add_done_callback(lambda task: self._finish_load(collection_id, task))
+        return await asyncio.shield(load)
+
+    def _finish_load(self, collection_id: str, task: "asyncio.Future[bool]") -> None:
+        """Record a completed load, unless the collection changed meanwhile."""
+        if self._loads.get(collection_id) is not task:
+            return
+        del self._loads[collection_id]
+        if not task.cancelled() and task.exception() is None:
+            self.set(collection_id, bool(task.result()))
+
+    def _drop(self, collection_ids: Optional[Iterable[str]]) -> None:
+        """Forget collections, which are loaded again on their next check.
+
+        Args:
+            collection_ids (Optional[Iterable[str]]): Collections created or deleted. If
+                None, every collection is forgotten.
+        """
+        if collection_ids is None:
+            self._entries.clear()
+            self._loads.clear()
+            return
+        for collection_id in collection_ids:
+            self._entries.pop(collection_id, None)
+            self._loads.pop(collection_id, None)
+
+    async def add(self, collection_id: str) -> None:
+        """Record a collection created by this worker and tell the other workers.
+
+        Args:
+            collection_id (str): Identifier of the created collection.
+        """
+        self._loads.pop(collection_id, None)
+        self._entries.pop(collection_id, None)
+        self.set(collection_id, True)
+        await self.invalidation_bus.publish(COLLECTIONS, [collection_id])
+
+    async def remove(self, collection_id: str) -> None:
+        """Record a collection deleted by this worker and tell the other workers.
+
+        Args:
+            collection_id (str): Identifier of the deleted collection.
+        """
+        self._loads.pop(collection_id, None)
+        self.set(collection_id, False)
+        await self.invalidation_bus.publish(COLLECTIONS, [collection_id])
+
+    async def invalidate(self) -> None:
+        """Forget every collection, e.g. after deleting all of them."""
+        self._drop(None)
+        await self.invalidation_bus.publish(COLLECTIONS)
@@ -0,0 +1,367 @@
+"""Cache invalidation shared between the worker processes of a deployment."""
+
+import asyncio
+import importlib
+import inspect
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import orjson
+
+from stac_fastapi.core.utilities import get_number_env
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+ALL_COLLECTIONS = "*"
+
+# Caches kept coherent across workers
+ALIASES = "aliases"
+COLLECTIONS = "collections"
+QUERYABLES = "queryables"
+SEARCH = "search"
+
+DEFAULT_INVALIDATION_POLL_INTERVAL = 1.0
+
+InvalidationListener = Callable[[Optional[Set[str]]], Any]
+
+
+class InvalidationBackend(ABC):
+    """Version counters shared by every worker of a deployment.
+
+    Every key, `<cache>:<collection id>`, holds the number of times the cached data of
+    that collection was invalidated. Workers bump the keys of the collections they
+    write to and periodically read every key, invalidating their own copy of the data
+    whose version changed. Implement this class to share the counters through an
+    external store, e.g. with `HINCRBY` and `HGETALL` on a Redis hash.
+    """
+
+    @abstractmethod
+    async def bump(self, keys: Iterable[str]) -> Dict[str, int]:
+        """Increment version counters.
+
+        Args:
+            keys (Iterable[str]): The keys to increment, missing keys start at 0.
+
+        Returns:
+            Dict[str, int]: The new version of every key.
+        """
+        pass
+
+    @abstractmethod
+    async def get_versions(self) -> Dict[str, int]:
+        """Get every version counter.
+
+        Returns:
+            Dict[str, int]: The version of every key bumped so far.
+        """
+        pass
+
+
+class FileInvalidationBackend(InvalidationBackend):
+    """Version counters kept in a JSON file, for workers sharing a filesystem.
+
+    Updates hold an exclusive `flock` on the file, so that concurrent bumps from
+    several processes are not lost. File operations run in the default executor.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the backend.
+
+        Args:
+            path (str): Path of the file, created on the first bump.
+        """
+        if fcntl is None:
+            raise RuntimeError("FileInvalidationBackend requires fcntl file locks")
+        self.path = path
+
+    def _read(self, file: Any) -> Dict[str, int]:
+        """Read the counters from an open file."""
+        file.seek(0)
+        data = file.read()
+        return orjson.loads(data) if data else {}
+
+    def _bump(self, keys: List[str]) -> Dict[str, int]:
+        """Increment counters with an exclusive lock on the file."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, "r+b") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            versions = self._read(file)
+            for key in keys:
+                versions[key] = versions.get(key, 0) + 1
+            file.seek(0)
+            file.truncate()
+            file.write(orjson.dumps(versions))
+            file.flush()
+        return {key: versions[key] for key in keys}
+
+    def _get_versions(self) -> Dict[str, int]:
+        """Read the counters with a shared lock on the file."""
+        try:
+            with open(self.path, "rb") as file:
+                fcntl.flock(file, fcntl.LOCK_SH)
+                return self._read(file)
+        except FileNotFoundError:
+            return {}
+
+    async def bump(self, keys: Iterable[str]) -> Dict[str, int]:
+        """Increment version counters in the file."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._bump, list(keys)
+        )
+
+    async def get_versions(self) -> Dict[str, int]:
+        """Get every version counter from the file."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._get_versions
+        )
+
+
+class InvalidationBus:
+    """Broadcasts per-collection cache invalidations to every worker.
+
+    Caches publish the collections whose data they dropped after a write, and
+    subscribe a listener dropping their own data. A background task started with
+    `start` polls the version counters of the backend and calls the listeners of the
+    collections invalidated by other workers. Without a backend, publishing is a
+    no-op and caches are only invalidated by the writes of their own worker.
+    """
+
+    _shared_instance: Optional["InvalidationBus"] = None
+
+    def __init__(
+        self,
+        backend: Optional[InvalidationBackend] = None,
+        poll_interval_seconds: Optional[float] = None,
+    ):
+        """Initialize the bus.
+
+        Args:
+            backend (Optional[InvalidationBackend]): Where versions are shared. Defaults
+                to the backend configured by the CACHE_INVALIDATION_BACKEND environment
+                variable, or none.
+            poll_interval_seconds (Optional[float]): Seconds between two polls of the
+                backend. Defaults to the CACHE_INVALIDATION_POLL_INTERVAL environment
+                variable.
+        """
+        self.backend = backend if backend is not None else get_invalidation_backend()
+        self.poll_interval = (
+            poll_interval_seconds
+            if poll_interval_seconds is not None
+            else get_invalidation_poll_interval()
+        )
+        self._listeners: Dict[str, List[InvalidationListener]] = {}
+        # Versions this worker is up to date with, None until the first poll
+        self._seen: Optional[Dict[str, int]] = None
+        self._poller: Optional[asyncio.Task] = None
+        # Loop the bus is used from, for publishes made from other threads
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def shared(cls) -> "InvalidationBus":
+        """Get the process-wide bus instance.
+
+        Returns:
+            InvalidationBus: Bus shared by every cache in the process.
+        """
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+    @property
+    def enabled(self) -> bool:
+        """Whether invalidations are shared with other workers."""
+        return self.backend is not None
+
+    def subscribe(self, cache: str, listener: InvalidationListener) -> None:
+        """Register a listener for the invalidations of a cache made by other workers.
+
+        Args:
+            cache (str): Name of the cache.
+            listener (InvalidationListener): Called with the invalidated collection ids,
+                or None if the whole cache was invalidated. May be a coroutine function.
+        """
+        listeners = self._listeners.setdefault(cache, [])
+        if listener not in listeners:
+            listeners.append(listener)
+
+    async def publish(
+        self, cache: str, collection_ids: Optional[Iterable[str]] = None
+    ) -> None:
+        """Tell the other workers that cached data of collections is outdated.
+
+        Args:
+            cache (str): Name of the cache.
+            collection_ids (Optional[Iterable[str]]): Collections whose data changed. If
+                None, the whole cache is invalidated.
+        """
+        if not self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        keys = [
+            f"{cache}:{collection_id}"
+            for collection_id in (
+                collection_ids if collection_ids is not None else [ALL_COLLECTIONS]
+            )
+        ]
+        if not keys:
+            return
+        try:
+            versions = await self.backend.bump(keys)
+        except Exception as e:
+            logger.error(f"Cache invalidation broadcast failed: {e}")
+            return
+        if self._seen is not None:
+            for key, version in versions.items():
+                # Skip our own bump, unless another worker bumped the key meanwhile
+                if self._seen.get(key, 0) == version - 1:
+                    self._seen[key] = version
+
+    def publish_nowait(
+        self, cache: str, collection_ids: Optional[Iterable[str]] = None
+    ) -> None:
+        """Publish from synchronous code, see `publish`.
+
+        From a thread without an event loop, e.g. `bulk_sync` in the threadpool, the
+        publish is scheduled on the loop the bus is used from, so that the versions
+        seen by the bus are only ever changed by that loop.
+
+        Args:
+            cache (str): Name of the cache.
+            collection_ids (Optional[Iterable[str]]): Collections whose data changed.
+        """
+        if not self.enabled:
+            return
+        collection_ids = list(collection_ids) if collection_ids is not None else None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            loop.create_task(self.publish(cache, collection_ids))
+        elif self._loop is not None and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(
+                self.publish(cache, collection_ids), self._loop
+            )
+        else:
+            asyncio.run(self.publish(cache, collection_ids))
+
+    async def poll(self) -> int:
+        """Call the listeners of the caches invalidated by other workers.
+
+        The first poll only records the current versions.
+
+        Returns:
+            int: The number of invalidated keys.
+        """
+        if not self.enabled:
+            return 0
+        self._loop = asyncio.get_running_loop()
+        versions = await self.backend.get_versions()
+        if self._seen is None:
+            self._seen = dict(versions)
+            return 0
+
+        changed: Dict[str, Optional[Set[str]]] = {}
+        count = 0
+        for key, version in versions.items():
+            if self._seen.get(key, 0) >= version:
+                continue
+            self._seen[key] = version
+            count += 1
+            cache, _, collection_id = key.partition(":")
+            if collection_id == ALL_COLLECTIONS:
+                changed[cache] = None
+            elif changed.get(cache, set()) is not None:
+                changed.setdefault(cache, set()).add(collection_id)
+
+        for cache, collection_ids in changed.items():
+            for listener in self._listeners.get(cache, ()):
+                try:
+                    result = listener(collection_ids)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Invalidation of the {cache} cache failed: {e}")
+        return count
+
+    def start(self) -> None:
+        """Start polling the backend, if there is one, from the running event loop."""
+        if not self.enabled or (self._poller is not None and not self._poller.done()):
+            return
+        self._loop = asyncio.get_running_loop()
+        self._poller = self._loop.create_task(self._poll_forever())
+
+    async def close(self) -> None:
+        """Stop polling the backend."""
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+
+    async def _poll_forever(self) -> None:
+        """Poll the backend until cancelled."""
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"Cache invalidation poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+
+def get_invalidation_poll_interval() -> float:
+    """Get the interval between two polls of the invalidation backend.
+
+    Returns:
+        float: The CACHE_INVALIDATION_POLL_INTERVAL environment variable in seconds, or
+            the default if unset or invalid.
+    """
+    return get_number_env(
+        "CACHE_INVALIDATION_POLL_INTERVAL",
+        DEFAULT_INVALIDATION_POLL_INTERVAL,
+        minimum=0,
+        exclusive_minimum=True,
+    )
+
+
+def get_invalidation_backend() -> Optional[InvalidationBackend]:
+    """Create the invalidation backend configured by environment variables.
+
+    CACHE_INVALIDATION_BACKEND is either unset, for no backend, `file` for a
+    `FileInvalidationBackend` at CACHE_INVALIDATION_FILE, or the `module:Class` path of an
+    `InvalidationBackend` subclass created without arguments.
+
+    Returns:
+        Optional[InvalidationBackend]: The backend, or None.
+    """
+    name = os.getenv("CACHE_INVALIDATION_BACKEND", "").strip()
+    if not name or name.lower() == "none":
+        return None
+    if name.lower() == "file":
+        return FileInvalidationBackend(
+            os.getenv(
+                "CACHE_INVALIDATION_FILE",
+                os.path.join(tempfile.gettempdir(), "stac-fastapi-cache-versions.json"),
+            )
+        )
+    try:
+        module_name, _, class_name = name.partition(":")
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+        return backend_class()
+    except Exception as e:
+        logger.error(
+            f"Invalid value for CACHE_INVALIDATION_BACKEND environment variable: "
+            f"'{name}' ({e}). Must be 'file' or a 'module:Class' path. "
+            f"Cache invalidations are not shared between workers."
+        )
+    return None
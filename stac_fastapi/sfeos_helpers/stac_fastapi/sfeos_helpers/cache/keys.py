@@ -0,0 +1,31 @@
+"""Key building functions for the caches."""
+
+import hashlib
+from typing import Any
+
+import orjson
+
+
+def make_key(prefix: str, **parts: Any) -> str:
+    """Build a key from the parameters of a request.
+
+    Args:
+        prefix (str): Namespace of the key, such as the name of the cached operation.
+        **parts: JSON-serializable values determining the result of the request.
+
+    Returns:
+        str: A key that is equal for equal parameters, whatever the dict ordering.
+    """
+    normalized = orjson.dumps(
+        parts,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        default=_jsonable,
+    )
+    return f"{prefix}:{hashlib.sha256(normalized).hexdigest()}"
+
+
+def _jsonable(value: Any) -> Any:
+    """Serialize values orjson does not support natively, such as sets."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
@@ -0,0 +1,250 @@
+"""Cache for the queryables mapping used by CQL2 filter translation."""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from stac_fastapi.core.utilities import get_number_env
+
+from .invalidation import QUERYABLES, InvalidationBus
+
+logger = logging.getLogger(__name__)
+
+ALL_COLLECTIONS = "*"
+
+QueryablesLoader = Callable[[str], Awaitable[Dict[str, str]]]
+
+
+class QueryablesMappingCache:
+    """Caches queryables mappings per collection with expiration.
+
+    Entries are keyed by collection id, with ``"*"`` holding the mapping of every
+    item index. A filter scoped to a set of collections only loads the mappings of
+    those collections instead of the whole cluster mapping.
+    """
+
+    _shared_instance: Optional["QueryablesMappingCache"] = None
+
+    def __init__(
+        self,
+        cache_ttl_seconds: Optional[float] = None,
+        invalidation_bus: Optional[InvalidationBus] = None,
+    ):
+        """Initialize the queryables mapping cache.
+
+        Args:
+            cache_ttl_seconds (Optional[float]): Time-to-live for cache entries in seconds.
+                Defaults to the QUERYABLES_CACHE_TTL environment variable. A value of 0
+                disables caching.
+            invalidation_bus (Optional[InvalidationBus]): Bus sharing invalidations with
+                other workers. Defaults to the process-wide bus.
+        """
+        self._entries: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._ttl = (
+            cache_ttl_seconds
+            if cache_ttl_seconds is not None
+            else self._get_ttl_from_env()
+        )
+        self.invalidation_bus = (
+            invalidation_bus
+            if invalidation_bus is not None
+            else InvalidationBus.shared()
+        )
+        self.invalidation_bus.subscribe(QUERYABLES, self._drop)
+
+    @classmethod
+    def shared(cls) -> "QueryablesMappingCache":
+        """Get the process-wide cache instance.
+
+        Returns:
+            QueryablesMappingCache: Cache shared by every `DatabaseLogic` in the process.
+        """
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is enabled.
+
+        Returns:
+            bool: True if entries are kept between calls, False otherwise.
+        """
+        return self._ttl > 0
+
+    def _get_entry(self, collection_id: str) -> Optional[Dict[str, str]]:
+        """Get a cache entry if present and not expired.
+
+        Args:
+            collection_id (str): Collection identifier or "*".
+
+        Returns:
+            Optional[Dict[str, str]]: Cached mapping, or None if missing or expired.
+        """
+        entry = self._entries.get(collection_id)
+        if entry is None:
+            return None
+        timestamp, mapping = entry
+        if time.monotonic() - timestamp > self._ttl:
+            self._entries.pop(collection_id, None)
+            return None
+        return mapping
+
+    async def _load(
+        self, collection_id: str, loader: QueryablesLoader
+    ) -> Dict[str, str]:
+        """Load a mapping once, even when requested concurrently.
+
+        Args:
+            collection_id (str): Collection identifier or "*".
+            loader (QueryablesLoader): Coroutine function fetching the mapping.
+
+        Returns:
+            Dict[str, str]: The queryables mapping for the collection.
+        """
+        # Locks are dropped once no load holds or waits for them
+        lock = self._locks.get(collection_id)
+        if lock is None:
+            lock = self._locks[collection_id] = asyncio.Lock()
+        async with lock:
+            mapping = self._get_entry(collection_id)
+            if mapping is None:
+                mapping = await loader(collection_id)
+                self._entries[collection_id] = (time.monotonic(), mapping)
+                logger.debug(f"Loaded queryables mapping for '{collection_id}'")
+            return mapping
+
+    async def get_mapping(
+        self, collection_ids: Optional[List[str]], loader: QueryablesLoader
+    ) -> Dict[str, str]:
+        """Get the queryables mapping for the given collections.
+
+        Args:
+            collection_ids (Optional[List[str]]): Collections the filter is scoped to.
+                If None or empty, the mapping of all item indexes is returned.
+            loader (QueryablesLoader): Coroutine function fetching the mapping of a
+                single collection id (or "*") on a cache miss.
+
+        Returns:
+            Dict[str, str]: The merged queryables mapping.
+        """
+        keys = collection_ids or [ALL_COLLECTIONS]
+
+        if not self.enabled:
+            mappings = [await loader(key) for key in keys]
+        else:
+            mappings = []
+            for key in keys:
+                mapping = self._get_entry(key)
+                if mapping is None:
+                    mapping = await self._load(key, loader)
+                mappings.append(mapping)
+
+        merged: Dict[str, str] = {}
+        for mapping in mappings:
+            merged.update(mapping)
+        return merged
+
+    def _drop(self, collection_ids: Optional[Iterable[str]]) -> None:
+        """Drop the entries of collections and the "*" entry.
+
+        Args:
+            collection_ids (Optional[Iterable[str]]): Collections whose mapping changed.
+                If None, the whole cache is cleared.
+        """
+        if collection_ids is None:
+            self._entries.clear()
+            return
+        for collection_id in collection_ids:
+            self._entries.pop(collection_id, None)
+        self._entries.pop(ALL_COLLECTIONS, None)
+
+    def invalidate(self, collection_id: Optional[str] = None) -> None:
+        """Invalidate cached mappings.
+
+        Args:
+            collection_id (Optional[str]): Collection whose mapping changed. Its entry and
+                the "*" entry are dropped. If None, the whole cache is cleared.
+        """
+        collection_ids = [collection_id] if collection_id is not None else None
+        self._drop(collection_ids)
+        if self.enabled:
+            self.invalidation_bus.publish_nowait(QUERYABLES, collection_ids)
+
+    def _drop_outdated(self, item: Dict[str, Any]) -> bool:
+        """Drop the cached mappings that may not cover the fields of an item.
+
+        Args:
+            item (Dict[str, Any]): The database-ready item that was written.
+
+        Returns:
+            bool: Whether the mappings of other workers may not cover the fields either,
+                i.e. an entry was dropped or none of the collection could be checked.
+        """
+        collection_id = item.get("collection")
+        keys = [key for key in (collection_id, ALL_COLLECTIONS) if key in self._entries]
+        if not keys:
+            return True
+
+        fields = [
+            key
+            for key, value in item.items()
+            if key != "properties" and value not in (None, [])
+        ]
+        fields.extend(
+            key
+            for key, value in (item.get("properties") or {}).items()
+            if value not in (None, [])
+        )
+
+        outdated = collection_id not in keys
+        for key in keys:
+            mapping = self._entries[key][1]
+            if not all(field in mapping for field in fields):
+                self._entries.pop(key, None)
+                outdated = True
+        return outdated
+
+    def invalidate_for_item(self, item: Dict[str, Any]) -> None:
+        """Invalidate cached mappings that may not cover the fields of a new item.
+
+        An entry is kept when every non-null top-level field and property of the item
+        is already part of it, since indexing the item cannot change that mapping.
+
+        Args:
+            item (Dict[str, Any]): The database-ready item that was written.
+        """
+        self.invalidate_for_items([item])
+
+    def invalidate_for_items(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Invalidate cached mappings that may not cover the fields of new items.
+
+        Args:
+            items (Iterable[Dict[str, Any]]): The database-ready items that were written.
+        """
+        if not self.enabled:
+            return
+        shared = self.invalidation_bus.enabled
+        outdated = set()
+        for item in items:
+            if not self._entries and not shared:
+                return
+            if self._drop_outdated(item):
+                outdated.add(item.get("collection"))
+        outdated.discard(None)
+        if outdated and shared:
+            self.invalidation_bus.publish_nowait(QUERYABLES, outdated)
+
+    @staticmethod
+    def _get_ttl_from_env() -> float:
+        """Get the cache TTL from environment variable with error handling.
+
+        Returns:
+            float: Time-to-live for cache entries in seconds.
+        """
+        return get_number_env("QUERYABLES_CACHE_TTL", 1800.0, minimum=0)
@@ -0,0 +1,371 @@
+"""Cache for item search results with write-driven invalidation."""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import orjson
+
+from stac_fastapi.core.utilities import get_bool_env, get_number_env
+
+from .invalidation import SEARCH, InvalidationBus
+from .keys import make_key
+
+logger = logging.getLogger(__name__)
+
+ALL_COLLECTIONS = "*"
+
+DEFAULT_SEARCH_CACHE_TTL = 60.0
+DEFAULT_SEARCH_CACHE_MAX_ENTRIES = 1000
+
+SearchResult = Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]
+
+
+class SearchCacheBackend(ABC):
+    """Storage used by `SearchResultCache`.
+
+    Values are opaque bytes. Every entry is stored with a set of tags, the ids of the
+    collections the search covers or "*" for searches over every collection, so that
+    entries can be dropped per collection. Implement this class to keep results in
+    an external store shared by several workers.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value if present and not expired.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[bytes]: The stored value, or None on a miss.
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float, tags: Set[str]) -> None:
+        """Store a value.
+
+        Args:
+            key (str): The cache key.
+            value (bytes): The value to store.
+            ttl (float): Seconds after which the value expires.
+            tags (Set[str]): Tags the value can be invalidated by.
+        """
+        pass
+
+    @abstractmethod
+    async def invalidate_tags(self, tags: Set[str]) -> None:
+        """Drop every value stored with one of the tags.
+
+        Args:
+            tags (Set[str]): The tags to invalidate.
+        """
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop every value."""
+        pass
+
+
+class InMemorySearchCacheBackend(SearchCacheBackend):
+    """Size-bounded LRU backend kept in the memory of the current process."""
+
+    def __init__(self, max_entries: int = DEFAULT_SEARCH_CACHE_MAX_ENTRIES):
+        """Initialize the backend.
+
+        Args:
+            max_entries (int): Number of entries kept before the least recently used
+                one is evicted.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Set[str]]]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value if present and not expired, marking it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float, tags: Set[str]) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, value, set(tags))
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    async def invalidate_tags(self, tags: Set[str]) -> None:
+        """Drop every value stored with one of the tags."""
+        for tag in tags:
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._remove(key)
+
+    async def clear(self) -> None:
+        """Drop every value."""
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and its tag references."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class SearchResultCache:
+    """Caches item search results, invalidated per collection by write paths.
+
+    Results are keyed on everything that determines a page: the query, sort,
+    pagination token, limit, selected indexes and returned fields. Writes to a
+    collection drop the entries of searches over that collection and of searches
+    over every collection. Entries also expire after a TTL, which bounds how long
+    writes made without a refresh, or by other processes, can stay invisible.
+    """
+
+    _shared_instance: Optional["SearchResultCache"] = None
+
+    def __init__(
+        self,
+        backend: Optional[SearchCacheBackend] = None,
+        ttl_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None,
+        invalidation_bus: Optional[InvalidationBus] = None,
+    ):
+        """Initialize the search result cache.
+
+        Args:
+            backend (Optional[SearchCacheBackend]): Where results are stored. Defaults to
+                an in-process LRU bounded by the SEARCH_CACHE_MAX_ENTRIES environment variable.
+            ttl_seconds (Optional[float]): Time-to-live of results in seconds. Defaults to
+                the SEARCH_CACHE_TTL environment variable.
+            enabled (Optional[bool]): Whether results are cached. Defaults to the
+                ENABLE_SEARCH_CACHE environment variable.
+            invalidation_bus (Optional[InvalidationBus]): Bus sharing invalidations with
+                other workers. Defaults to the process-wide bus.
+        """
+        self.enabled = (
+            enabled if enabled is not None else get_bool_env("ENABLE_SEARCH_CACHE")
+        )
+        self.ttl = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else get_number_env(
+                "SEARCH_CACHE_TTL",
+                DEFAULT_SEARCH_CACHE_TTL,
+                minimum=0,
+                exclusive_minimum=True,
+            )
+        )
+        if backend is None:
+            backend = InMemorySearchCacheBackend(
+                int(
+                    get_number_env(
+                        "SEARCH_CACHE_MAX_ENTRIES",
+                        DEFAULT_SEARCH_CACHE_MAX_ENTRIES,
+                        minimum=0,
+                        exclusive_minimum=True,
+                    )
+                )
+            )
+        self.backend = backend
+        # Bumped on every invalidation, so that results read before a write are not
+        # stored after it
+        self._generation = 0
+        # Loop the entries and the generation are used from, invalidations made from
+        # other threads run on it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.invalidation_bus = (
+            invalidation_bus
+            if invalidation_bus is not None
+            else InvalidationBus.shared()
+        )
+        self.invalidation_bus.subscribe(SEARCH, self._drop)
+
+    @classmethod
+    def shared(cls) -> "SearchResultCache":
+        """Get the process-wide cache instance.
+
+        Returns:
+            SearchResultCache: Cache shared by every `DatabaseLogic` in the process.
+        """
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+    @property
+    def generation(self) -> int:
+        """Get the number of invalidations so far, to pass to `set`."""
+        return self._generation
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Build a cache key from the parameters of a search.
+
+        Args:
+            **parts: JSON-serializable values determining the search result.
+
+        Returns:
+            str: A key that is equal for equal parameters, whatever the dict ordering.
+        """
+        return make_key("search", **parts)
+
+    @staticmethod
+    def tags_for(collection_ids: Optional[Iterable[str]]) -> Set[str]:
+        """Get the tags of a search.
+
+        Args:
+            collection_ids (Optional[Iterable[str]]): Collections the search covers.
+
+        Returns:
+            Set[str]: The collection ids, or "*" if the search covers every collection.
+        """
+        return set(collection_ids or ()) or {ALL_COLLECTIONS}
+
+    async def get(self, key: str) -> Optional[SearchResult]:
+        """Get a cached search result.
+
+        Args:
+            key (str): Key built with `make_key`.
+
+        Returns:
+            Optional[SearchResult]: The items, numberMatched and next token, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        self._loop = asyncio.get_running_loop()
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Search cache lookup failed: {e}")
+            return None
+        if value is None:
+            return None
+        items, matched, next_token = orjson.loads(value)
+        return items, matched, next_token
+
+    async def set(
+        self,
+        key: str,
+        result: SearchResult,
+        collection_ids: Optional[Iterable[str]],
+        generation: int,
+    ) -> None:
+        """Store a search result.
+
+        Args:
+            key (str): Key built with `make_key`.
+            result (SearchResult): The items, numberMatched and next token.
+            collection_ids (Optional[Iterable[str]]): Collections the search covers.
+            generation (int): Value of `generation` read before the search ran. The result
+                is not stored if the cache was invalidated since.
+        """
+        if not self.enabled or generation != self._generation:
+            return
+        items, matched, next_token = result
+        try:
+            await self.backend.set(
+                key,
+                orjson.dumps([list(items), matched, next_token]),
+                self.ttl,
+                self.tags_for(collection_ids),
+            )
+        except Exception as e:
+            logger.warning(f"Search cache store failed: {e}")
+
+    async def invalidate(self, collection_ids: Optional[Iterable[str]] = None) -> None:
+        """Drop cached results that writes to the given collections may change.
+
+        Args:
+            collection_ids (Optional[Iterable[str]]): Collections that were written to.
+                Results of searches over any of them, and over every collection, are
+                dropped. If None, the whole cache is cleared.
+        """
+        if not self.enabled:
+            return
+        collection_ids = list(collection_ids) if collection_ids is not None else None
+        await self._drop(collection_ids)
+        await self.invalidation_bus.publish(SEARCH, collection_ids)
+
+    async def _drop(self, collection_ids: Optional[Iterable[str]]) -> None:
+        """Drop cached results of collections, without telling other workers.
+
+        Args:
+            collection_ids (Optional[Iterable[str]]): Collections that were written to.
+                If None, the whole cache is cleared.
+        """
+        if not self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._generation += 1
+        try:
+            if collection_ids is None:
+                await self.backend.clear()
+            else:
+                await self.backend.invalidate_tags(
+                    set(collection_ids) | {ALL_COLLECTIONS}
+                )
+        except Exception as e:
+            logger.error(f"Search cache invalidation failed: {e}")
+
+    async def invalidate_for_items(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Drop cached results of the collections of written items.
+
+        Args:
+            items (Iterable[Dict[str, Any]]): The items that were written.
+        """
+        collection_ids = {item.get("collection") for item in items}
+        collection_ids.discard(None)
+        if collection_ids:
+            await self.invalidate(collection_ids)
+
+    def invalidate_sync(self, collection_ids: Optional[Iterable[str]] = None) -> None:
+        """Invalidate from synchronous code, see `invalidate`.
+
+        In a thread running an event loop the backend call is scheduled on that loop,
+        results read before the call are never stored either way. From another thread,
+        e.g. `bulk_sync` in the threadpool, the invalidation runs on the loop the cache
+        is used from and is waited for, so that the entries and the generation are only
+        ever changed by that loop.
+
+        Args:
+            collection_ids (Optional[Iterable[str]]): Collections that were written to.
+        """
+        if not self.enabled:
+            return
+        collection_ids = list(collection_ids) if collection_ids is not None else None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            self._generation += 1
+            loop.create_task(self.invalidate(collection_ids))
+        elif self._loop is not None and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(
+                self.invalidate(collection_ids), self._loop
+            ).result()
+        else:
+            asyncio.run(self.invalidate(collection_ids))
@@ -9,6 +9,8 @@ implementations of STAC FastAPI. It includes:
 4. Document operations for working with documents
 5. Utility functions for database operations
 6. Datetime utilities for query formatting
+7. Point-in-time pagination tokens
+8. Concurrent bulk ingestion
 
 The database package is organized as follows:
 - index.py: Index management functions
@@ -17,6 +19,8 @@ The database package is organized as follows:
 - document.py: Document operations
 - utils.py: Utility functions
 - datetime.py: Datetime utilities for query formatting
+- pit.py: Pagination tokens and point-in-time registry
+- bulk.py: Chunked, concurrent bulk requests with retries
 
 When adding new functionality to this package, consider:
 1. Will this code be used by both Elasticsearch and OpenSearch implementations?
@@ -30,20 +34,32 @@ Function Naming Conventions:
 """
 
 # Re-export all functions for backward compatibility
-from .datetime import extract_date, extract_first_date_from_index, return_date
-from .document import mk_actions, mk_item_id
+from .bulk import BulkSettings, chunk_items, streaming_bulk_shared
+from .datetime import (
+    TEMPORAL_RANGE_SCRIPT,
+    extract_date,
+    extract_first_date_from_index,
+    return_date,
+)
+from .document import get_bulk_conflicts, mk_actions, mk_item_id
 from .index import (
+    IndexIntervals,
     create_index_templates_shared,
     delete_item_index_shared,
     filter_indexes_by_datetime,
     index_alias_by_collection_id,
     index_by_collection_id,
+    index_date_range,
     indices,
 )
 from .mapping import get_queryables_mapping_shared
+from .pit import decode_pagination_token, encode_pagination_token, get_pit_keep_alive
 from .query import (
     apply_free_text_filter_shared,
     apply_intersects_filter_shared,
+    build_source_filter,
+    compile_query,
+    get_number_matched_strategy,
     populate_sort_shared,
 )
 from .utils import get_bool_env, validate_refresh
@@ -55,16 +71,30 @@ __all__ = [
     "index_alias_by_collection_id",
     "index_by_collection_id",
     "filter_indexes_by_datetime",
+    "index_date_range",
+    "IndexIntervals",
     "indices",
     # Query operations
     "apply_free_text_filter_shared",
     "apply_intersects_filter_shared",
+    "build_source_filter",
+    "compile_query",
+    "get_number_matched_strategy",
     "populate_sort_shared",
     # Mapping operations
     "get_queryables_mapping_shared",
+    # Pagination
+    "decode_pagination_token",
+    "encode_pagination_token",
+    "get_pit_keep_alive",
     # Document operations
     "mk_item_id",
     "mk_actions",
+    "get_bulk_conflicts",
+    # Bulk ingestion
+    "BulkSettings",
+    "chunk_items",
+    "streaming_bulk_shared",
     # Utility functions
     "validate_refresh",
     "get_bool_env",
@@ -72,4 +102,5 @@ __all__ = [
     "return_date",
     "extract_date",
     "extract_first_date_from_index",
+    "TEMPORAL_RANGE_SCRIPT",
 ]
@@ -0,0 +1,295 @@
+"""Concurrent bulk ingestion for Elasticsearch/OpenSearch.
+
+This module sends items to the search engine in chunks bounded by a count and a byte
+size, keeps a bounded number of bulk requests in flight, and retries the items
+rejected with a 429 status with jittered exponential backoff.
+"""
+
+import asyncio
+import logging
+import random
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import orjson
+
+from stac_fastapi.core.utilities import get_number_env
+from stac_fastapi.types.stac import Item
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BULK_CHUNK_SIZE = 500
+DEFAULT_BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+DEFAULT_BULK_CONCURRENCY = 4
+DEFAULT_BULK_MAX_RETRIES = 3
+DEFAULT_BULK_INITIAL_BACKOFF = 0.5
+DEFAULT_BULK_MAX_BACKOFF = 30.0
+
+Items = Union[Iterable[Item], AsyncIterable[Item]]
+ActionPreparer = Callable[[List[Item]], Awaitable[List[Dict[str, Any]]]]
+ChunkCallback = Callable[[List[Item], int, List[Dict[str, Any]]], Awaitable[None]]
+
+
+class BulkSettings:
+    """How items are split into bulk requests, and how rejected requests are retried."""
+
+    __slots__ = (
+        "chunk_size",
+        "max_chunk_bytes",
+        "concurrency",
+        "max_retries",
+        "initial_backoff",
+        "max_backoff",
+    )
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+        max_chunk_bytes: int = DEFAULT_BULK_MAX_CHUNK_BYTES,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        max_retries: int = DEFAULT_BULK_MAX_RETRIES,
+        initial_backoff: float = DEFAULT_BULK_INITIAL_BACKOFF,
+        max_backoff: float = DEFAULT_BULK_MAX_BACKOFF,
+    ):
+        """Initialize the settings.
+
+        Args:
+            chunk_size (int): Maximum number of items in one bulk request.
+            max_chunk_bytes (int): Maximum serialized size of the items in one bulk
+                request.
+            concurrency (int): Maximum number of bulk requests in flight.
+            max_retries (int): Number of times items rejected with a 429 status are
+                sent again.
+            initial_backoff (float): Upper bound in seconds of the wait before the
+                first retry, doubled on every following retry.
+            max_backoff (float): Upper bound in seconds of the wait before a retry.
+        """
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+    @classmethod
+    def from_env(cls) -> "BulkSettings":
+        """Read the settings from the BULK_* environment variables.
+
+        Returns:
+            BulkSettings: The settings, with defaults for unset or invalid variables.
+        """
+        return cls(
+            chunk_size=int(
+                get_number_env("BULK_CHUNK_SIZE", DEFAULT_BULK_CHUNK_SIZE, minimum=1)
+            ),
+            max_chunk_bytes=int(
+                get_number_env(
+                    "BULK_MAX_CHUNK_BYTES", DEFAULT_BULK_MAX_CHUNK_BYTES, minimum=1
+                )
+            ),
+            concurrency=int(
+                get_number_env("BULK_CONCURRENCY", DEFAULT_BULK_CONCURRENCY, minimum=1)
+            ),
+            max_retries=int(
+                get_number_env("BULK_MAX_RETRIES", DEFAULT_BULK_MAX_RETRIES, minimum=0)
+            ),
+            initial_backoff=get_number_env(
+                "BULK_INITIAL_BACKOFF", DEFAULT_BULK_INITIAL_BACKOFF, minimum=0
+            ),
+            max_backoff=get_number_env(
+                "BULK_MAX_BACKOFF", DEFAULT_BULK_MAX_BACKOFF, minimum=0
+            ),
+        )
+
+    def replace(self, **changes: Any) -> "BulkSettings":
+        """Copy the settings with some values changed.
+
+        Args:
+            **changes: New values, by setting name.
+
+        Returns:
+            BulkSettings: The copy.
+        """
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return BulkSettings(**values)
+
+    def backoff(self, attempt: int) -> float:
+        """Get the wait before a retry, drawn uniformly below the exponential bound.
+
+        Args:
+            attempt (int): Number of the retry, starting at 1.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        bound = min(self.max_backoff, self.initial_backoff * 2 ** (attempt - 1))
+        return random.uniform(0, bound)
+
+
+async def chunk_items(
+    items: Items, chunk_size: int, max_chunk_bytes: int
+) -> AsyncIterator[List[Item]]:
+    """Split items into chunks bounded by a count and a serialized size.
+
+    Args:
+        items (Items): Items, from an iterable or an async iterable.
+        chunk_size (int): Maximum number of items in a chunk.
+        max_chunk_bytes (int): Maximum serialized size of a chunk. An item larger than
+            this is sent in a chunk of its own.
+
+    Yields:
+        List[Item]: The chunks, in the order of the items.
+    """
+    if not hasattr(items, "__aiter__"):
+        items = _aiter(items)
+
+    chunk: List[Item] = []
+    chunk_bytes = 0
+    async for item in items:  # type: ignore[union-attr]
+        item_bytes = len(orjson.dumps(item))
+        if chunk and (
+            len(chunk) >= chunk_size or chunk_bytes + item_bytes > max_chunk_bytes
+        ):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(item)
+        chunk_bytes += item_bytes
+    if chunk:
+        yield chunk
+
+
+async def _aiter(items: Iterable[Item]) -> AsyncIterator[Item]:
+    """Iterate over items asynchronously."""
+    for item in items:
+        yield item
+
+
+async def streaming_bulk_shared(
+    client: Any,
+    streaming_bulk: Callable[..., AsyncIterable[Tuple[bool, Dict[str, Any]]]],
+    items: Items,
+    prepare_actions: ActionPreparer,
+    settings: BulkSettings,
+    after_chunk: Optional[ChunkCallback] = None,
+    stop_on_error: bool = False,
+    **kwargs: Any,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """Send items to the search engine with concurrent bulk requests.
+
+    Items are read as chunks are sent, so that at most `settings.concurrency` chunks
+    are held in memory and in flight, which slows the producer of an item stream down
+    to the pace of the search engine. Items rejected with a 429 status are sent again
+    after a jittered backoff, other failures are reported.
+
+    Args:
+        client: Async Elasticsearch or OpenSearch client.
+        streaming_bulk: `async_streaming_bulk` helper of the client library.
+        items (Items): Processed items, from an iterable or an async iterable.
+        prepare_actions (ActionPreparer): Coroutine function creating the bulk actions
+            of a chunk of items.
+        settings (BulkSettings): Chunk sizes, concurrency and retries.
+        after_chunk (Optional[ChunkCallback]): Coroutine function called once every
+            chunk is written, with its items, the number written and the errors, e.g.
+            to invalidate caches or report progress.
+        stop_on_error (bool): Whether to stop sending chunks once an item failed.
+        **kwargs: Parameters of the bulk requests, e.g. `refresh`.
+
+    Returns:
+        Tuple[int, List[Dict[str, Any]]]: The number of items written, and an error
+            per failed item, keyed by the operation type like the errors of the bulk
+            helpers.
+    """
+    semaphore = asyncio.Semaphore(settings.concurrency)
+    tasks: Set["asyncio.Future[None]"] = set()
+    failures: List[BaseException] = []
+    success = 0
+    errors: List[Dict[str, Any]] = []
+
+    async def send(chunk: List[Item]) -> None:
+        nonlocal success
+        chunk_success = 0
+        chunk_errors: List[Dict[str, Any]] = []
+        actions = await prepare_actions(chunk)
+        for attempt in range(settings.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(settings.backoff(attempt))
+            rejected = []
+            position = 0
+            async for ok, info in streaming_bulk(
+                client,
+                actions,
+                chunk_size=len(actions),
+                max_chunk_bytes=settings.max_chunk_bytes,
+                raise_on_error=False,
+                raise_on_exception=False,
+                max_retries=0,
+                **kwargs,
+            ):
+                action = actions[position]
+                position += 1
+                if ok:
+                    chunk_success += 1
+                    continue
+                op_type, result = info.popitem()
+                if result.get("status") == 429 and attempt < settings.max_retries:
+                    rejected.append(action)
+                    continue
+                chunk_errors.append(
+                    {
+                        op_type: {
+                            key: value
+                            for key, value in result.items()
+                            if key not in ("data", "exception")
+                        }
+                    }
+                )
+            if not rejected:
+                break
+            logger.info(
+                f"Bulk request rejected {len(rejected)} items, retry {attempt + 1} "
+                f"of {settings.max_retries}"
+            )
+            actions = rejected
+        success += chunk_success
+        errors.extend(chunk_errors)
+        if after_chunk is not None:
+            await after_chunk(chunk, chunk_success, chunk_errors)
+
+    def done(task: "asyncio.Future[None]") -> None:
+        tasks.discard(task)
+        semaphore.release()
+        if not task.cancelled() and task.exception() is not None:
+            failures.append(task.exception())  # type: ignore[arg-type]
+
+    try:
+        async for chunk in chunk_items(
+            items, settings.chunk_size, settings.max_chunk_bytes
+        ):
+            await semaphore.acquire()
+            if failures or (stop_on_error and errors):
+                semaphore.release()
+                break
+            task = asyncio.ensure_future(send(chunk))
+            tasks.add(task)
+            task.add_done_callback(done)
+        if tasks:
+            await asyncio.wait(set(tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+    if failures:
+        raise failures[0]
+    return success, errors
@@ -10,10 +10,29 @@ from datetime import date
 from datetime import datetime as datetime_type
 from typing import Dict, Optional, Union
 
+from stac_fastapi.core.datetime_utils import TEMPORAL_RANGE_FIELD
 from stac_fastapi.types.rfc3339 import DateTimeType
 
 logger = logging.getLogger(__name__)
 
+# Painless statements setting the temporal range field of `ctx._source` like
+# `temporal_range`, for update and reindex scripts
+TEMPORAL_RANGE_SCRIPT = (
+    "if (ctx._source.properties != null) {"
+    "def p = ctx._source.properties;"
+    f"p.remove('{TEMPORAL_RANGE_FIELD}');"
+    "if (p.get('datetime') != null) {"
+    f"p.put('{TEMPORAL_RANGE_FIELD}', ['gte': p.get('datetime'), 'lte': p.get('datetime')]);"
+    "} else if (p.get('start_datetime') != null && p.get('end_datetime') != null) {"
+    "try {"
+    "if (!ZonedDateTime.parse(p.get('start_datetime')).isAfter(ZonedDateTime.parse(p.get('end_datetime')))) {"
+    f"p.put('{TEMPORAL_RANGE_FIELD}', ['gte': p.get('start_datetime'), 'lte': p.get('end_datetime')]);"
+    "}"
+    "} catch (Exception e) {}"
+    "}"
+    "}"
+)
+
 
 def return_date(
     interval: Optional[Union[DateTimeType, str]],
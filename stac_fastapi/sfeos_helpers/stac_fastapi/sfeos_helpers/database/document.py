@@ -23,26 +23,51 @@ def mk_item_id(item_id: str, collection_id: str) -> str:
     return f"{item_id}|{collection_id}"
 
 
-def mk_actions(collection_id: str, processed_items: List[Item]) -> List[Dict[str, Any]]:
+def mk_actions(
+    collection_id: str, processed_items: List[Item], exist_ok: bool = True
+) -> List[Dict[str, Any]]:
     """Create Elasticsearch bulk actions for a list of processed items.
 
     Args:
         collection_id (str): The identifier for the collection the items belong to.
         processed_items (List[Item]): The list of processed items to be bulk indexed.
+        exist_ok (bool): Whether items may replace existing ones. If False, the actions
+            create the items and fail for the items that already exist.
 
     Returns:
         List[Dict[str, Union[str, Dict]]]: The list of bulk actions to be executed,
         each action being a dictionary with the following keys:
+        - `_op_type`: `index`, or `create` if items may not exist already.
         - `_index`: the index to store the document in.
         - `_id`: the document's identifier.
         - `_source`: the source of the document.
     """
     index_alias = index_alias_by_collection_id(collection_id)
+    op_type = "index" if exist_ok else "create"
     return [
         {
+            "_op_type": op_type,
             "_index": index_alias,
             "_id": mk_item_id(item["id"], item["collection"]),
             "_source": item,
         }
         for item in processed_items
     ]
+
+
+def get_bulk_conflicts(errors: List[Dict[str, Any]]) -> List[str]:
+    """Get the items a bulk request did not create because they already exist.
+
+    Args:
+        errors (List[Dict[str, Any]]): Errors returned by the bulk helpers, each keyed by
+            the operation type.
+
+    Returns:
+        List[str]: The ids of the conflicting items.
+    """
+    return [
+        result["_id"].rsplit("|", 1)[0]
+        for error in errors
+        for result in error.values()
+        if result.get("status") == 409
+    ]
@@ -4,9 +4,10 @@ This module provides functions for creating and managing indices in Elasticsearc
 """
 
 import re
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from datetime import date
 from functools import lru_cache
-from typing import Any, List, Optional
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
 
 from dateutil.parser import parse  # type: ignore[import]
 
@@ -70,6 +71,33 @@ def indices(collection_ids: Optional[List[str]]) -> str:
     )
 
 
+INDEX_DATE_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})")
+
+
+def index_date_range(index_name: str) -> Tuple[date, date]:
+    """Extract the date range of a datetime partitioned index from its name.
+
+    Args:
+        index_name (str): Index name or alias, ending with a start date and optionally
+            an end date, e.g. `items_collection_2020-01-01-2020-01-31`.
+
+    Returns:
+        Tuple[date, date]: The start and end dates of the index. Indexes without an
+            end date are open ended, indexes without any date cover every date.
+    """
+    dates = INDEX_DATE_PATTERN.findall(index_name)
+    if not dates:
+        return date.min, date.max
+    start_date = date.fromisoformat(dates[0])
+    end_date = date.fromisoformat(dates[1]) if len(dates) > 1 else date.max
+    return start_date, end_date
+
+
+def _parse_date_filter(dt_str: Optional[str], default: date) -> date:
+    """Parse a datetime filter bound, handling both with and without 'Z' suffix."""
+    return parse(dt_str).replace(tzinfo=None).date() if dt_str else default
+
+
 def filter_indexes_by_datetime(
     indexes: List[str], gte: Optional[str], lte: Optional[str]
 ) -> List[str]:
@@ -83,46 +111,103 @@ def filter_indexes_by_datetime(
     Returns:
         List of filtered index names
     """
-
-    def parse_datetime(dt_str: str) -> datetime:
-        """Parse datetime string, handling both with and without 'Z' suffix."""
-        return parse(dt_str).replace(tzinfo=None)
-
-    def extract_date_range_from_index(index_name: str) -> tuple:
-        """Extract start and end dates from index name."""
-        date_pattern = r"(\d{4}-\d{2}-\d{2})"
-        dates = re.findall(date_pattern, index_name)
-
-        if len(dates) == 1:
-            start_date = datetime.strptime(dates[0], "%Y-%m-%d")
-            max_date = datetime.max.replace(microsecond=0)
-            return start_date, max_date
-        else:
-            start_date = datetime.strptime(dates[0], "%Y-%m-%d")
-            end_date = datetime.strptime(dates[1], "%Y-%m-%d")
-            return start_date, end_date
-
-    def is_index_in_range(
-        start_date: datetime, end_date: datetime, gte_dt: datetime, lte_dt: datetime
-    ) -> bool:
-        """Check if index date range overlaps with filter range."""
-        return not (
-            end_date.date() < gte_dt.date() or start_date.date() > lte_dt.date()
-        )
-
-    gte_dt = parse_datetime(gte) if gte else datetime.min.replace(microsecond=0)
-    lte_dt = parse_datetime(lte) if lte else datetime.max.replace(microsecond=0)
+    gte_date = _parse_date_filter(gte, date.min)
+    lte_date = _parse_date_filter(lte, date.max)
 
     filtered_indexes = []
 
     for index in indexes:
-        start_date, end_date = extract_date_range_from_index(index)
-        if is_index_in_range(start_date, end_date, gte_dt, lte_dt):
+        start_date, end_date = index_date_range(index)
+        if not (end_date < gte_date or start_date > lte_date):
             filtered_indexes.append(index)
 
     return filtered_indexes
 
 
+class IndexIntervals:
+    """Date ranges of the datetime partitioned indexes of a collection.
+
+    Index names are parsed once and sorted by start date, so that selecting the
+    indexes overlapping a datetime filter is a binary search instead of parsing every
+    index name on every search. Instances are immutable and safe to share.
+    """
+
+    __slots__ = ("_starts", "_max_ends", "_ends", "_indexes")
+
+    def __init__(self, indexes: Iterable[str]):
+        """Parse and sort the date ranges of indexes.
+
+        Args:
+            indexes (Iterable[str]): Index names or aliases containing dates.
+        """
+        intervals = sorted((*index_date_range(index), index) for index in indexes)
+        self._starts = tuple(start for start, _, _ in intervals)
+        self._ends = tuple(end for _, end, _ in intervals)
+        self._indexes = tuple(index for _, _, index in intervals)
+        # Running maximum of the end dates, sorted even if indexes overlap
+        max_ends: List[date] = []
+        for end in self._ends:
+            max_ends.append(max(end, max_ends[-1]) if max_ends else end)
+        self._max_ends = tuple(max_ends)
+
+    def __len__(self) -> int:
+        """Get the number of indexes."""
+        return len(self._indexes)
+
+    @property
+    def indexes(self) -> Tuple[str, ...]:
+        """Get the indexes, sorted by start date."""
+        return self._indexes
+
+    def select(self, gte: Optional[str], lte: Optional[str]) -> List[str]:
+        """Select the indexes whose date range overlaps a datetime filter.
+
+        Args:
+            gte: Greater than or equal date filter (ISO format, optional 'Z' suffix)
+            lte: Less than or equal date filter (ISO format, optional 'Z' suffix)
+
+        Returns:
+            List[str]: The overlapping indexes, sorted by start date. Same selection
+                as `filter_indexes_by_datetime`.
+        """
+        if not gte and not lte:
+            return list(self._indexes)
+        gte_date = _parse_date_filter(gte, date.min)
+        lte_date = _parse_date_filter(lte, date.max)
+
+        # Indexes before `low` all end before the filter, from `high` start after it
+        low = bisect_left(self._max_ends, gte_date)
+        high = bisect_right(self._starts, lte_date)
+        return [self._indexes[i] for i in range(low, high) if self._ends[i] >= gte_date]
+
+    def assign(self, dates: Sequence[date]) -> List[str]:
+        """Assign dates to indexes in a single pass.
+
+        Every date goes to the last index starting on or before it, which is the
+        index containing it as partitions are contiguous. Dates before the first
+        index go to the first index.
+
+        Args:
+            dates (Sequence[date]): Dates sorted in ascending order.
+
+        Returns:
+            List[str]: The index of every date, in the order of the dates.
+
+        Raises:
+            ValueError: If there is no index.
+        """
+        if not self._indexes:
+            raise ValueError("No index to assign dates to")
+        starts, indexes = self._starts, self._indexes
+        position, last = 0, len(indexes) - 1
+        targets = []
+        for day in dates:
+            while position < last and starts[position + 1] <= day:
+                position += 1
+            targets.append(indexes[position])
+        return targets
+
+
 async def create_index_templates_shared(settings: Any) -> None:
     """Create index templates for Elasticsearch/OpenSearch Collection and Item indices.
 
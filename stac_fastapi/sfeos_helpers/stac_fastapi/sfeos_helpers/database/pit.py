@@ -0,0 +1,107 @@
+"""Point-in-time pagination functions for Elasticsearch/OpenSearch.
+
+This module provides functions for encoding and decoding pagination tokens, which
+may reference a point in time (PIT). PITs are closed on the last page, PITs abandoned
+by clients expire on the cluster once their keep-alive elapses.
+"""
+
+import logging
+import os
+import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, List, Optional, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PIT_KEEP_ALIVE = "1m"
+
+_KEEP_ALIVE_PATTERN = re.compile(r"^(\d+)(d|h|m|s|ms)$")
+_KEEP_ALIVE_UNITS = {"d": 86400.0, "h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def encode_pagination_token(
+    search_after: List[Any],
+    pit_id: Optional[str] = None,
+    keep_alive: Optional[str] = None,
+) -> str:
+    """Encode a pagination token.
+
+    Args:
+        search_after (List[Any]): Sort values of the last hit of the current page.
+        pit_id (Optional[str]): Id of the point in time the next page is read from.
+        keep_alive (Optional[str]): Keep-alive of the point in time.
+
+    Returns:
+        str: A URL-safe base64 token. Without a PIT this is the encoded sort array,
+            the format used by earlier versions.
+    """
+    payload: Any = search_after
+    if pit_id is not None:
+        payload = {
+            "pit": pit_id,
+            "keep_alive": keep_alive,
+            "search_after": search_after,
+        }
+    return urlsafe_b64encode(orjson.dumps(payload)).decode()
+
+
+def decode_pagination_token(
+    token: str,
+) -> Tuple[Optional[List[Any]], Optional[str], Optional[str]]:
+    """Decode a pagination token.
+
+    Args:
+        token (str): Token produced by `encode_pagination_token`.
+
+    Returns:
+        Tuple[Optional[List[Any]], Optional[str], Optional[str]]: The `search_after` sort
+            values, the PIT id and the PIT keep-alive. The PIT fields are None for tokens
+            that do not reference a point in time.
+    """
+    payload = orjson.loads(urlsafe_b64decode(token))
+    if isinstance(payload, dict):
+        return (
+            payload.get("search_after"),
+            payload.get("pit"),
+            payload.get("keep_alive"),
+        )
+    return payload, None, None
+
+
+def keep_alive_to_seconds(keep_alive: str) -> float:
+    """Convert an Elasticsearch/OpenSearch time value to seconds.
+
+    Args:
+        keep_alive (str): Time value such as "30s", "1m" or "2h".
+
+    Returns:
+        float: The duration in seconds.
+
+    Raises:
+        ValueError: If the time value is not supported.
+    """
+    match = _KEEP_ALIVE_PATTERN.match(keep_alive.strip())
+    if not match:
+        raise ValueError(f"Invalid keep-alive value: '{keep_alive}'")
+    value, unit = match.groups()
+    return int(value) * _KEEP_ALIVE_UNITS[unit]
+
+
+def get_pit_keep_alive() -> str:
+    """Get the PIT keep-alive from the PIT_KEEP_ALIVE environment variable.
+
+    Returns:
+        str: A valid time value, or the default if the variable is invalid.
+    """
+    keep_alive = os.getenv("PIT_KEEP_ALIVE", DEFAULT_PIT_KEEP_ALIVE)
+    try:
+        keep_alive_to_seconds(keep_alive)
+    except ValueError:
+        logger.warning(
+            f"Invalid value for PIT_KEEP_ALIVE environment variable: '{keep_alive}'. "
+            f"Using default value '{DEFAULT_PIT_KEEP_ALIVE}'."
+        )
+        return DEFAULT_PIT_KEEP_ALIVE
+    return keep_alive.strip()
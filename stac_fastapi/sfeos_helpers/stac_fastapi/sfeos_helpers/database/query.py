@@ -3,12 +3,30 @@
 This module provides functions for building and manipulating Elasticsearch/OpenSearch queries.
 """
 
-from typing import Any, Dict, List, Optional
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Union
 
+from stac_fastapi.core.utilities import get_bool_env
 from stac_fastapi.sfeos_helpers.mappings import Geometry
 
+logger = logging.getLogger(__name__)
+
 ES_MAX_URL_LENGTH = 4096
 
+NUMBER_MATCHED_STRATEGIES = ("exact", "estimate", "none")
+DEFAULT_NUMBER_MATCHED_STRATEGY = "exact"
+
+# Fields the item serializer needs to build links, always fetched from `_source`
+SOURCE_REQUIRED_FIELDS = ("id", "collection")
+
+# Fields stored as lists of objects keyed by `es_key` when STAC_INDEX_ASSETS is true
+INDEXED_ASSET_FIELDS = ("assets", "item_assets")
+
+BOOL_OCCURRENCES = ("must", "filter", "should", "must_not")
+RANGE_LOWER_BOUNDS = ("gt", "gte")
+RANGE_UPPER_BOUNDS = ("lt", "lte")
+
 
 def apply_free_text_filter_shared(
     search: Any, free_text_queries: Optional[List[str]]
@@ -108,7 +126,7 @@ def add_collections_to_body(
     """
     index_filter = {"terms": {"collection": collection_ids}}
     if query is None:
-        query = {"query": {}}
+        query = {}
     if "bool" not in query:
         query["bool"] = {}
     if "filter" not in query["bool"]:
@@ -118,3 +136,292 @@ def add_collections_to_body(
     if index_filter not in filters:
         filters.append(index_filter)
     return query
+
+
+def validate_number_matched(value: Union[str, int]) -> Union[str, int]:
+    """Validate a numberMatched strategy.
+
+    Args:
+        value (Union[str, int]): One of "exact", "estimate", "none", or a positive integer
+            threshold up to which hits are counted accurately.
+
+    Returns:
+        Union[str, int]: The normalized strategy name, or the threshold as an integer.
+
+    Raises:
+        ValueError: If the value is not a known strategy or a positive integer.
+    """
+    normalized = str(value).strip().lower()
+    if normalized in NUMBER_MATCHED_STRATEGIES:
+        return normalized
+
+    try:
+        threshold = int(normalized)
+    except ValueError:
+        threshold = 0
+
+    if threshold <= 0:
+        raise ValueError(
+            f"Invalid numberMatched strategy: '{value}'. Expected one of "
+            f"{', '.join(NUMBER_MATCHED_STRATEGIES)} or a positive integer."
+        )
+    return threshold
+
+
+def get_number_matched_strategy(value: Optional[str] = None) -> Union[str, int]:
+    """Resolve the numberMatched strategy of a search.
+
+    Args:
+        value (Optional[str]): Strategy requested for this search. If None, the
+            NUMBER_MATCHED_STRATEGY environment variable is used.
+
+    Returns:
+        Union[str, int]: The strategy name, or a `track_total_hits` threshold.
+
+    Raises:
+        ValueError: If a per-request value is not a valid strategy.
+
+    Notes:
+        - "exact": hits are counted accurately by the search request itself.
+        - integer: hits are counted accurately up to the threshold, above it numberMatched is omitted.
+        - "estimate": a separate count request runs alongside the search and is cancelled if it
+          has not finished when the search returns.
+        - "none": hits are not counted and numberMatched is omitted.
+    """
+    if value is not None:
+        return validate_number_matched(value)
+
+    env_value = os.getenv("NUMBER_MATCHED_STRATEGY", DEFAULT_NUMBER_MATCHED_STRATEGY)
+    try:
+        return validate_number_matched(env_value)
+    except ValueError:
+        logger.warning(
+            f"Invalid value for NUMBER_MATCHED_STRATEGY environment variable: "
+            f"'{env_value}'. Using default value '{DEFAULT_NUMBER_MATCHED_STRATEGY}'."
+        )
+        return DEFAULT_NUMBER_MATCHED_STRATEGY
+
+
+def build_source_filter(
+    include: Optional[Iterable[str]] = None,
+    exclude: Optional[Iterable[str]] = None,
+) -> Optional[Dict[str, List[str]]]:
+    """Translate Fields extension include/exclude sets into a `_source` filter.
+
+    Args:
+        include (Optional[Iterable[str]]): Dotted paths of the fields to return.
+        exclude (Optional[Iterable[str]]): Dotted paths of the fields to leave out.
+
+    Returns:
+        Optional[Dict[str, List[str]]]: A `_source` filter with `includes` and/or
+            `excludes`, or None if the full document has to be fetched.
+
+    Notes:
+        The fields in `SOURCE_REQUIRED_FIELDS` are always fetched, even when they are
+        not included or are excluded, and have to be removed from the serialized item
+        afterwards. Paths containing a wildcard are not pushed down, since `*` is a
+        pattern for Elasticsearch/OpenSearch but a literal key for the Fields extension.
+        When STAC_INDEX_ASSETS is true, assets are stored as lists, so only their root
+        key is fetched and paths below it are left to `filter_fields`.
+    """
+    if get_bool_env("STAC_INDEX_ASSETS"):
+        include = {_indexed_asset_root(field) for field in include or ()}
+        exclude = {
+            field for field in exclude or () if _indexed_asset_root(field) == field
+        }
+
+    includes = sorted(
+        {field for field in include or () if field}
+        | (set(SOURCE_REQUIRED_FIELDS) if include else set())
+    )
+    if any("*" in field for field in includes):
+        includes = []
+
+    excludes = sorted(
+        field
+        for field in exclude or ()
+        if field and "*" not in field and field not in SOURCE_REQUIRED_FIELDS
+    )
+
+    source: Dict[str, List[str]] = {}
+    if includes:
+        source["includes"] = includes
+    if excludes:
+        source["excludes"] = excludes
+    return source or None
+
+
+def _indexed_asset_root(field: str) -> str:
+    """Get the root key of a path below an asset field, or the path itself."""
+    root = field.split(".", 1)[0]
+    return root if root in INDEXED_ASSET_FIELDS else field
+
+
+def compile_query(query: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Compile a search query into a flat, non-scoring bool query.
+
+    Args:
+        query (Optional[Dict[str, Any]]): The query DSL built by the `apply_*_filter` methods.
+
+    Returns:
+        Optional[Dict[str, Any]]: An equivalent query with every clause in filter context,
+            or None if the query matches every document.
+
+    Notes:
+        Search results are always sorted on document fields, never on relevance, so
+        scores are computed for nothing. Moving `must` clauses into `filter` skips
+        scoring and lets the cluster cache the clauses. The query is also simplified:
+        - nested bool queries made of filters only are merged into their parent,
+        - a `must_not` of a bool `should` becomes one `must_not` per clause,
+        - `should` clauses that cannot change which documents match are dropped,
+        - duplicated filters are dropped and `range` filters on the same field are merged.
+        The input query is not modified.
+    """
+    if not query:
+        return None
+    compiled = _compile_clause(query)
+    if _is_match_all(compiled):
+        return None
+    # Top-level clauses outside of a bool filter or must_not would be scored
+    if list(compiled) != ["bool"]:
+        return {"bool": {"filter": [compiled]}}
+    bool_query = dict(compiled["bool"])
+    if "should" in bool_query:
+        disjunction = {"should": bool_query.pop("should")}
+        if "minimum_should_match" in bool_query:
+            disjunction["minimum_should_match"] = bool_query.pop("minimum_should_match")
+        bool_query["filter"] = bool_query.get("filter", []) + [{"bool": disjunction}]
+    return {"bool": bool_query}
+
+
+def _compile_clause(clause: Dict[str, Any]) -> Dict[str, Any]:
+    """Compile a clause in filter context, see `compile_query`."""
+    if list(clause) != ["bool"]:
+        return clause
+
+    bool_query = clause["bool"]
+    options = {
+        key: value for key, value in bool_query.items() if key not in BOOL_OCCURRENCES
+    }
+    minimum_should_match = options.pop("minimum_should_match", None)
+
+    filters: List[Dict[str, Any]] = []
+    for child in _as_list(bool_query.get("must")) + _as_list(bool_query.get("filter")):
+        compiled = _compile_clause(child)
+        if _is_conjunction(compiled):
+            filters.extend(compiled["bool"]["filter"])
+        elif not _is_match_all(compiled):
+            filters.append(compiled)
+
+    must_not: List[Dict[str, Any]] = []
+    for child in _as_list(bool_query.get("must_not")):
+        compiled = _compile_clause(child)
+        if _is_disjunction(compiled):
+            # not (a or b) is (not a) and (not b)
+            must_not.extend(compiled["bool"]["should"])
+        elif _is_conjunction(compiled) and len(compiled["bool"]["filter"]) == 1:
+            must_not.append(compiled["bool"]["filter"][0])
+        else:
+            must_not.append(compiled)
+
+    should = [_compile_clause(child) for child in _as_list(bool_query.get("should"))]
+    if should and minimum_should_match is None:
+        if bool_query.get("must") or bool_query.get("filter"):
+            # Without a minimum these clauses only contribute to the score
+            should = []
+        else:
+            minimum_should_match = 1
+    if should and minimum_should_match in (1, "1") and len(should) == 1:
+        compiled = should.pop()
+        if _is_conjunction(compiled):
+            filters.extend(compiled["bool"]["filter"])
+        elif not _is_match_all(compiled):
+            filters.append(compiled)
+        minimum_should_match = None
+    # `boost` has no effect without scoring
+    options.pop("boost", None)
+
+    result: Dict[str, Any] = {}
+    if filters:
+        result["filter"] = _merge_filters(filters)
+    if should:
+        result["should"] = should
+        if minimum_should_match not in (None, 0, "0"):
+            result["minimum_should_match"] = minimum_should_match
+    if must_not:
+        result["must_not"] = _dedupe(must_not)
+    result.update(options)
+
+    if not result:
+        return {"match_all": {}}
+    if list(result) == ["filter"] and len(result["filter"]) == 1:
+        return result["filter"][0]
+    return {"bool": result}
+
+
+def _merge_filters(filters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop duplicated filters and merge range filters on the same field."""
+    merged: List[Dict[str, Any]] = []
+    ranges: Dict[str, int] = {}
+    for clause in _dedupe(filters):
+        if list(clause) == ["range"] and len(clause["range"]) == 1:
+            [(field, bounds)] = clause["range"].items()
+            if not isinstance(bounds, dict):
+                merged.append(clause)
+                continue
+            position = ranges.get(field)
+            if position is not None:
+                existing = merged[position]["range"][field]
+                if _can_merge_ranges(existing, bounds):
+                    merged[position] = {"range": {field: {**existing, **bounds}}}
+                    continue
+            ranges[field] = len(merged)
+        merged.append(clause)
+    return merged
+
+
+def _can_merge_ranges(first: Dict[str, Any], second: Dict[str, Any]) -> bool:
+    """Whether two range queries on a field can be expressed as one."""
+    for bounds in (RANGE_LOWER_BOUNDS, RANGE_UPPER_BOUNDS):
+        if any(key in first for key in bounds) and any(key in second for key in bounds):
+            return False
+    bound_keys = RANGE_LOWER_BOUNDS + RANGE_UPPER_BOUNDS
+    first_options = {k: v for k, v in first.items() if k not in bound_keys}
+    second_options = {k: v for k, v in second.items() if k not in bound_keys}
+    return first_options == second_options
+
+
+def _dedupe(clauses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop repeated clauses, keeping the first occurrence."""
+    unique: List[Dict[str, Any]] = []
+    for clause in clauses:
+        if clause not in unique:
+            unique.append(clause)
+    return unique
+
+
+def _as_list(value: Any) -> List[Dict[str, Any]]:
+    """Get the clauses of a bool occurrence, which may be a single clause."""
+    if value is None:
+        return []
+    return list(value) if isinstance(value, list) else [value]
+
+
+def _is_match_all(clause: Dict[str, Any]) -> bool:
+    """Whether a clause matches every document."""
+    return list(clause) == ["match_all"] and not clause["match_all"]
+
+
+def _is_conjunction(clause: Dict[str, Any]) -> bool:
+    """Whether a clause is a bool query made of filters only."""
+    return list(clause) == ["bool"] and list(clause["bool"]) == ["filter"]
+
+
+def _is_disjunction(clause: Dict[str, Any]) -> bool:
+    """Whether a clause is a bool query matching if any of its `should` clauses matches."""
+    if list(clause) != ["bool"]:
+        return False
+    bool_query = clause["bool"]
+    return set(bool_query) <= {"should", "minimum_should_match"} and (
+        bool_query.get("minimum_should_match", 1) in (1, "1")
+    )
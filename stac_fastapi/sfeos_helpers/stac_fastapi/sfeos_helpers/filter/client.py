@@ -7,6 +7,7 @@ import attr
 from fastapi import Request
 
 from stac_fastapi.core.base_database_logic import BaseDatabaseLogic
+from stac_fastapi.core.datetime_utils import TEMPORAL_RANGE_FIELD
 from stac_fastapi.core.extensions.filter import ALL_QUERYABLES, DEFAULT_QUERYABLES
 from stac_fastapi.extensions.core.filter.client import AsyncBaseFiltersClient
 from stac_fastapi.sfeos_helpers.mappings import ES_MAPPING_TYPE_TO_JSON
@@ -84,6 +85,9 @@ class EsAsyncBaseFiltersClient(AsyncBaseFiltersClient):
             # and not require expressions to prefix them with properties,
             # e.g., eo:cloud_cover instead of properties.eo:cloud_cover.
             field_name = field_fqn.removeprefix("properties.")
+            if field_name == TEMPORAL_RANGE_FIELD:
+                # Indexed for datetime filters only
+                continue
 
             # Generate field properties
             field_result = ALL_QUERYABLES.get(field_name, {})
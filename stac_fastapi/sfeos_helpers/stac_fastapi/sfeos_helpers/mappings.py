@@ -28,6 +28,7 @@ Function Naming Conventions:
 import os
 from typing import Any, Dict, Literal, Protocol
 
+from stac_fastapi.core.datetime_utils import TEMPORAL_RANGE_FIELD
 from stac_fastapi.core.utilities import get_bool_env
 
 
@@ -145,6 +146,8 @@ ES_ITEMS_MAPPINGS = {
                 "datetime": {"type": "date"},
                 "start_datetime": {"type": "date"},
                 "end_datetime": {"type": "date"},
+                # Range covered by the item, see `temporal_range`
+                TEMPORAL_RANGE_FIELD: {"type": "date_range"},
                 "created": {"type": "date"},
                 "updated": {"type": "date"},
                 # Satellite Extension https://github.com/stac-extensions/sat
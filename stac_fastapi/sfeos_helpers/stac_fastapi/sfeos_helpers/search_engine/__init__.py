@@ -3,8 +3,11 @@
 from .base import BaseIndexInserter
 from .factory import IndexInsertionFactory
 from .index_operations import IndexOperations
+from .ingest_mode import IngestMode
 from .inserters import DatetimeIndexInserter, SimpleIndexInserter
+from .maintenance import IndexMaintenance
 from .managers import DatetimeIndexManager, IndexSizeManager
+from .reindex import ReindexJob, ReindexOrchestrator, plan_reindex
 from .selection import (
     BaseIndexSelector,
     DatetimeBasedIndexSelector,
@@ -21,6 +24,11 @@ __all__ = [
     "DatetimeIndexInserter",
     "SimpleIndexInserter",
     "IndexInsertionFactory",
+    "IndexMaintenance",
+    "IngestMode",
+    "ReindexJob",
+    "ReindexOrchestrator",
+    "plan_reindex",
     "DatetimeBasedIndexSelector",
     "UnfilteredIndexSelector",
     "IndexSelectorFactory",
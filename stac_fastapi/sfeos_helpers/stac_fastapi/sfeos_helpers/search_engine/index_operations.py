@@ -1,7 +1,8 @@
 """Search engine adapters for different implementations."""
 
+import logging
 import uuid
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from stac_fastapi.sfeos_helpers.database import (
     index_alias_by_collection_id,
@@ -14,9 +15,27 @@ from stac_fastapi.sfeos_helpers.mappings import (
     ITEMS_INDEX_PREFIX,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _is_already_exists(error: Exception) -> bool:
+    """Whether a search engine error is raised by creating an existing index."""
+    return getattr(error, "error", None) == "resource_already_exists_exception"
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Whether a search engine error is raised by a missing index or alias."""
+    return getattr(error, "status_code", None) == 404
+
 
 class IndexOperations:
-    """Base class for search engine adapters with common implementations."""
+    """Base class for search engine adapters with common implementations.
+
+    Several workers may change the datetime partitions of a collection at once. A
+    partition is named after the partition it follows, so that only one of them
+    creates it and the others reuse it, and renaming an alias that another worker
+    already renamed is not an error.
+    """
 
     async def create_simple_index(self, client: Any, collection_id: str) -> str:
         """Create a simple index for the given collection.
@@ -39,25 +58,66 @@ class IndexOperations:
         return index_name
 
     async def create_datetime_index(
-        self, client: Any, collection_id: str, start_date: str
+        self,
+        client: Any,
+        collection_id: str,
+        start_date: str,
+        previous_alias: Optional[str] = None,
     ) -> str:
         """Create a datetime-based index for the given collection.
 
+        If another worker already created the index following `previous_alias`, that
+        index is reused, and given its aliases again if it has none.
+
         Args:
             client: Search engine client instance.
             collection_id (str): Collection identifier.
             start_date (str): Start date for the alias.
+            previous_alias (Optional[str]): Alias of the open index that was closed
+                for this one, None for the first index of the collection.
 
         Returns:
-            str: Created index alias name.
+            str: Created or reused index alias name.
         """
-        index_name = self.create_index_name(collection_id)
-        alias_name = self.create_alias_name(collection_id, start_date)
         collection_alias = index_alias_by_collection_id(collection_id)
-        await client.indices.create(
-            index=index_name,
-            body=self._create_index_body({collection_alias: {}, alias_name: {}}),
+        index_name = self.create_index_name(
+            collection_id, previous_alias or collection_alias
         )
+        alias_name = self.create_alias_name(collection_id, start_date)
+        try:
+            await client.indices.create(
+                index=index_name,
+                body=self._create_index_body({collection_alias: {}, alias_name: {}}),
+            )
+        except Exception as e:
+            if not _is_already_exists(e):
+                raise
+            response = await client.indices.get_alias(index=index_name)
+            existing_alias = next(
+                (
+                    alias
+                    for alias in response[index_name]["aliases"]
+                    if alias != collection_alias
+                ),
+                None,
+            )
+            if existing_alias is None:
+                # Left without its partition alias, e.g. by an interrupted creation
+                await client.indices.update_aliases(
+                    body={
+                        "actions": [
+                            {"add": {"index": index_name, "alias": collection_alias}},
+                            {"add": {"index": index_name, "alias": alias_name}},
+                        ]
+                    }
+                )
+                logger.warning(
+                    f"Index '{index_name}' had no partition alias, "
+                    f"attached '{alias_name}'"
+                )
+            else:
+                alias_name = existing_alias
+                logger.info(f"Index '{alias_name}' was created by another worker")
         return alias_name
 
     @staticmethod
@@ -70,17 +130,28 @@ class IndexOperations:
             old_alias (str): Current alias name.
 
         Returns:
-            str: New alias name.
+            str: New alias name, or the name given by another worker that updated
+                the alias first.
         """
         new_alias = f"{old_alias}-{end_date}"
-        aliases_info = await client.indices.get_alias(name=old_alias)
-        actions = []
-
-        for index_name in aliases_info.keys():
-            actions.append({"remove": {"index": index_name, "alias": old_alias}})
-            actions.append({"add": {"index": index_name, "alias": new_alias}})
-
-        await client.indices.update_aliases(body={"actions": actions})
+        try:
+            aliases_info = await client.indices.get_alias(name=old_alias)
+            actions = []
+
+            for index_name in aliases_info.keys():
+                actions.append({"remove": {"index": index_name, "alias": old_alias}})
+                actions.append({"add": {"index": index_name, "alias": new_alias}})
+
+            await client.indices.update_aliases(body={"actions": actions})
+        except Exception as e:
+            if not _is_not_found(e):
+                raise
+            aliases_info = await client.indices.get_alias(name=f"{old_alias}-*")
+            for info in aliases_info.values():
+                for alias in info.get("aliases", {}):
+                    if alias.startswith(f"{old_alias}-"):
+                        new_alias = alias
+            logger.info(f"Alias '{old_alias}' was updated by another worker")
         return new_alias
 
     @staticmethod
@@ -95,26 +166,37 @@ class IndexOperations:
         Returns:
             None
         """
-        aliases_info = await client.indices.get_alias(name=old_alias)
-        actions = []
-
-        for index_name in aliases_info.keys():
-            actions.append({"remove": {"index": index_name, "alias": old_alias}})
-            actions.append({"add": {"index": index_name, "alias": new_alias}})
-        await client.indices.update_aliases(body={"actions": actions})
+        try:
+            aliases_info = await client.indices.get_alias(name=old_alias)
+            actions = []
+
+            for index_name in aliases_info.keys():
+                actions.append({"remove": {"index": index_name, "alias": old_alias}})
+                actions.append({"add": {"index": index_name, "alias": new_alias}})
+            await client.indices.update_aliases(body={"actions": actions})
+        except Exception as e:
+            if not _is_not_found(e):
+                raise
+            # Renamed by another worker, callers read the aliases again
+            logger.info(f"Alias '{old_alias}' was renamed by another worker")
 
     @staticmethod
-    def create_index_name(collection_id: str) -> str:
-        """Create index name from collection ID and uuid4.
+    def create_index_name(collection_id: str, key: Optional[str] = None) -> str:
+        """Create index name from collection ID and a uuid.
 
         Args:
             collection_id (str): Collection identifier.
+            key (Optional[str]): Value the uuid is derived from, so that every
+                worker gets the same name for the same key. Random if None.
 
         Returns:
             str: Formatted index name.
         """
         cleaned = collection_id.translate(_ES_INDEX_NAME_UNSUPPORTED_CHARS_TABLE)
-        return f"{ITEMS_INDEX_PREFIX}{cleaned.lower()}_{uuid.uuid4()}"
+        index_uuid = (
+            uuid.uuid4() if key is None else uuid.uuid5(uuid.NAMESPACE_URL, key)
+        )
+        return f"{ITEMS_INDEX_PREFIX}{cleaned.lower()}_{index_uuid}"
 
     @staticmethod
     def create_alias_name(collection_id: str, start_date: str) -> str:
@@ -165,3 +247,25 @@ class IndexOperations:
 
         response = await client.search(index=index_name, body=query)
         return response["hits"]["hits"][0]
+
+    @staticmethod
+    async def find_latest_item_datetime(client: Any, index_name: str) -> Optional[str]:
+        """Find the latest item datetime in the specified index.
+
+        The index is refreshed first, so that items not searchable yet, e.g. written
+        while the collection is in ingest mode, are accounted for.
+
+        Args:
+            client: Search engine client instance.
+            index_name (str): Name of the index to query.
+
+        Returns:
+            Optional[str]: Datetime of the latest item in the index, None if empty.
+        """
+        await client.indices.refresh(index=index_name)
+        query = {
+            "size": 0,
+            "aggs": {"latest": {"max": {"field": "properties.datetime"}}},
+        }
+        response = await client.search(index=index_name, body=query)
+        return response["aggregations"]["latest"].get("value_as_string")
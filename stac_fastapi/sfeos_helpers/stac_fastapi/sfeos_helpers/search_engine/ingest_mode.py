@@ -0,0 +1,416 @@
+"""Bulk load mode of collections, suspending refreshes and replicas of their indexes."""
+
+import asyncio
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from stac_fastapi.core.utilities import get_number_env
+from stac_fastapi.sfeos_helpers.database import index_alias_by_collection_id
+from stac_fastapi.sfeos_helpers.mappings import ITEM_INDICES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INGEST_MODE_TIMEOUT = 3600.0
+# Seconds between two looks for partitions created while loading
+TRACK_INTERVAL = 5.0
+
+SUSPENDED_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
+
+# Key of the mapping `_meta` holding the original settings of a suspended index
+META_KEY = "ingest_mode"
+
+# Original settings of suspended indexes, by index name
+Sessions = Dict[str, Dict[str, Any]]
+
+
+class IngestMode:
+    """Ingest mode of collections, for bulk loads.
+
+    While a collection is in ingest mode, every item index of the collection has its
+    refresh interval set to -1 and no replicas, and writes to the collection do not
+    refresh. When the mode is left, or once it times out, the original settings are
+    restored and the indexes are refreshed and force merged.
+
+    The original settings of every suspended index are kept in the `_meta` of its
+    mapping with the time the mode times out, so that any worker can report or leave
+    the ingest mode of a collection, and a worker starting restores the indexes whose
+    mode timed out meanwhile. Workers only keep whether collections are in ingest mode
+    as a hint, to skip refreshing their writes, updated when they look at the indexes.
+    """
+
+    def __init__(self, client: Any, timeout: Optional[float] = None):
+        """Initialize the ingest mode.
+
+        Args:
+            client: Async search engine client instance.
+            timeout (Optional[float]): Seconds after which a collection leaves ingest
+                mode. Defaults to the INGEST_MODE_TIMEOUT environment variable.
+        """
+        self.client = client
+        self.timeout = timeout if timeout is not None else get_ingest_mode_timeout()
+        self._expires_at: Dict[str, float] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._tracked_at: Dict[str, float] = {}
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def is_active(self, collection_id: str) -> bool:
+        """Whether a collection is in ingest mode, as last seen by this worker.
+
+        Args:
+            collection_id (str): Collection identifier.
+
+        Returns:
+            bool: True if the collection is in ingest mode.
+        """
+        return self._expires_at.get(collection_id, 0.0) > time.time()
+
+    async def status(self, collection_id: str) -> Dict[str, Any]:
+        """Describe the ingest mode of a collection, leaving it if timed out.
+
+        Args:
+            collection_id (str): Collection identifier.
+
+        Returns:
+            Dict[str, Any]: Whether the mode is active, when it times out, and the
+                suspended indexes.
+        """
+        sessions = await self._read_sessions(
+            index_alias_by_collection_id(collection_id)
+        )
+        expires_at = _expires_at(sessions)
+        if expires_at is not None and expires_at <= time.time():
+            return await self.exit(collection_id)
+        self._remember(collection_id, expires_at)
+        return _status(collection_id, sessions)
+
+    async def enter(
+        self, collection_id: str, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Put a collection in ingest mode, or extend its timeout if it already is.
+
+        Args:
+            collection_id (str): Collection identifier.
+            timeout (Optional[float]): Seconds after which the collection leaves ingest
+                mode. Defaults to the timeout of the ingest mode.
+
+        Returns:
+            Dict[str, Any]: The status of the ingest mode of the collection.
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        async with self._lock(collection_id):
+            sessions = await self._suspend(collection_id, time.time() + timeout)
+            self._remember(collection_id, _expires_at(sessions))
+            self._tracked_at[collection_id] = time.monotonic()
+            self._schedule(collection_id, timeout)
+        logger.info(
+            f"Collection {collection_id} in ingest mode, "
+            f"{len(sessions)} indexes suspended"
+        )
+        return _status(collection_id, sessions)
+
+    async def exit(self, collection_id: str) -> Dict[str, Any]:
+        """Take a collection out of ingest mode, restoring its index settings.
+
+        Args:
+            collection_id (str): Collection identifier.
+
+        Returns:
+            Dict[str, Any]: The status of the ingest mode of the collection.
+        """
+        async with self._lock(collection_id):
+            timer = self._timers.pop(collection_id, None)
+            if timer is not None and timer is not asyncio.current_task():
+                timer.cancel()
+            # Kept in the mappings on failure, so that leaving the mode again retries
+            restored = await self._restore(collection_id)
+            self._forget(collection_id)
+        if restored:
+            alias = index_alias_by_collection_id(collection_id)
+            await self.client.indices.refresh(index=alias)
+            try:
+                await self.client.indices.forcemerge(index=alias)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to force merge the indexes of collection {collection_id}: {e}"
+                )
+            logger.info(f"Collection {collection_id} left ingest mode")
+        return _status(collection_id, {})
+
+    async def track(self, collection_id: str) -> None:
+        """Suspend the indexes created since a collection entered ingest mode.
+
+        Called after writes, e.g. when datetime partitioning rolled an index over.
+        Indexes are looked for at most every few seconds. A collection that left
+        ingest mode through another worker, or timed out, is noticed here.
+
+        Args:
+            collection_id (str): Collection identifier.
+        """
+        if collection_id not in self._expires_at:
+            return
+        now = time.monotonic()
+        if now - self._tracked_at.get(collection_id, 0.0) < TRACK_INTERVAL:
+            return
+        self._tracked_at[collection_id] = now
+        async with self._lock(collection_id):
+            sessions = await self._suspend(collection_id, None)
+        expires_at = _expires_at(sessions)
+        if expires_at is not None and expires_at <= time.time():
+            await self.exit(collection_id)
+        else:
+            self._remember(collection_id, expires_at)
+
+    @asynccontextmanager
+    async def session(
+        self, collection_id: str, timeout: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """Keep a collection in ingest mode while the context is entered.
+
+        Args:
+            collection_id (str): Collection identifier.
+            timeout (Optional[float]): Seconds after which the collection leaves ingest
+                mode, even if the context is not exited.
+        """
+        await self.enter(collection_id, timeout)
+        try:
+            yield
+        finally:
+            await self.exit(collection_id)
+
+    def discard(self, collection_id: str) -> None:
+        """Forget the ingest mode of a deleted collection, without restoring anything.
+
+        Args:
+            collection_id (str): Collection identifier.
+        """
+        timer = self._timers.pop(collection_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._forget(collection_id)
+
+    async def recover(self) -> None:
+        """Pick up the ingest modes of every collection, at startup.
+
+        Collections whose mode timed out, e.g. while the worker that started it was
+        down, are taken out of ingest mode. The others time out in this worker too.
+        """
+        try:
+            sessions = await self._read_sessions(ITEM_INDICES)
+        except Exception as e:
+            logger.error(f"Failed to read the ingest modes of the collections: {e}")
+            return
+        by_collection: Dict[str, Sessions] = {}
+        for index, saved in sessions.items():
+            by_collection.setdefault(saved["collection_id"], {})[index] = saved
+        for collection_id, collection_sessions in by_collection.items():
+            expires_at = _expires_at(collection_sessions) or 0.0
+            if expires_at > time.time():
+                self._remember(collection_id, expires_at)
+                self._schedule(collection_id, expires_at - time.time())
+                continue
+            try:
+                await self.exit(collection_id)
+            except Exception as e:
+                logger.error(
+                    f"Failed to restore the indexes of collection {collection_id}: {e}"
+                )
+
+    async def close(self) -> None:
+        """Stop the timeouts of this worker.
+
+        Collections stay in ingest mode. Their indexes are restored when the mode is
+        left through any worker, or times out in a worker that started since.
+        """
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+
+    def _lock(self, collection_id: str) -> asyncio.Lock:
+        """Get the lock serializing the changes of the ingest mode of a collection."""
+        lock = self._locks.get(collection_id)
+        if lock is None:
+            lock = self._locks[collection_id] = asyncio.Lock()
+        return lock
+
+    def _remember(self, collection_id: str, expires_at: Optional[float]) -> None:
+        """Record whether a collection is in ingest mode, as read from its indexes."""
+        if expires_at is None:
+            self._forget(collection_id)
+        else:
+            self._expires_at[collection_id] = expires_at
+
+    def _forget(self, collection_id: str) -> None:
+        """Record that a collection is not in ingest mode."""
+        self._expires_at.pop(collection_id, None)
+        self._tracked_at.pop(collection_id, None)
+
+    def _schedule(self, collection_id: str, timeout: float) -> None:
+        """Take a collection out of ingest mode once its timeout is reached."""
+        timer = self._timers.pop(collection_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[collection_id] = asyncio.get_running_loop().create_task(
+            self._expire(collection_id, timeout)
+        )
+
+    async def _expire(self, collection_id: str, timeout: float) -> None:
+        """Take a collection out of ingest mode once its timeout is reached."""
+        await asyncio.sleep(timeout)
+        logger.warning(f"Ingest mode of collection {collection_id} timed out")
+        try:
+            await self.exit(collection_id)
+        except Exception as e:
+            logger.error(
+                f"Failed to restore the indexes of collection {collection_id}: {e}"
+            )
+
+    async def _read_meta(self, index: str) -> Dict[str, Dict[str, Any]]:
+        """Read the mapping `_meta` of indexes, by index name."""
+        response = await self.client.indices.get_mapping(
+            index=index,
+            filter_path="*.mappings._meta",
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+        return {
+            name: data.get("mappings", {}).get("_meta", {})
+            for name, data in response.items()
+        }
+
+    async def _read_sessions(self, index: str) -> Sessions:
+        """Read the original settings of the suspended indexes, by index name."""
+        return {
+            name: meta[META_KEY]
+            for name, meta in (await self._read_meta(index)).items()
+            if META_KEY in meta
+        }
+
+    async def _write_meta(
+        self, index: str, meta: Dict[str, Any], saved: Optional[Dict[str, Any]]
+    ) -> None:
+        """Record the original settings of an index in its `_meta`, or remove them."""
+        meta = {key: value for key, value in meta.items() if key != META_KEY}
+        if saved is not None:
+            meta[META_KEY] = saved
+        await self.client.indices.put_mapping(index=index, body={"_meta": meta})
+
+    async def _suspend(
+        self, collection_id: str, expires_at: Optional[float]
+    ) -> Sessions:
+        """Suspend the indexes of a collection, recording their original settings.
+
+        Args:
+            collection_id (str): Collection identifier.
+            expires_at (Optional[float]): When the mode times out. If None, only the
+                indexes created since the collection entered ingest mode are
+                suspended, and nothing is done if it is not in ingest mode.
+
+        Returns:
+            Sessions: The original settings of every suspended index of the
+                collection, empty if the collection is not in ingest mode.
+        """
+        alias = index_alias_by_collection_id(collection_id)
+        settings = await self.client.indices.get_settings(index=alias)
+        metas = await self._read_meta(alias)
+        sessions = {
+            index: meta[META_KEY] for index, meta in metas.items() if META_KEY in meta
+        }
+        if expires_at is None:
+            expires_at = _expires_at(sessions)
+            if expires_at is None:
+                return {}
+
+        indexes: List[str] = []
+        for index, data in settings.items():
+            saved = sessions.get(index)
+            if saved is None:
+                index_settings = data["settings"]["index"]
+                saved = {
+                    "collection_id": collection_id,
+                    "refresh_interval": index_settings.get("refresh_interval"),
+                    "number_of_replicas": index_settings.get("number_of_replicas"),
+                }
+                indexes.append(index)
+            elif saved.get("expires_at") == expires_at:
+                continue
+            saved = {**saved, "expires_at": expires_at}
+            # Recorded before suspending, so that the settings can always be restored
+            await self._write_meta(index, metas.get(index, {}), saved)
+            sessions[index] = saved
+        if indexes:
+            await self.client.indices.put_settings(
+                index=",".join(indexes), body={"index": SUSPENDED_SETTINGS}
+            )
+        return sessions
+
+    async def _restore(self, collection_id: str) -> bool:
+        """Restore the original settings of the suspended indexes of a collection.
+
+        Returns:
+            bool: Whether any index was suspended.
+        """
+        metas = await self._read_meta(index_alias_by_collection_id(collection_id))
+        groups: Dict[Tuple[Optional[str], Optional[str]], List[str]] = {}
+        for index, meta in metas.items():
+            saved = meta.get(META_KEY)
+            if saved is not None:
+                key = (saved.get("refresh_interval"), saved.get("number_of_replicas"))
+                groups.setdefault(key, []).append(index)
+        for (refresh_interval, number_of_replicas), indexes in groups.items():
+            await self.client.indices.put_settings(
+                index=",".join(indexes),
+                body={
+                    "index": {
+                        "refresh_interval": refresh_interval,
+                        "number_of_replicas": number_of_replicas,
+                    }
+                },
+            )
+        # Removed once restored, so that a failure above leaves them to retry
+        for index, meta in metas.items():
+            if META_KEY in meta:
+                await self._write_meta(index, meta, None)
+        return bool(groups)
+
+
+def _expires_at(sessions: Sessions) -> Optional[float]:
+    """Get when the ingest mode of suspended indexes times out, None if none is."""
+    return max(
+        (saved.get("expires_at") or 0.0 for saved in sessions.values()), default=None
+    )
+
+
+def _status(collection_id: str, sessions: Sessions) -> Dict[str, Any]:
+    """Describe the ingest mode of a collection from its suspended indexes."""
+    expires_at = _expires_at(sessions)
+    return {
+        "collection_id": collection_id,
+        "active": bool(sessions),
+        "expires_at": (
+            datetime.fromtimestamp(expires_at, tz=timezone.utc).isoformat()
+            if expires_at is not None
+            else None
+        ),
+        "indexes": sorted(sessions),
+    }
+
+
+def get_ingest_mode_timeout() -> float:
+    """Get the seconds after which a collection leaves ingest mode.
+
+    Returns:
+        float: The INGEST_MODE_TIMEOUT environment variable, or the default if unset
+            or invalid.
+    """
+    return get_number_env(
+        "INGEST_MODE_TIMEOUT",
+        DEFAULT_INGEST_MODE_TIMEOUT,
+        minimum=0,
+        exclusive_minimum=True,
+    )
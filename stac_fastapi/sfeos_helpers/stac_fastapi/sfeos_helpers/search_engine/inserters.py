@@ -1,8 +1,9 @@
 """Async index insertion strategies."""
 import logging
-from datetime import timedelta
+from collections import Counter
 from typing import Any, Dict, List
 
+import orjson
 from fastapi import HTTPException, status
 
 from stac_fastapi.sfeos_helpers.database import (
@@ -19,6 +20,22 @@ from .selection import DatetimeBasedIndexSelector
 
 logger = logging.getLogger(__name__)
 
+ITEM_SIZE_SAMPLE = 16
+
+
+def _estimate_item_size(items: List[Dict[str, Any]]) -> float:
+    """Estimate the average serialized size of items from an evenly spaced sample.
+
+    Args:
+        items (List[Dict[str, Any]]): Items to estimate the size of.
+
+    Returns:
+        float: Average size of the sampled items in bytes.
+    """
+    step = max(1, len(items) // ITEM_SIZE_SAMPLE)
+    sample = items[::step]
+    return sum(len(orjson.dumps(item)) for item in sample) / len(sample)
+
 
 class DatetimeIndexInserter(BaseIndexInserter):
     """Async datetime-based index insertion strategy."""
@@ -68,9 +85,13 @@ class DatetimeIndexInserter(BaseIndexInserter):
             str: Target index name for the product.
         """
         index_selector = DatetimeBasedIndexSelector(self.client)
-        return await self._get_target_index_internal(
+        target_index = await self._get_target_index_internal(
             index_selector, collection_id, product, check_size=True
         )
+        self.datetime_manager.size_manager.record_write(
+            target_index, len(orjson.dumps(product))
+        )
+        return target_index
 
     async def prepare_bulk_actions(
         self, collection_id: str, items: List[Dict[str, Any]]
@@ -97,20 +118,30 @@ class DatetimeIndexInserter(BaseIndexInserter):
             index_selector, collection_id, items
         )
 
-        actions = []
-        for item in items:
-            target_index = await self._get_target_index_internal(
-                index_selector, collection_id, item, check_size=False
-            )
-            actions.append(
-                {
-                    "_index": target_index,
-                    "_id": mk_item_id(item["id"], item["collection"]),
-                    "_source": item,
-                }
+        # Indexes were created or renamed for the earliest and latest items above,
+        # the sorted items are now merged with the sorted index date ranges
+        intervals = await index_selector.get_collection_intervals(collection_id)
+        target_indexes = intervals.assign(
+            [
+                extract_date(self.datetime_manager.validate_product_datetime(item))
+                for item in items
+            ]
+        )
+
+        item_size = _estimate_item_size(items)
+        for target_index, count in Counter(target_indexes).items():
+            self.datetime_manager.size_manager.record_write(
+                target_index, item_size * count
             )
 
-        return actions
+        return [
+            {
+                "_index": target_index,
+                "_id": mk_item_id(item["id"], item["collection"]),
+                "_source": item,
+            }
+            for item, target_index in zip(items, target_indexes)
+        ]
 
     async def _get_target_index_internal(
         self,
@@ -131,41 +162,61 @@ class DatetimeIndexInserter(BaseIndexInserter):
             str: Target index name.
         """
         product_datetime = self.datetime_manager.validate_product_datetime(product)
+        start_date = extract_date(product_datetime)
         datetime_range = {"gte": product_datetime, "lte": product_datetime}
+        all_indexes = sorted(await index_selector.get_collection_indexes(collection_id))
+
+        if not all_indexes or start_date < extract_first_date_from_index(
+            all_indexes[0]
+        ):
+            async with self.datetime_manager.partition_lock(collection_id):
+                changed = False
+                # Read again after every change, as other workers may have made a
+                # different one meanwhile
+                while True:
+                    all_indexes = sorted(
+                        await index_selector.get_collection_indexes(collection_id)
+                    )
+                    if not all_indexes:
+                        await self.datetime_manager.handle_new_collection(
+                            collection_id, product_datetime
+                        )
+                    elif start_date < extract_first_date_from_index(all_indexes[0]):
+                        await self.datetime_manager.handle_early_date(
+                            collection_id,
+                            start_date,
+                            extract_first_date_from_index(all_indexes[0]),
+                        )
+                    else:
+                        break
+                    changed = True
+                    await index_selector.refresh_cache()
+
+            if changed:
+                return await index_selector.select_indexes(
+                    [collection_id], datetime_range
+                )
+
         target_index = await index_selector.select_indexes(
             [collection_id], datetime_range
         )
-        all_indexes = await index_selector.get_collection_indexes(collection_id)
-
-        if not all_indexes:
-            target_index = await self.datetime_manager.handle_new_collection(
-                collection_id, product_datetime
-            )
-            await index_selector.refresh_cache()
-            return target_index
-
-        all_indexes.sort()
-        start_date = extract_date(product_datetime)
-        end_date = extract_first_date_from_index(all_indexes[0])
-
-        if start_date < end_date:
-            alias = await self.datetime_manager.handle_early_date(
-                collection_id, start_date, end_date
-            )
-            await index_selector.refresh_cache()
-
-            return alias
 
         if target_index != all_indexes[-1]:
             return target_index
 
-        if check_size and await self.datetime_manager.size_manager.is_index_oversized(
-            target_index
-        ):
-            target_index = await self.datetime_manager.handle_oversized_index(
-                collection_id, target_index, product_datetime
-            )
-            await index_selector.refresh_cache()
+        size_manager = self.datetime_manager.size_manager
+        if check_size and await size_manager.is_index_oversized(target_index):
+            async with self.datetime_manager.partition_lock(collection_id):
+                all_indexes = await index_selector.get_collection_indexes(collection_id)
+                if target_index != max(all_indexes):
+                    # Rolled over by another writer
+                    return await index_selector.select_indexes(
+                        [collection_id], datetime_range
+                    )
+                target_index = await self.datetime_manager.handle_oversized_index(
+                    collection_id, target_index, product_datetime
+                )
+                await index_selector.refresh_cache()
 
         return target_index
 
@@ -179,16 +230,18 @@ class DatetimeIndexInserter(BaseIndexInserter):
             collection_id (str): Collection identifier.
             items (List[Dict[str, Any]]): List of items to process.
         """
-        all_indexes = await index_selector.get_collection_indexes(collection_id)
-
-        if not all_indexes:
-            first_item = items[0]
-            await self.index_operations.create_datetime_index(
-                self.client,
-                collection_id,
-                extract_date(first_item["properties"]["datetime"]),
-            )
-            await index_selector.refresh_cache()
+        if await index_selector.get_collection_indexes(collection_id):
+            return
+
+        async with self.datetime_manager.partition_lock(collection_id):
+            if not await index_selector.get_collection_indexes(collection_id):
+                first_item = items[0]
+                await self.index_operations.create_datetime_index(
+                    self.client,
+                    collection_id,
+                    extract_date(first_item["properties"]["datetime"]),
+                )
+                await index_selector.refresh_cache()
 
     async def _check_and_handle_oversized_index(
         self, index_selector, collection_id: str, items: List[Dict[str, Any]]
@@ -223,19 +276,13 @@ class DatetimeIndexInserter(BaseIndexInserter):
         ):
             return None
 
-        latest_item = await self.index_operations.find_latest_item_in_index(
-            self.client, latest_index
-        )
-        product_datetime = latest_item["_source"]["properties"]["datetime"]
-        end_date = extract_date(product_datetime)
-        await self.index_operations.update_index_alias(
-            self.client, str(end_date), latest_index
-        )
-        next_day_start = end_date + timedelta(days=1)
-        await self.index_operations.create_datetime_index(
-            self.client, collection_id, str(next_day_start)
-        )
-        await index_selector.refresh_cache()
+        async with self.datetime_manager.partition_lock(collection_id):
+            all_indexes = await index_selector.get_collection_indexes(collection_id)
+            if max(all_indexes) != latest_index:
+                # Rolled over by another writer
+                return None
+            await self.datetime_manager.rollover_index(collection_id, latest_index)
+            await index_selector.refresh_cache()
 
 
 class SimpleIndexInserter(BaseIndexInserter):
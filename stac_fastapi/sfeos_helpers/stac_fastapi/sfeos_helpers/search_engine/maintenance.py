@@ -0,0 +1,179 @@
+"""Background maintenance of datetime partitioned item indexes."""
+
+import asyncio
+import logging
+from datetime import date
+from typing import List, Optional
+
+from stac_fastapi.core.utilities import get_number_env
+from stac_fastapi.sfeos_helpers.database import index_date_range
+from stac_fastapi.sfeos_helpers.mappings import ITEMS_INDEX_PREFIX
+
+from .base import BaseIndexInserter
+from .ingest_mode import IngestMode
+from .inserters import DatetimeIndexInserter
+from .selection import DatetimeBasedIndexSelector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAINTENANCE_INTERVAL = 300.0
+DEFAULT_ROLLOVER_THRESHOLD = 0.9
+
+
+class IndexMaintenance:
+    """Rolls datetime partitioned indexes over in the background.
+
+    A task started with `start` periodically reads the size of the open ended latest
+    index of every collection. Once an index reaches DATETIME_INDEX_ROLLOVER_THRESHOLD
+    of DATETIME_INDEX_MAX_SIZE_GB, its alias is closed at the date of its latest item
+    and the next index is created, before the size limit makes a write wait for the
+    rollover. The check made by writers is kept, for indexes filling up between two
+    runs. Collections in ingest mode are left to the writers until the mode is left.
+    Only runs with the datetime index insertion strategy.
+    """
+
+    def __init__(
+        self,
+        index_inserter: BaseIndexInserter,
+        interval_seconds: Optional[float] = None,
+        rollover_threshold: Optional[float] = None,
+        ingest_mode: Optional[IngestMode] = None,
+    ):
+        """Initialize the maintenance.
+
+        Args:
+            index_inserter (BaseIndexInserter): Insertion strategy of the database.
+            interval_seconds (Optional[float]): Seconds between two runs. Defaults to
+                the DATETIME_INDEX_MAINTENANCE_INTERVAL environment variable, 0
+                disables the maintenance.
+            rollover_threshold (Optional[float]): Fraction of the size limit at which
+                an index is rolled over. Defaults to the DATETIME_INDEX_ROLLOVER_THRESHOLD
+                environment variable.
+            ingest_mode (Optional[IngestMode]): Ingest mode of the database, whose
+                collections are not rolled over.
+        """
+        self.index_inserter = index_inserter
+        self.ingest_mode = ingest_mode
+        self.interval = (
+            interval_seconds
+            if interval_seconds is not None
+            else get_maintenance_interval()
+        )
+        self.rollover_threshold = (
+            rollover_threshold
+            if rollover_threshold is not None
+            else get_rollover_threshold()
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether indexes are partitioned by datetime and maintained."""
+        return isinstance(self.index_inserter, DatetimeIndexInserter) and (
+            self.interval > 0
+        )
+
+    async def run_once(self) -> List[str]:
+        """Roll over the latest index of every collection close to the size limit.
+
+        Returns:
+            List[str]: Aliases of the created indexes.
+        """
+        if not isinstance(self.index_inserter, DatetimeIndexInserter):
+            return []
+        datetime_manager = self.index_inserter.datetime_manager
+        size_manager = datetime_manager.size_manager
+        limit_gb = size_manager.max_size_gb * self.rollover_threshold
+        index_selector = DatetimeBasedIndexSelector(self.index_inserter.client)
+
+        created = []
+        snapshot = await index_selector.alias_loader.get_snapshot()
+        for collection_alias, intervals in snapshot.intervals.items():
+            if not intervals:
+                continue
+            latest_index = intervals.indexes[-1]
+            if index_date_range(latest_index)[1] != date.max:
+                continue
+            try:
+                if await size_manager.sync_size(latest_index) < limit_gb:
+                    continue
+                # Collection aliases hold the collection id without the characters
+                # unsupported in index names, which index operations remove again
+                collection_id = collection_alias[len(ITEMS_INDEX_PREFIX) :]
+                if (
+                    self.ingest_mode is not None
+                    and (await self.ingest_mode.status(collection_id))["active"]
+                ):
+                    continue
+                async with datetime_manager.partition_lock(collection_id):
+                    indexes = await index_selector.get_collection_indexes(collection_id)
+                    if max(indexes) != latest_index:
+                        # Rolled over by a writer
+                        continue
+                    created.append(
+                        await datetime_manager.rollover_index(
+                            collection_id, latest_index
+                        )
+                    )
+                    await index_selector.refresh_cache()
+                logger.info(
+                    f"Rolled index '{latest_index}' over to '{created[-1]}' "
+                    f"in the background"
+                )
+            except Exception as e:
+                logger.error(f"Rollover of index '{latest_index}' failed: {e}")
+
+        return created
+
+    def start(self) -> None:
+        """Start the maintenance, if enabled, from the running event loop."""
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+    async def close(self) -> None:
+        """Stop the maintenance."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run_forever(self) -> None:
+        """Run the maintenance until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Index maintenance failed: {e}")
+
+
+def get_maintenance_interval() -> float:
+    """Get the interval between two runs of the index maintenance.
+
+    Returns:
+        float: The DATETIME_INDEX_MAINTENANCE_INTERVAL environment variable in seconds,
+            or the default if unset or invalid.
+    """
+    return get_number_env(
+        "DATETIME_INDEX_MAINTENANCE_INTERVAL", DEFAULT_MAINTENANCE_INTERVAL, minimum=0
+    )
+
+
+def get_rollover_threshold() -> float:
+    """Get the fraction of the index size limit at which indexes are rolled over.
+
+    Returns:
+        float: The DATETIME_INDEX_ROLLOVER_THRESHOLD environment variable, or the
+            default if unset or invalid.
+    """
+    return get_number_env(
+        "DATETIME_INDEX_ROLLOVER_THRESHOLD",
+        DEFAULT_ROLLOVER_THRESHOLD,
+        minimum=0,
+        maximum=1,
+        exclusive_minimum=True,
+    )
@@ -1,15 +1,20 @@
 """Index management utilities."""
 
+import asyncio
 import logging
 import os
+import time
+import weakref
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from fastapi import HTTPException, status
 
+from stac_fastapi.core.utilities import get_number_env
 from stac_fastapi.sfeos_helpers.database import (
     extract_date,
     extract_first_date_from_index,
+    index_alias_by_collection_id,
 )
 
 from .index_operations import IndexOperations
@@ -17,8 +22,29 @@ from .index_operations import IndexOperations
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_INDEX_SIZE_CHECK_INTERVAL = 60.0
+
+
+class _IndexSize:
+    """Size of an index at the last stats call and bytes written since."""
+
+    __slots__ = ("synced_bytes", "written_bytes", "synced_at")
+
+    def __init__(self, synced_bytes: float):
+        self.synced_bytes = synced_bytes
+        self.written_bytes = 0.0
+        self.synced_at = time.monotonic()
+
+
 class IndexSizeManager:
-    """Manages index size limits and operations."""
+    """Manages index size limits and operations.
+
+    Sizes are read with `indices.stats` and cached per index, adding the size of the
+    documents written since. An index is only read again once the bytes written since
+    reach half of the room left under the limit, or after
+    DATETIME_INDEX_SIZE_CHECK_INTERVAL seconds, which bounds how long writes made by
+    other workers are not accounted for.
+    """
 
     def __init__(self, client: Any):
         """Initialize the index size manager.
@@ -28,6 +54,7 @@ class IndexSizeManager:
         """
         self.client = client
         self.max_size_gb = self._get_max_size_from_env()
+        self._sizes: Dict[str, _IndexSize] = {}
 
     async def get_index_size_in_gb(self, index_name: str) -> float:
         """Get index size in gigabytes asynchronously.
@@ -41,20 +68,77 @@ class IndexSizeManager:
         data = await self.client.indices.stats(index=index_name)
         return data["_all"]["primaries"]["store"]["size_in_bytes"] / 1e9
 
-    async def is_index_oversized(self, index_name: str) -> bool:
-        """Check if index exceeds size limit asynchronously.
+    def record_write(self, index_name: str, size_in_bytes: float) -> None:
+        """Account for documents written to an index since its size was read.
+
+        Args:
+            index_name (str): Name of the index written to.
+            size_in_bytes (float): Estimated size of the written documents.
+        """
+        size = self._sizes.get(index_name)
+        if size is not None:
+            size.written_bytes += size_in_bytes
+
+    def forget(self, index_name: str) -> None:
+        """Drop the cached size of an index, e.g. once its alias was renamed.
+
+        Args:
+            index_name (str): Name of the index.
+        """
+        self._sizes.pop(index_name, None)
+
+    def _needs_sync(self, size: Optional[_IndexSize]) -> bool:
+        """Whether the cached size of an index is too old or close to the limit."""
+        if size is None:
+            return True
+        if time.monotonic() - size.synced_at >= self._get_check_interval_from_env():
+            return True
+        room = self.max_size_gb * 1e9 - size.synced_bytes
+        return size.written_bytes >= room / 2
+
+    async def get_estimated_size_in_gb(self, index_name: str) -> float:
+        """Get the estimated index size in gigabytes, reading it only when needed.
 
         Args:
             index_name (str): Name of the index to check.
 
         Returns:
-            bool: True if index exceeds size limit, False otherwise.
+            float: Size at the last stats call plus the size of the documents written
+                since, in gigabytes.
+        """
+        size = self._sizes.get(index_name)
+        if self._needs_sync(size):
+            await self.sync_size(index_name)
+            size = self._sizes[index_name]
+        return (size.synced_bytes + size.written_bytes) / 1e9
+
+    async def sync_size(self, index_name: str) -> float:
+        """Read the size of an index, resetting its estimate.
+
+        Args:
+            index_name (str): Name of the index to check.
+
+        Returns:
+            float: Size of the index in gigabytes.
         """
         size_gb = await self.get_index_size_in_gb(index_name)
-        is_oversized = size_gb > self.max_size_gb
+        self._sizes[index_name] = _IndexSize(size_gb * 1e9)
         gb_milestone = int(size_gb)
         if gb_milestone > 0:
             logger.info(f"Index '{index_name}' size: {gb_milestone}GB")
+        return size_gb
+
+    async def is_index_oversized(self, index_name: str) -> bool:
+        """Check if index exceeds size limit asynchronously.
+
+        Args:
+            index_name (str): Name of the index to check.
+
+        Returns:
+            bool: True if index exceeds size limit, False otherwise.
+        """
+        size_gb = await self.get_estimated_size_in_gb(index_name)
+        is_oversized = size_gb > self.max_size_gb
 
         if is_oversized:
             logger.warning(
@@ -64,6 +148,20 @@ class IndexSizeManager:
 
         return is_oversized
 
+    @staticmethod
+    def _get_check_interval_from_env() -> float:
+        """Get the maximum age of a cached index size from environment variable.
+
+        Returns:
+            float: Seconds after which an index size is read again, 0 to read it on
+                every check.
+        """
+        return get_number_env(
+            "DATETIME_INDEX_SIZE_CHECK_INTERVAL",
+            DEFAULT_INDEX_SIZE_CHECK_INTERVAL,
+            minimum=0,
+        )
+
     @staticmethod
     def _get_max_size_from_env() -> float:
         """Get max size from environment variable with error handling.
@@ -94,7 +192,13 @@ class IndexSizeManager:
 
 
 class DatetimeIndexManager:
-    """Manages datetime-based index operations."""
+    """Manages datetime-based index operations.
+
+    Partitions of a collection are created and renamed while holding its
+    `partition_lock`, so that concurrent writes to a collection do not race to create
+    the same partition. Holders re-check the aliases once the lock is acquired, as
+    another writer may have made the change meanwhile.
+    """
 
     def __init__(self, client: Any, index_operations: IndexOperations):
         """Initialize the datetime index manager.
@@ -106,6 +210,26 @@ class DatetimeIndexManager:
         self.client = client
         self.index_operations = index_operations
         self.size_manager = IndexSizeManager(client)
+        self._partition_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def partition_lock(self, collection_id: str) -> asyncio.Lock:
+        """Get the lock serializing the partition changes of a collection.
+
+        Locks are dropped once no writer holds or waits for them.
+
+        Args:
+            collection_id (str): Collection identifier.
+
+        Returns:
+            asyncio.Lock: Lock of the collection.
+        """
+        key = index_alias_by_collection_id(collection_id)
+        lock = self._partition_locks.get(key)
+        if lock is None:
+            lock = self._partition_locks[key] = asyncio.Lock()
+        return lock
 
     @staticmethod
     def validate_product_datetime(product: Dict[str, Any]) -> str:
@@ -191,8 +315,46 @@ class DatetimeIndexManager:
             await self.index_operations.update_index_alias(
                 self.client, str(end_date), target_index
             )
+            self.size_manager.forget(target_index)
             target_index = await self.index_operations.create_datetime_index(
-                self.client, collection_id, str(end_date + timedelta(days=1))
+                self.client,
+                collection_id,
+                str(end_date + timedelta(days=1)),
+                previous_alias=target_index,
             )
 
         return target_index
+
+    async def rollover_index(self, collection_id: str, latest_index: str) -> str:
+        """Close the open ended index of a collection and create the next one.
+
+        The alias of the latest index is given the date of its latest item as end
+        date, and a new index starts the day after. Callers hold the partition lock
+        of the collection.
+
+        Args:
+            collection_id (str): Collection identifier.
+            latest_index (str): Alias of the latest index of the collection.
+
+        Returns:
+            str: Alias of the created index.
+
+        Raises:
+            ValueError: If the latest index holds no items.
+        """
+        latest_datetime = await self.index_operations.find_latest_item_datetime(
+            self.client, latest_index
+        )
+        if latest_datetime is None:
+            raise ValueError(f"Index '{latest_index}' holds no items")
+        end_date = extract_date(latest_datetime)
+        await self.index_operations.update_index_alias(
+            self.client, str(end_date), latest_index
+        )
+        self.size_manager.forget(latest_index)
+        return await self.index_operations.create_datetime_index(
+            self.client,
+            collection_id,
+            str(end_date + timedelta(days=1)),
+            previous_alias=latest_index,
+        )
@@ -0,0 +1,297 @@
+"""Concurrent, resumable reindexing of the collection and item indexes."""
+
+import asyncio
+import logging
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import orjson
+
+from stac_fastapi.sfeos_helpers.mappings import COLLECTIONS_INDEX, ITEMS_INDEX_PREFIX
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REINDEX_WORKERS = 4
+DEFAULT_POLL_INTERVAL = 10.0
+
+_VERSIONED_INDEX_PATTERN = re.compile(r"(.*)-(\d{6})")
+
+
+def next_index_name(index: str) -> str:
+    """Get the name of the next version of an index.
+
+    Args:
+        index (str): Index name, ending with a six digit version like
+            `items_collection_636f6c6c656374696f6e-000001`, or not versioned like the
+            datetime partitions.
+
+    Returns:
+        str: The name with the version incremented, or `-000002` appended.
+    """
+    match = _VERSIONED_INDEX_PATTERN.fullmatch(index)
+    if match is None:
+        return f"{index}-000002"
+    return f"{match.group(1)}-{str(int(match.group(2)) + 1).zfill(6)}"
+
+
+class ReindexJob:
+    """Reindex of an index into its next version, with its progress."""
+
+    __slots__ = (
+        "index",
+        "new_index",
+        "aliases",
+        "script",
+        "task",
+        "state",
+        "total",
+        "done",
+        "error",
+    )
+
+    def __init__(
+        self,
+        index: str,
+        aliases: Iterable[str],
+        script: Optional[str] = None,
+        new_index: Optional[str] = None,
+    ):
+        """Initialize the job.
+
+        Args:
+            index (str): The index to copy.
+            aliases (Iterable[str]): The aliases moved to the copy once reindexed.
+            script (Optional[str]): Painless script applied to every document.
+            new_index (Optional[str]): Name of the copy, the next version by default.
+        """
+        self.index = index
+        self.new_index = new_index or next_index_name(index)
+        self.aliases = sorted(aliases)
+        self.script = script
+        self.task: Optional[str] = None
+        # pending, running, reindexed or failed
+        self.state = "pending"
+        self.total = 0
+        self.done = 0
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the job as a JSON serializable dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def resume(self, saved: Dict[str, Any]) -> None:
+        """Take the progress of the same job over from a previous run.
+
+        Args:
+            saved (Dict[str, Any]): The job, as saved by `to_dict`.
+        """
+        if saved.get("new_index") != self.new_index or saved.get("state") == "failed":
+            return
+        for name in ("task", "state", "total", "done"):
+            setattr(self, name, saved.get(name, getattr(self, name)))
+
+
+class ReindexOrchestrator:
+    """Runs sliced reindexes of many indexes concurrently, then swaps their aliases.
+
+    At most `workers` reindex tasks run at once, each split into slices by the search
+    engine and throttled to `requests_per_second`. Tasks are polled without blocking
+    the event loop, and their progress is logged. The state of every job is saved to
+    `state_path` as it changes, so that a run started again with the same jobs waits
+    for the running tasks and skips the reindexed indexes instead of starting over.
+    Once every index is reindexed, all aliases are moved to the new indexes in a single
+    atomic update. Documents written to an index while it is reindexed are not copied.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        workers: int = DEFAULT_REINDEX_WORKERS,
+        requests_per_second: Optional[float] = None,
+        slices: Union[int, str] = "auto",
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        state_path: Optional[str] = None,
+    ):
+        """Initialize the orchestrator.
+
+        Args:
+            client: Async search engine client instance.
+            workers (int): Maximum number of reindex tasks running at once.
+            requests_per_second (Optional[float]): Throttle of every reindex task, in
+                sub-requests per second. Unthrottled by default.
+            slices (Union[int, str]): Number of slices of every reindex task, `auto` to
+                let the search engine pick one per shard.
+            poll_interval (float): Seconds between two polls of a task.
+            state_path (Optional[str]): File the jobs are saved to, to resume a run.
+        """
+        self.client = client
+        self.workers = workers
+        self.requests_per_second = requests_per_second
+        self.slices = slices
+        self.poll_interval = poll_interval
+        self.state_path = state_path
+
+    async def run(self, jobs: List[ReindexJob], swap_aliases: bool = True) -> bool:
+        """Reindex every job, then move their aliases if all succeeded.
+
+        Args:
+            jobs (List[ReindexJob]): The indexes to reindex.
+            swap_aliases (bool): Whether to move the aliases once reindexed.
+
+        Returns:
+            bool: True if every index was reindexed and the aliases were moved.
+        """
+        saved = self._load_state()
+        for job in jobs:
+            if job.index in saved:
+                job.resume(saved[job.index])
+
+        queue: "asyncio.Queue[ReindexJob]" = asyncio.Queue()
+        for job in jobs:
+            if job.state != "reindexed":
+                queue.put_nowait(job)
+            else:
+                logger.info(f"Index {job.index} already reindexed to {job.new_index}")
+
+        async def work() -> None:
+            while not queue.empty():
+                job = queue.get_nowait()
+                try:
+                    await self.reindex(job, jobs)
+                except Exception as e:
+                    job.state = "failed"
+                    job.error = str(e)
+                    self._save_state(jobs)
+                if job.state == "failed":
+                    logger.error(f"Reindex of {job.index} failed: {job.error}")
+
+        await asyncio.gather(*(work() for _ in range(min(self.workers, len(jobs)))))
+
+        failed = [job for job in jobs if job.state != "reindexed"]
+        if failed:
+            logger.error(
+                f"{len(failed)} of {len(jobs)} indexes failed to reindex, aliases "
+                f"left unchanged: {', '.join(job.index for job in failed)}"
+            )
+            return False
+        if swap_aliases:
+            await self.swap_aliases(jobs)
+            self._clear_state()
+        return True
+
+    async def reindex(self, job: ReindexJob, jobs: List[ReindexJob]) -> None:
+        """Reindex an index into its new version, or wait for a resumed task.
+
+        Args:
+            job (ReindexJob): The job to run.
+            jobs (List[ReindexJob]): Every job, saved with the progress of this one.
+        """
+        if job.task is None:
+            if not await self.client.indices.exists(index=job.new_index):
+                # Index templates provide the mappings and settings
+                await self.client.indices.create(index=job.new_index)
+            body: Dict[str, Any] = {
+                "source": {"index": job.index},
+                "dest": {"index": job.new_index},
+            }
+            if job.script:
+                body["script"] = {"source": job.script, "lang": "painless"}
+            params: Dict[str, Any] = {
+                "wait_for_completion": False,
+                "slices": self.slices,
+            }
+            if self.requests_per_second is not None:
+                params["requests_per_second"] = self.requests_per_second
+            response = await self.client.reindex(body=body, **params)
+            job.task = response["task"]
+            job.state = "running"
+            self._save_state(jobs)
+            logger.info(f"Reindexing {job.index} to {job.new_index} in task {job.task}")
+
+        while True:
+            response = await self.client.tasks.get(task_id=job.task)
+            status = response.get("task", {}).get("status", {})
+            job.total = status.get("total", job.total)
+            job.done = sum(
+                status.get(field, 0)
+                for field in ("created", "updated", "deleted", "noops")
+            )
+            if response.get("completed"):
+                break
+            logger.info(f"Reindexing {job.index}: {job.done}/{job.total} documents")
+            self._save_state(jobs)
+            await asyncio.sleep(self.poll_interval)
+
+        failures = response.get("response", {}).get("failures") or []
+        if "error" in response or failures:
+            job.state = "failed"
+            job.error = str(response.get("error") or failures[0])
+        else:
+            job.state = "reindexed"
+            logger.info(
+                f"Reindexed {job.index} to {job.new_index}: {job.done} documents"
+            )
+        self._save_state(jobs)
+
+    async def swap_aliases(self, jobs: List[ReindexJob]) -> None:
+        """Move the aliases of every job to its new index in one atomic update.
+
+        Args:
+            jobs (List[ReindexJob]): The reindexed jobs.
+        """
+        actions = []
+        for job in jobs:
+            for alias in job.aliases:
+                actions.append({"add": {"index": job.new_index, "alias": alias}})
+                actions.append({"remove": {"index": job.index, "alias": alias}})
+        if actions:
+            await self.client.indices.update_aliases(body={"actions": actions})
+        logger.info(f"Moved the aliases of {len(jobs)} indexes to their new versions")
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        """Read the jobs saved by a previous run, by index."""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "rb") as file:
+            return {job["index"]: job for job in orjson.loads(file.read())["jobs"]}
+
+    def _save_state(self, jobs: List[ReindexJob]) -> None:
+        """Save the jobs, replacing the state file atomically."""
+        if not self.state_path:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(orjson.dumps({"jobs": [job.to_dict() for job in jobs]}))
+        os.replace(tmp_path, self.state_path)
+
+    def _clear_state(self) -> None:
+        """Remove the state file once the aliases are moved."""
+        if self.state_path and os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+
+async def plan_reindex(
+    client: Any,
+    collections_script: Optional[str] = None,
+    items_script: Optional[str] = None,
+) -> List[ReindexJob]:
+    """Plan the reindex of the collections index and of every item index.
+
+    Args:
+        client: Async search engine client instance.
+        collections_script (Optional[str]): Painless script applied to collections.
+        items_script (Optional[str]): Painless script applied to items.
+
+    Returns:
+        List[ReindexJob]: A job per index, with the aliases it holds.
+    """
+    jobs = []
+    for pattern, script in (
+        (COLLECTIONS_INDEX, collections_script),
+        (f"{ITEMS_INDEX_PREFIX}*", items_script),
+    ):
+        response = await client.indices.get_alias(name=pattern)
+        for index, data in sorted(response.items()):
+            jobs.append(ReindexJob(index, data.get("aliases", {}), script=script))
+    return jobs
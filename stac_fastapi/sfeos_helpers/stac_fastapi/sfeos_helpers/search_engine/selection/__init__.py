@@ -1,11 +1,12 @@
 """Index selection strategies package."""
 
 from .base import BaseIndexSelector
-from .cache_manager import IndexAliasLoader, IndexCacheManager
+from .cache_manager import AliasSnapshot, IndexAliasLoader, IndexCacheManager
 from .factory import IndexSelectorFactory
 from .selectors import DatetimeBasedIndexSelector, UnfilteredIndexSelector
 
 __all__ = [
+    "AliasSnapshot",
     "IndexCacheManager",
     "IndexAliasLoader",
     "DatetimeBasedIndexSelector",
@@ -1,13 +1,48 @@
 """Cache management for index selection strategies."""
 
-import threading
+import asyncio
+import logging
 import time
 from collections import defaultdict
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from stac_fastapi.sfeos_helpers.database import index_alias_by_collection_id
+from stac_fastapi.sfeos_helpers.database import (
+    IndexIntervals,
+    index_alias_by_collection_id,
+)
 from stac_fastapi.sfeos_helpers.mappings import ITEMS_INDEX_PREFIX
 
+logger = logging.getLogger(__name__)
+
+_NO_INTERVALS = IndexIntervals(())
+
+
+class AliasSnapshot:
+    """Immutable view of the index aliases loaded from the search engine.
+
+    Snapshots are never modified once built, so readers share them without copying or
+    locking. A refresh builds a new snapshot and swaps it in.
+    """
+
+    __slots__ = ("aliases", "intervals", "loaded_at", "version")
+
+    def __init__(self, aliases: Dict[str, List[str]], version: int = 0):
+        """Build a snapshot, parsing the date ranges of the aliases.
+
+        Args:
+            aliases (Dict[str, List[str]]): Item aliases keyed by base alias.
+            version (int): Number of the load that produced the aliases.
+        """
+        self.aliases: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {alias: tuple(indexes) for alias, indexes in aliases.items()}
+        )
+        self.intervals: Mapping[str, IndexIntervals] = MappingProxyType(
+            {alias: IndexIntervals(indexes) for alias, indexes in aliases.items()}
+        )
+        self.loaded_at = time.time()
+        self.version = version
+
 
 class IndexCacheManager:
     """Manages caching of index aliases with expiration."""
@@ -18,10 +53,18 @@ class IndexCacheManager:
         Args:
             cache_ttl_seconds (int): Time-to-live for cache entries in seconds.
         """
-        self._cache: Optional[Dict[str, List[str]]] = None
-        self._timestamp: float = 0
+        self._snapshot: Optional[AliasSnapshot] = None
+        self._stale = False
         self._ttl = cache_ttl_seconds
-        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> Optional[AliasSnapshot]:
+        """Get the current snapshot, expired or not.
+
+        Returns:
+            Optional[AliasSnapshot]: The last loaded aliases, None if never loaded.
+        """
+        return self._snapshot
 
     @property
     def is_expired(self) -> bool:
@@ -30,36 +73,76 @@ class IndexCacheManager:
         Returns:
             bool: True if cache is expired, False otherwise.
         """
-        return time.time() - self._timestamp > self._ttl
+        snapshot = self._snapshot
+        return (
+            snapshot is None
+            or self._stale
+            or time.time() - snapshot.loaded_at > self._ttl
+        )
 
-    def get_cache(self) -> Optional[Dict[str, List[str]]]:
+    def get_cache(self) -> Optional[Mapping[str, Tuple[str, ...]]]:
         """Get the current cache if not expired.
 
         Returns:
-            Optional[Dict[str, List[str]]]: Cache data if valid, None if expired.
+            Optional[Mapping[str, Tuple[str, ...]]]: Read-only cache data if valid,
+                None if expired.
         """
-        with self._lock:
-            if self.is_expired:
-                return None
-            return {k: v.copy() for k, v in self._cache.items()}
+        snapshot = self._snapshot
+        if snapshot is None or self.is_expired:
+            return None
+        return snapshot.aliases
 
-    def set_cache(self, data: Dict[str, List[str]]) -> None:
-        """Set cache data and update timestamp.
+    def get_intervals(self) -> Optional[Mapping[str, IndexIntervals]]:
+        """Get the parsed date ranges of the cached indexes if not expired.
+
+        Returns:
+            Optional[Mapping[str, IndexIntervals]]: Date ranges keyed by base alias,
+                None if expired.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or self.is_expired:
+            return None
+        return snapshot.intervals
+
+    def set_cache(self, data: Dict[str, List[str]], version: int = 0) -> bool:
+        """Swap in a snapshot of the aliases.
+
+        The date ranges of the indexes are parsed once here, rather than on every
+        index selection.
 
         Args:
             data (Dict[str, List[str]]): Cache data to store.
+            version (int): Number of the load that produced the data. Data from a load
+                older than the current snapshot is ignored.
+
+        Returns:
+            bool: Whether the snapshot was swapped in.
         """
-        self._cache = data
-        self._timestamp = time.time()
+        current = self._snapshot
+        if current is not None and version < current.version:
+            return False
+        self._snapshot = AliasSnapshot(data, version)
+        self._stale = False
+        return True
+
+    def invalidate(self) -> None:
+        """Mark the cache as expired, keeping the snapshot to serve while reloading."""
+        self._stale = True
 
     def clear_cache(self) -> None:
         """Clear the cache and reset timestamp."""
-        self._cache = None
-        self._timestamp = 0
+        self._snapshot = None
+        self._stale = False
 
 
 class IndexAliasLoader:
-    """Asynchronous loader for index aliases."""
+    """Asynchronous loader for index aliases.
+
+    Reads are served from the cached snapshot with stale-while-revalidate semantics:
+    once the snapshot expires it keeps being served while a single background load
+    replaces it, so that searches never wait on `indices.get_alias`. Only the first
+    read, with nothing cached yet, waits for the aliases to be loaded.
+    """
 
     def __init__(self, client: Any, cache_manager: IndexCacheManager):
         """Initialize the async alias loader.
@@ -70,9 +153,15 @@ class IndexAliasLoader:
         """
         self.client = client
         self.cache_manager = cache_manager
+        self._version = 0
+        self._load_task: Optional["asyncio.Future[Dict[str, List[str]]]"] = None
+        self._load_version = 0
 
-    async def load_aliases(self) -> Dict[str, List[str]]:
-        """Load index aliases from search engine.
+    async def _load(self, version: int) -> Dict[str, List[str]]:
+        """Load index aliases from search engine and swap them in.
+
+        Args:
+            version (int): Number of the load.
 
         Returns:
             Dict[str, List[str]]: Mapping of base aliases to item aliases.
@@ -92,26 +181,82 @@ class IndexAliasLoader:
             if items_aliases:
                 result[items_aliases[0]].extend(items_aliases[1:])
 
-        self.cache_manager.set_cache(result)
+        self.cache_manager.set_cache(result, version)
         return result
 
-    async def get_aliases(self) -> Dict[str, List[str]]:
-        """Get aliases from cache or load if expired.
+    def _start_load(self, min_version: int = 0) -> "asyncio.Future":
+        """Get the load in flight, or start one.
+
+        Args:
+            min_version (int): Lowest number of a load in flight that may be joined,
+                loads started before are not.
 
         Returns:
-            Dict[str, List[str]]: Alias mapping data.
+            asyncio.Future: The load.
         """
-        cached = self.cache_manager.get_cache()
-        if cached is not None:
-            return cached
-        return await self.load_aliases()
+        task = self._load_task
+        if task is not None and not task.done() and self._load_version >= min_version:
+            return task
+
+        self._version += 1
+        self._load_version = self._version
+        task = asyncio.ensure_future(self._load(self._version))
+        task.add_done_callback(self._finish_load)
+        self._load_task = task
+        return task
+
+    @staticmethod
+    def _finish_load(task: "asyncio.Future") -> None:
+        """Log a failed load, the stale snapshot is kept and retried on next read."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Failed to refresh index aliases: {task.exception()}")
+
+    async def load_aliases(self) -> Dict[str, List[str]]:
+        """Load index aliases from search engine.
+
+        Loads started before this call are not joined, so the result includes every
+        alias change made before the call.
+
+        Returns:
+            Dict[str, List[str]]: Mapping of base aliases to item aliases.
+        """
+        # Shielded, so that a cancelled caller does not cancel the others
+        return await asyncio.shield(self._start_load(min_version=self._version + 1))
+
+    async def get_snapshot(self) -> AliasSnapshot:
+        """Get the cached aliases, reloading them in the background once expired.
+
+        Returns:
+            AliasSnapshot: The current snapshot, possibly stale.
+        """
+        snapshot = self.cache_manager.snapshot
+        if snapshot is None:
+            await asyncio.shield(self._start_load())
+            snapshot = self.cache_manager.snapshot
+            assert snapshot is not None
+        elif self.cache_manager.is_expired:
+            self._start_load()
+        return snapshot
+
+    async def get_aliases(self) -> Mapping[str, Tuple[str, ...]]:
+        """Get aliases from cache, reloading them in the background once expired.
+
+        Returns:
+            Mapping[str, Tuple[str, ...]]: Read-only alias mapping data.
+        """
+        return (await self.get_snapshot()).aliases
 
     async def refresh_aliases(self) -> Dict[str, List[str]]:
-        """Force refresh aliases from search engine.
+        """Invalidate the cache and wait for the aliases to be reloaded.
+
+        Used by writers after changing aliases, so that their next index selection
+        sees the change. Until the reload completes, other readers keep being served
+        the previous snapshot.
 
         Returns:
             Dict[str, List[str]]: Fresh alias mapping data.
         """
+        self.cache_manager.invalidate()
         return await self.load_aliases()
 
     async def get_collection_indexes(self, collection_id: str) -> List[str]:
@@ -124,4 +269,18 @@ class IndexAliasLoader:
             List[str]: List of index aliases for the collection.
         """
         aliases = await self.get_aliases()
-        return aliases.get(index_alias_by_collection_id(collection_id), [])
+        return list(aliases.get(index_alias_by_collection_id(collection_id), ()))
+
+    async def get_collection_intervals(self, collection_id: str) -> IndexIntervals:
+        """Get the parsed date ranges of the index aliases of a collection.
+
+        Args:
+            collection_id (str): Collection identifier.
+
+        Returns:
+            IndexIntervals: Date ranges of the index aliases of the collection.
+        """
+        snapshot = await self.get_snapshot()
+        return snapshot.intervals.get(
+            index_alias_by_collection_id(collection_id), _NO_INTERVALS
+        )
@@ -1,11 +1,11 @@
 """Async index selectors with datetime-based filtering."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
-from stac_fastapi.sfeos_helpers.database import filter_indexes_by_datetime
+from stac_fastapi.sfeos_helpers.cache import ALIASES, InvalidationBus
 from stac_fastapi.sfeos_helpers.mappings import ITEM_INDICES
 
-from ...database import indices
+from ...database import IndexIntervals, indices
 from .base import BaseIndexSelector
 from .cache_manager import IndexAliasLoader, IndexCacheManager
 
@@ -38,16 +38,32 @@ class DatetimeBasedIndexSelector(BaseIndexSelector):
         if not hasattr(self, "_initialized"):
             self.cache_manager = IndexCacheManager()
             self.alias_loader = IndexAliasLoader(client, self.cache_manager)
+            self.invalidation_bus = InvalidationBus.shared()
+            self.invalidation_bus.subscribe(ALIASES, self._reload)
             self._initialized = True
 
     async def refresh_cache(self) -> Dict[str, List[str]]:
-        """Force refresh of the aliases cache.
+        """Invalidate the aliases cache and wait for it to be reloaded.
+
+        Called by index inserters after changing aliases. Loads started before the
+        call are not joined, so the reloaded cache includes the change. Other workers
+        are told to reload their cache through the invalidation bus.
 
         Returns:
             Dict[str, List[str]]: Refreshed dictionary mapping base collection aliases
                 to lists of their corresponding item index aliases.
         """
-        return await self.alias_loader.refresh_aliases()
+        aliases = await self.alias_loader.refresh_aliases()
+        await self.invalidation_bus.publish(ALIASES)
+        return aliases
+
+    async def _reload(self, collection_ids: Optional[Set[str]]) -> None:
+        """Reload the aliases changed by another worker, serving them stale meanwhile.
+
+        Args:
+            collection_ids (Optional[Set[str]]): Collections whose aliases changed.
+        """
+        await self.alias_loader.refresh_aliases()
 
     async def get_collection_indexes(self, collection_id: str) -> List[str]:
         """Get all index aliases for a specific collection.
@@ -61,6 +77,17 @@ class DatetimeBasedIndexSelector(BaseIndexSelector):
         """
         return await self.alias_loader.get_collection_indexes(collection_id)
 
+    async def get_collection_intervals(self, collection_id: str) -> IndexIntervals:
+        """Get the date ranges of the index aliases of a collection.
+
+        Args:
+            collection_id (str): The ID of the collection to retrieve indexes for.
+
+        Returns:
+            IndexIntervals: Date ranges of the index aliases, sorted by start date.
+        """
+        return await self.alias_loader.get_collection_intervals(collection_id)
+
     async def select_indexes(
         self,
         collection_ids: Optional[List[str]],
@@ -68,8 +95,8 @@ class DatetimeBasedIndexSelector(BaseIndexSelector):
     ) -> str:
         """Select indexes filtered by collection IDs and datetime criteria.
 
-        For each specified collection, retrieves its associated indexes and filters
-        them based on datetime range. If no collection IDs are provided, returns
+        For each specified collection, looks up its indexes overlapping the datetime
+        range in the date ranges parsed when the aliases were loaded. If no collection IDs are provided, returns
         all item indices.
 
         Args:
@@ -86,13 +113,12 @@ class DatetimeBasedIndexSelector(BaseIndexSelector):
         if collection_ids:
             selected_indexes = []
             for collection_id in collection_ids:
-                collection_indexes = await self.get_collection_indexes(collection_id)
-                filtered_indexes = filter_indexes_by_datetime(
-                    collection_indexes,
-                    datetime_search.get("gte"),
-                    datetime_search.get("lte"),
+                intervals = await self.get_collection_intervals(collection_id)
+                selected_indexes.extend(
+                    intervals.select(
+                        datetime_search.get("gte"), datetime_search.get("lte")
+                    )
                 )
-                selected_indexes.extend(filtered_indexes)
 
             return ",".join(selected_indexes) if selected_indexes else ""
 
@@ -31,6 +31,8 @@ ROUTES = {
     "GET /collections/{collection_id}/items/{item_id}",
     "GET /search",
     "POST /search",
+    "POST /search/batch",
+    "POST /search/export",
     "DELETE /collections/{collection_id}",
     "DELETE /collections/{collection_id}/items/{item_id}",
     "POST /collections",
@@ -40,6 +42,7 @@ ROUTES = {
     "PUT /collections/{collection_id}/items/{item_id}",
     "PATCH /collections/{collection_id}/items/{item_id}",
     "POST /collections/{collection_id}/bulk_items",
+    "POST /collections/{collection_id}/ingest",
     "GET /aggregations",
     "GET /aggregate",
     "POST /aggregations",
@@ -934,10 +937,12 @@ async def test_create_item_with_different_date_same_index_for_datetime_index(
 @pytest.mark.datetime_filtering
 @pytest.mark.asyncio
 async def test_create_new_index_when_size_limit_exceeded_for_datetime_index(
-    app_client, load_test_data, txn_client, ctx
+    app_client, load_test_data, txn_client, ctx, monkeypatch
 ):
     if not os.getenv("ENABLE_DATETIME_INDEX_FILTERING"):
         pytest.skip()
+    # Read the mocked index size on every check, rather than estimating it
+    monkeypatch.setenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", "0")
 
     item = load_test_data("test_item.json")
     item["id"] = str(uuid.uuid4())
@@ -1066,10 +1071,12 @@ async def test_bulk_create_items_with_different_date_ranges_for_datetime_index(
 @pytest.mark.datetime_filtering
 @pytest.mark.asyncio
 async def test_bulk_create_items_with_size_limit_exceeded_for_datetime_index(
-    app_client, load_test_data, txn_client, ctx
+    app_client, load_test_data, txn_client, ctx, monkeypatch
 ):
     if not os.getenv("ENABLE_DATETIME_INDEX_FILTERING"):
         pytest.skip("Datetime index filtering not enabled")
+    # Read the mocked index size on every check, rather than estimating it
+    monkeypatch.setenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", "0")
 
     base_item = load_test_data("test_item.json")
     collection_id = base_item["collection"]
@@ -1126,10 +1133,12 @@ async def test_bulk_create_items_with_size_limit_exceeded_for_datetime_index(
 @pytest.mark.datetime_filtering
 @pytest.mark.asyncio
 async def test_bulk_create_items_with_early_date_in_second_batch_for_datetime_index(
-    app_client, load_test_data, txn_client, ctx
+    app_client, load_test_data, txn_client, ctx, monkeypatch
 ):
     if not os.getenv("ENABLE_DATETIME_INDEX_FILTERING"):
         pytest.skip("Datetime index filtering not enabled")
+    # Read the mocked index size on every check, rather than estimating it
+    monkeypatch.setenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", "0")
 
     base_item = load_test_data("test_item.json")
     collection_id = base_item["collection"]
@@ -1186,10 +1195,12 @@ async def test_bulk_create_items_with_early_date_in_second_batch_for_datetime_in
 @pytest.mark.datetime_filtering
 @pytest.mark.asyncio
 async def test_bulk_create_items_and_retrieve_by_id_for_datetime_index(
-    app_client, load_test_data, txn_client, ctx
+    app_client, load_test_data, txn_client, ctx, monkeypatch
 ):
     if not os.getenv("ENABLE_DATETIME_INDEX_FILTERING"):
         pytest.skip("Datetime index filtering not enabled")
+    # Read the mocked index size on every check, rather than estimating it
+    monkeypatch.setenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", "0")
 
     base_item = load_test_data("test_item.json")
     collection_id = base_item["collection"]
@@ -1241,10 +1252,12 @@ async def test_bulk_create_items_and_retrieve_by_id_for_datetime_index(
 @pytest.mark.datetime_filtering
 @pytest.mark.asyncio
 async def test_patch_collection_for_datetime_index(
-    app_client, load_test_data, txn_client, ctx
+    app_client, load_test_data, txn_client, ctx, monkeypatch
 ):
     if not os.getenv("ENABLE_DATETIME_INDEX_FILTERING"):
         pytest.skip("Datetime index filtering not enabled")
+    # Read the mocked index size on every check, rather than estimating it
+    monkeypatch.setenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", "0")
 
     base_item = load_test_data("test_item.json")
     collection_id = base_item["collection"]
@@ -1298,10 +1311,12 @@ async def test_patch_collection_for_datetime_index(
 @pytest.mark.datetime_filtering
 @pytest.mark.asyncio
 async def test_put_collection_for_datetime_index(
-    app_client, load_test_data, txn_client, ctx
+    app_client, load_test_data, txn_client, ctx, monkeypatch
 ):
     if not os.getenv("ENABLE_DATETIME_INDEX_FILTERING"):
         pytest.skip("Datetime index filtering not enabled")
+    # Read the mocked index size on every check, rather than estimating it
+    monkeypatch.setenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", "0")
 
     base_item = load_test_data("test_item.json")
     collection_id = base_item["collection"]
@@ -1358,10 +1373,12 @@ async def test_put_collection_for_datetime_index(
 @pytest.mark.datetime_filtering
 @pytest.mark.asyncio
 async def test_patch_item_for_datetime_index(
-    app_client, load_test_data, txn_client, ctx
+    app_client, load_test_data, txn_client, ctx, monkeypatch
 ):
     if not os.getenv("ENABLE_DATETIME_INDEX_FILTERING"):
         pytest.skip("Datetime index filtering not enabled")
+    # Read the mocked index size on every check, rather than estimating it
+    monkeypatch.setenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", "0")
 
     base_item = load_test_data("test_item.json")
     collection_id = base_item["collection"]
@@ -1416,9 +1433,13 @@ async def test_patch_item_for_datetime_index(
 
 @pytest.mark.datetime_filtering
 @pytest.mark.asyncio
-async def test_put_item_for_datetime_index(app_client, load_test_data, txn_client, ctx):
+async def test_put_item_for_datetime_index(
+    app_client, load_test_data, txn_client, ctx, monkeypatch
+):
     if not os.getenv("ENABLE_DATETIME_INDEX_FILTERING"):
         pytest.skip("Datetime index filtering not enabled")
+    # Read the mocked index size on every check, rather than estimating it
+    monkeypatch.setenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", "0")
 
     base_item = load_test_data("test_item.json")
     collection_id = base_item["collection"]
@@ -1623,3 +1644,106 @@ async def test_use_datetime_false(app_client, load_test_data, txn_client, monkey
 
     assert "test-item-datetime-only" not in found_ids
     assert "test-item-start-end-only" in found_ids
+
+
+@pytest.mark.asyncio
+async def test_use_temporal_range_field(
+    app_client, load_test_data, txn_client, monkeypatch
+):
+    monkeypatch.setenv("USE_TEMPORAL_RANGE_FIELD", "true")
+
+    test_collection = load_test_data("test_collection.json")
+    test_collection["id"] = "test-collection-temporal-range"
+    await create_collection(txn_client, test_collection)
+
+    item = load_test_data("test_item.json")
+
+    item1 = deepcopy(item)
+    item1["id"] = "test-item-temporal-instant"
+    item1["collection"] = test_collection["id"]
+    item1["properties"]["datetime"] = "2020-01-01T12:00:00Z"
+    await create_item(txn_client, item1)
+
+    item2 = deepcopy(item)
+    item2["id"] = "test-item-temporal-interval"
+    item2["collection"] = test_collection["id"]
+    item2["properties"]["datetime"] = None
+    item2["properties"]["start_datetime"] = "2020-01-01T10:00:00Z"
+    item2["properties"]["end_datetime"] = "2020-01-01T14:00:00Z"
+    await create_item(txn_client, item2)
+
+    item3 = deepcopy(item)
+    item3["id"] = "test-item-temporal-outside"
+    item3["collection"] = test_collection["id"]
+    item3["properties"]["datetime"] = "2021-01-01T12:00:00Z"
+    await create_item(txn_client, item3)
+
+    expected = {
+        "2020-01-01T12:00:00Z": {
+            "test-item-temporal-instant",
+            "test-item-temporal-interval",
+        },
+        "2020-01-01T13:00:00Z/..": {"test-item-temporal-interval"},
+        "../2020-01-01T11:00:00Z": {"test-item-temporal-interval"},
+        "2020-06-01T00:00:00Z/2022-01-01T00:00:00Z": {"test-item-temporal-outside"},
+    }
+    for datetime_search, ids in expected.items():
+        resp = await app_client.post(
+            "/search",
+            json={
+                "datetime": datetime_search,
+                "collections": [test_collection["id"]],
+            },
+        )
+        assert resp.status_code == 200
+        features = resp.json()["features"]
+        assert {feature["id"] for feature in features} == ids
+        # The indexed range is never returned
+        assert all("_temporal" not in f["properties"] for f in features)
+
+
+@pytest.mark.asyncio
+async def test_search_number_matched_strategies(app_client, txn_client, ctx):
+    for i in range(2):
+        item = deepcopy(ctx.item)
+        item["id"] = f"number-matched-{i}"
+        await create_item(txn_client, item)
+
+    body = {"collections": [ctx.item["collection"]], "limit": 1}
+
+    resp = await app_client.post("/search", json={**body, "number_matched": "exact"})
+    assert resp.status_code == 200
+    assert resp.json()["numberMatched"] == 3
+
+    resp = await app_client.post("/search", json={**body, "number_matched": "2"})
+    assert resp.status_code == 200
+    assert resp.json().get("numberMatched") is None
+
+    resp = await app_client.post("/search", json={**body, "number_matched": "10"})
+    assert resp.status_code == 200
+    assert resp.json()["numberMatched"] == 3
+
+    resp = await app_client.post("/search", json={**body, "number_matched": "estimate"})
+    assert resp.status_code == 200
+    assert resp.json()["numberMatched"] == 3
+
+    resp = await app_client.get(
+        "/search",
+        params={
+            "collections": ctx.item["collection"],
+            "limit": 1,
+            "number_matched": "none",
+        },
+    )
+    assert resp.status_code == 200
+    resp_json = resp.json()
+    assert resp_json.get("numberMatched") is None
+    assert len(resp_json["features"]) == 1
+
+    resp = await app_client.post(
+        "/search", json={**body, "number_matched": "everything"}
+    )
+    assert resp.status_code == 400
+
+    resp = await app_client.get("/search", params={"number_matched": "everything"})
+    assert resp.status_code == 400
@@ -1,5 +1,6 @@
 import asyncio
 import copy
+import fnmatch
 import json
 import os
 from typing import Any, Callable, Dict, Optional
@@ -14,6 +15,7 @@ from stac_pydantic import api
 from stac_fastapi.api.app import StacApi
 from stac_fastapi.core.basic_auth import BasicAuth
 from stac_fastapi.core.core import (
+    AsyncBulkTransactionsClient,
     BulkTransactionsClient,
     CoreClient,
     TransactionsClient,
@@ -27,6 +29,7 @@ from stac_fastapi.core.rate_limit import setup_rate_limit
 from stac_fastapi.core.utilities import get_bool_env
 from stac_fastapi.sfeos_helpers.aggregation import EsAsyncBaseAggregationClient
 from stac_fastapi.sfeos_helpers.mappings import ITEMS_INDEX_PREFIX
+from stac_fastapi.sfeos_helpers.search_engine import DatetimeBasedIndexSelector
 
 if os.getenv("BACKEND", "elasticsearch").lower() == "opensearch":
     from stac_fastapi.opensearch.app import app_config
@@ -132,6 +135,94 @@ def test_collection() -> Dict:
     return copy.deepcopy(_test_collection_prototype)
 
 
+class ApiError(Exception):
+    """Error raised by the fake client, like the search engine clients."""
+
+    def __init__(self, status_code, error):
+        super().__init__(status_code, error)
+        self.status_code = status_code
+        self.error = error
+
+
+class FakeIndicesClient:
+    """Client holding the aliases of datetime partitioned indexes in memory.
+
+    Every call yields to other tasks for `delay` seconds, so that concurrent writers
+    interleave. Errors are raised like a cluster would, for existing indexes and
+    missing aliases.
+    """
+
+    def __init__(self, aliases=None, sizes=None, delay=0.0):
+        self.aliases = aliases if aliases is not None else {}
+        self.sizes = sizes or {}
+        self.delay = delay
+        self.creates = 0
+        self.alias_updates = 0
+        self.refreshes = []
+        self.indices = self
+
+    async def get_alias(self, index=None, name=None):
+        await asyncio.sleep(self.delay)
+        if name is not None:
+            found = {
+                index: {
+                    "aliases": {alias: {} for alias in fnmatch.filter(aliases, name)}
+                }
+                for index, aliases in self.aliases.items()
+                if fnmatch.filter(aliases, name)
+            }
+            if not found and "*" not in name:
+                raise ApiError(404, f"alias [{name}] missing")
+            return found
+        return {
+            index: {"aliases": {alias: {} for alias in aliases}}
+            for index, aliases in self.aliases.items()
+        }
+
+    async def create(self, index, body):
+        self.creates += 1
+        await asyncio.sleep(self.delay)
+        if index in self.aliases:
+            raise ApiError(400, "resource_already_exists_exception")
+        self.aliases[index] = list(body["aliases"])
+
+    async def update_aliases(self, body):
+        self.alias_updates += 1
+        await asyncio.sleep(self.delay)
+        actions = [
+            (kind, spec) for action in body["actions"] for kind, spec in action.items()
+        ]
+        for kind, spec in actions:
+            if kind == "remove" and spec["alias"] not in self.aliases[spec["index"]]:
+                raise ApiError(404, "aliases_not_found_exception")
+        for kind, spec in actions:
+            aliases = self.aliases[spec["index"]]
+            if kind == "add":
+                aliases.append(spec["alias"])
+            else:
+                aliases.remove(spec["alias"])
+
+    async def stats(self, index):
+        (name,) = [name for name, aliases in self.aliases.items() if index in aliases]
+        size = self.sizes.get(name, 0)
+        return {"_all": {"primaries": {"store": {"size_in_bytes": size}}}}
+
+    async def refresh(self, index):
+        self.refreshes.append(index)
+
+    async def search(self, index, body):
+        await asyncio.sleep(self.delay)
+        latest = {"value_as_string": "2020-03-04T12:00:00.000Z"}
+        return {"aggregations": {"latest": latest}}
+
+
+@pytest.fixture
+def indices_client(monkeypatch) -> Callable[..., FakeIndicesClient]:
+    """Get the factory of fake index clients, with an empty aliases cache."""
+    monkeypatch.setattr(DatetimeBasedIndexSelector, "_instance", None)
+    return FakeIndicesClient
+
+
 async def create_collection(txn_client: TransactionsClient, collection: Dict) -> None:
     await txn_client.create_collection(
         api.Collection(**dict(collection)), request=MockRequest, refresh=True
@@ -161,6 +252,7 @@ async def delete_collections_and_items(txn_client: TransactionsClient) -> None:
     await txn_client.database.delete_collections()
     await txn_client.database.client.indices.delete(index=f"{ITEMS_INDEX_PREFIX}*")
     await txn_client.database.async_index_selector.refresh_cache()
+    txn_client.database.queryables_cache.invalidate()
 
 
 async def refresh_indices(txn_client: TransactionsClient) -> None:
@@ -202,6 +294,13 @@ def bulk_txn_client():
     return BulkTransactionsClient(database=database, session=None, settings=settings)
 
 
+@pytest.fixture
+def async_bulk_txn_client():
+    return AsyncBulkTransactionsClient(
+        database=database, session=None, settings=settings
+    )
+
+
 @pytest_asyncio.fixture(scope="session")
 async def app():
     return StacApi(**app_config).app
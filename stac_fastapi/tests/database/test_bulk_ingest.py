@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import (
+    BulkSettings,
+    chunk_items,
+    streaming_bulk_shared,
+)
+
+
+class FakeBulk:
+    """Stands in for `async_streaming_bulk`, rejecting some items with a 429 status."""
+
+    def __init__(self, rejections=None, failures=()):
+        self.rejections = dict(rejections or {})
+        self.failures = set(failures)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, client, actions, **kwargs):
+        assert kwargs["max_retries"] == 0 and not kwargs["raise_on_error"]
+        self.requests.append([action["_id"] for action in actions])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        for action in actions:
+            item_id = action["_id"]
+            if self.rejections.get(item_id):
+                self.rejections[item_id] -= 1
+                status = 429
+            elif item_id in self.failures:
+                status = 409
+            else:
+                yield True, {"create": {"_id": item_id, "status": 201}}
+                continue
+            yield False, {
+                "create": {
+                    "_id": item_id,
+                    "status": status,
+                    "error": {"type": "rejected"},
+                    "data": action["_source"],
+                }
+            }
+
+
+async def prepare_actions(items):
+    return [{"_id": item["id"], "_source": item} for item in items]
+
+
+def make_items(count):
+    return [{"id": f"item-{i}", "properties": {}} for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_chunk_items_bounds_count_and_bytes():
+    items = make_items(5)
+
+    chunks = [chunk async for chunk in chunk_items(items, 2, 10**6)]
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    # Every item is larger than half the limit
+    chunks = [chunk async for chunk in chunk_items(iter(items), 10, 50)]
+    assert [len(chunk) for chunk in chunks] == [1] * 5
+
+
+@pytest.mark.asyncio
+async def test_streaming_bulk_retries_rejected_items(monkeypatch):
+    bulk = FakeBulk(rejections={"item-1": 2, "item-4": 5}, failures={"item-7"})
+    settings = BulkSettings(chunk_size=3, concurrency=2, max_retries=3)
+    monkeypatch.setattr(settings, "initial_backoff", 0.001)
+    written = []
+
+    async def after_chunk(items, success, errors):
+        assert success + len(errors) == len(items)
+        written.extend(item["id"] for item in items)
+
+    success, errors = await streaming_bulk_shared(
+        None,
+        bulk,
+        make_items(9),
+        prepare_actions,
+        settings,
+        after_chunk=after_chunk,
+        refresh=False,
+    )
+
+    assert success == 7
+    assert [list(error["create"].items()) for error in errors] == [
+        [("_id", "item-7"), ("status", 409), ("error", {"type": "rejected"})],
+        [("_id", "item-4"), ("status", 429), ("error", {"type": "rejected"})],
+    ]
+    # Only the rejected items are sent again
+    assert ["item-1"] in bulk.requests and ["item-4"] in bulk.requests
+    assert len(bulk.requests) == 3 + 2 + 3
+    assert bulk.max_in_flight == 2
+    assert sorted(written) == sorted(item["id"] for item in make_items(9))
+
+
+@pytest.mark.asyncio
+async def test_streaming_bulk_applies_backpressure():
+    bulk = FakeBulk()
+    produced = []
+    written = []
+
+    async def produce():
+        for item in make_items(20):
+            produced.append(item["id"])
+            # Items are read ahead of the written chunks by at most the chunks in
+            # flight, the chunk being filled and the item starting the next one
+            assert len(produced) <= 2 * (len(written) + 2 + 1) + 1
+            yield item
+
+    async def after_chunk(items, success, errors):
+        written.append(items)
+
+    success, errors = await streaming_bulk_shared(
+        None,
+        bulk,
+        produce(),
+        prepare_actions,
+        BulkSettings(chunk_size=2, concurrency=2),
+        after_chunk=after_chunk,
+    )
+    assert success == 20 and errors == []
+    assert bulk.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_streaming_bulk_stops_on_error():
+    bulk = FakeBulk(failures={"item-0"})
+
+    success, errors = await streaming_bulk_shared(
+        None,
+        bulk,
+        make_items(10),
+        prepare_actions,
+        BulkSettings(chunk_size=2, concurrency=1),
+        stop_on_error=True,
+    )
+    assert (success, len(errors)) == (1, 1)
+    assert len(bulk.requests) == 1
+
+
+def test_bulk_settings_from_env(monkeypatch):
+    monkeypatch.setenv("BULK_CHUNK_SIZE", "100")
+    monkeypatch.setenv("BULK_CONCURRENCY", "0")
+    monkeypatch.setenv("BULK_INITIAL_BACKOFF", "invalid")
+    settings = BulkSettings.from_env()
+
+    assert settings.chunk_size == 100
+    assert settings.concurrency == 4
+    assert settings.initial_backoff == 0.5
+    assert settings.replace(chunk_size=10).chunk_size == 10
+    assert all(0 <= settings.backoff(10) <= settings.max_backoff for _ in range(10))
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.cache import (
+    QUERYABLES,
+    SEARCH,
+    FileInvalidationBackend,
+    InMemorySearchCacheBackend,
+    InvalidationBackend,
+    InvalidationBus,
+    QueryablesMappingCache,
+    SearchResultCache,
+)
+
+
+class DictInvalidationBackend(InvalidationBackend):
+    """Counters kept in a dict, standing in for an external store like Redis."""
+
+    def __init__(self):
+        self.versions = {}
+
+    async def bump(self, keys):
+        for key in keys:
+            self.versions[key] = self.versions.get(key, 0) + 1
+        return {key: self.versions[key] for key in keys}
+
+    async def get_versions(self):
+        return dict(self.versions)
+
+
+async def make_workers(backend, count=2):
+    """Create a bus per simulated worker, all sharing the backend."""
+    buses = [InvalidationBus(backend, poll_interval_seconds=0.01) for _ in range(count)]
+    for bus in buses:
+        await bus.poll()
+    return buses
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_backend", [True, False])
+async def test_invalidation_bus_notifies_other_workers(tmp_path, file_backend):
+    backend = (
+        FileInvalidationBackend(str(tmp_path / "versions.json"))
+        if file_backend
+        else DictInvalidationBackend()
+    )
+    first, second = await make_workers(backend)
+    received = ([], [])
+    first.subscribe(SEARCH, received[0].append)
+    second.subscribe(SEARCH, received[1].append)
+
+    await first.publish(SEARCH, ["a", "b"])
+    await first.publish(SEARCH, ["a"])
+    assert await second.poll() == 2
+    assert received[1] == [{"a", "b"}]
+    # A worker is not notified of its own invalidations
+    assert await first.poll() == 0
+    assert received[0] == []
+
+    await second.publish(SEARCH)
+    await first.poll()
+    assert received[0] == [None]
+    assert await second.poll() == 0
+
+
+@pytest.mark.asyncio
+async def test_file_invalidation_backend_counts_concurrent_bumps(tmp_path):
+    backend = FileInvalidationBackend(str(tmp_path / "versions.json"))
+    assert await backend.get_versions() == {}
+
+    await asyncio.gather(*(backend.bump([f"{SEARCH}:a"]) for _ in range(50)))
+    assert await backend.get_versions() == {f"{SEARCH}:a": 50}
+
+
+@pytest.mark.asyncio
+async def test_caches_are_invalidated_by_other_workers():
+    first, second = await make_workers(DictInvalidationBackend())
+    caches = [
+        QueryablesMappingCache(cache_ttl_seconds=60, invalidation_bus=bus)
+        for bus in (first, second)
+    ]
+    search_caches = [
+        SearchResultCache(
+            backend=InMemorySearchCacheBackend(),
+            ttl_seconds=60,
+            enabled=True,
+            invalidation_bus=bus,
+        )
+        for bus in (first, second)
+    ]
+
+    async def loader(collection_id):
+        return {"id": "id", "collection": "collection"}
+
+    for cache in caches:
+        await cache.get_mapping(["a"], loader)
+    for cache in search_caches:
+        await cache.set("key", ([{"id": "1"}], 1, None), ["a"], cache.generation)
+
+    caches[0].invalidate_for_item(
+        {"id": "1", "collection": "a", "properties": {"new": 1}}
+    )
+    await search_caches[0].invalidate(["a"])
+    await asyncio.sleep(0)
+    await second.poll()
+
+    assert "a" not in caches[1]._entries
+    assert await search_caches[1].get("key") is None
+
+    # Items whose fields are all mapped do not invalidate other workers
+    for cache in caches:
+        await cache.get_mapping(["a"], loader)
+    caches[0].invalidate_for_item({"id": "2", "collection": "a", "properties": {}})
+    await asyncio.sleep(0)
+    await second.poll()
+    assert "a" in caches[1]._entries
+    assert first._listeners[QUERYABLES] == [caches[0]._drop]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bus_polls_in_background():
+    first, second = await make_workers(DictInvalidationBackend())
+    received = asyncio.Event()
+    second.subscribe(SEARCH, lambda collection_ids: received.set())
+
+    second.start()
+    try:
+        await first.publish(SEARCH, ["a"])
+        await asyncio.wait_for(received.wait(), timeout=1)
+    finally:
+        await second.close()
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bus_publishes_from_threads_on_its_loop():
+    backend = DictInvalidationBackend()
+    first, second = await make_workers(backend)
+    threads = []
+    bump = backend.bump
+
+    async def record_thread(keys):
+        threads.append(threading.get_ident())
+        return await bump(keys)
+
+    backend.bump = record_thread
+    await asyncio.get_running_loop().run_in_executor(
+        None, first.publish_nowait, SEARCH, ["a"]
+    )
+    while not threads:
+        await asyncio.sleep(0.001)
+    assert threads == [threading.get_ident()]
+    assert await second.poll() == 1
+    assert await first.poll() == 0
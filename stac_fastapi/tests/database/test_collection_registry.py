@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.cache import CollectionRegistry, InvalidationBus
+
+from .test_cache_invalidation import DictInvalidationBackend, make_workers
+
+
+class CountingLoader:
+    """Existence check against a set of collections, counting the lookups."""
+
+    def __init__(self, collections):
+        self.collections = collections
+        self.calls = 0
+
+    async def __call__(self, collection_id):
+        self.calls += 1
+        await asyncio.sleep(0.001)
+        return collection_id in self.collections
+
+
+@pytest.mark.asyncio
+async def test_collection_registry_caches_existence(monkeypatch):
+    loader = CountingLoader({"a"})
+    registry = CollectionRegistry(
+        ttl_seconds=60, negative_ttl_seconds=60, invalidation_bus=InvalidationBus()
+    )
+
+    # Concurrent checks of an unknown collection share one lookup
+    assert (
+        await asyncio.gather(*(registry.exists("a", loader) for _ in range(50)))
+        == [True] * 50
+    )
+    assert not await registry.exists("b", loader)
+    assert await registry.exists("b", loader) is False
+    assert loader.calls == 2
+
+    # Collections written by this worker are known without a lookup
+    await registry.add("b")
+    await registry.remove("a")
+    assert await registry.exists("b", loader)
+    assert not await registry.exists("a", loader)
+    assert loader.calls == 2
+
+    # Entries expire
+    clock = [1000.0]
+    monkeypatch.setattr("time.monotonic", lambda: clock[0])
+    registry.populate(["a"])
+    registry.set("c", False)
+    assert registry.get("a") and registry.get("c") is False
+    clock[0] += 61
+    assert registry.get("a") is None and registry.get("c") is None
+
+    await registry.invalidate()
+    assert registry.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_collection_registry_drops_collections_of_other_workers():
+    first_bus, second_bus = await make_workers(DictInvalidationBackend())
+    first = CollectionRegistry(ttl_seconds=60, invalidation_bus=first_bus)
+    second = CollectionRegistry(ttl_seconds=60, invalidation_bus=second_bus)
+    second.populate(["a"])
+    second.set("b", False)
+
+    await first.add("b")
+    await first.remove("a")
+    assert await second_bus.poll() == 2
+    assert second.get("a") is None
+    assert second.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_collection_registry_disabled(monkeypatch):
+    loader = CountingLoader({"a"})
+    monkeypatch.setenv("COLLECTION_REGISTRY_TTL", "0")
+    monkeypatch.setenv("COLLECTION_REGISTRY_NEGATIVE_TTL", "invalid")
+    registry = CollectionRegistry(invalidation_bus=InvalidationBus())
+    assert not registry.enabled
+
+    registry.populate(["a"])
+    assert await registry.exists("a", loader)
+    assert await registry.exists("a", loader)
+    assert loader.calls == 2
+    assert registry._negative_ttl == 5
+
+    # Without a negative TTL, missing collections are looked up every time
+    registry = CollectionRegistry(
+        ttl_seconds=60, negative_ttl_seconds=0, invalidation_bus=InvalidationBus()
+    )
+    assert not await registry.exists("b", loader)
+    assert not await registry.exists("b", loader)
+    assert loader.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_collection_registry_ttl_without_shared_bus(monkeypatch):
+    monkeypatch.delenv("COLLECTION_REGISTRY_TTL", raising=False)
+    assert CollectionRegistry(invalidation_bus=InvalidationBus())._ttl == 10
+    first_bus, _ = await make_workers(DictInvalidationBackend())
+    assert CollectionRegistry(invalidation_bus=first_bus)._ttl == 300
+
+    # A read started before the collection was deleted does not record it again
+    registry = CollectionRegistry(
+        ttl_seconds=60, negative_ttl_seconds=5, invalidation_bus=InvalidationBus()
+    )
+    registry.populate(["a"])
+    await registry.remove("a")
+    registry.set("a", True)
+    assert registry.get("a") is False
+    await registry.add("a")
+    assert registry.get("a") is True
@@ -4,7 +4,11 @@ import uuid
 import pytest
 from stac_pydantic import api
 
-from stac_fastapi.sfeos_helpers.database import index_alias_by_collection_id
+from stac_fastapi.sfeos_helpers.database import (
+    get_bulk_conflicts,
+    index_alias_by_collection_id,
+    mk_actions,
+)
 from stac_fastapi.sfeos_helpers.mappings import (
     COLLECTIONS_INDEX,
     ES_COLLECTIONS_MAPPINGS,
@@ -46,3 +50,138 @@ async def test_index_mapping_items(txn_client, load_test_data):
         actual_mappings["dynamic_templates"] == ES_ITEMS_MAPPINGS["dynamic_templates"]
     )
     await txn_client.delete_collection(collection["id"])
+
+
+def test_get_number_matched_strategy(monkeypatch):
+    from stac_fastapi.sfeos_helpers.database import get_number_matched_strategy
+
+    monkeypatch.delenv("NUMBER_MATCHED_STRATEGY", raising=False)
+    assert get_number_matched_strategy() == "exact"
+    assert get_number_matched_strategy("Estimate") == "estimate"
+    assert get_number_matched_strategy("10000") == 10000
+
+    monkeypatch.setenv("NUMBER_MATCHED_STRATEGY", "none")
+    assert get_number_matched_strategy() == "none"
+    assert get_number_matched_strategy("exact") == "exact"
+
+    monkeypatch.setenv("NUMBER_MATCHED_STRATEGY", "-1")
+    assert get_number_matched_strategy() == "exact"
+
+    for invalid in ("0", "all", ""):
+        with pytest.raises(ValueError):
+            get_number_matched_strategy(invalid)
+
+
+def test_get_number_env(monkeypatch):
+    from stac_fastapi.core.utilities import get_number_env
+
+    assert get_number_env("TEST_NUMBER", 5) == 5
+    monkeypatch.setenv("TEST_NUMBER", "2.5")
+    assert get_number_env("TEST_NUMBER", 5, minimum=0, maximum=3) == 2.5
+    for invalid in ("-1", "nan", "ten"):
+        monkeypatch.setenv("TEST_NUMBER", invalid)
+        assert get_number_env("TEST_NUMBER", 5, minimum=0) == 5
+    monkeypatch.setenv("TEST_NUMBER", "0")
+    assert get_number_env("TEST_NUMBER", 5, minimum=0) == 0
+    assert get_number_env("TEST_NUMBER", 5, minimum=0, exclusive_minimum=True) == 5
+    monkeypatch.setenv("TEST_NUMBER", "4")
+    assert get_number_env("TEST_NUMBER", 1, minimum=0, maximum=3) == 1
+
+
+def test_build_source_filter():
+    from stac_fastapi.core.utilities import source_filtered_include
+    from stac_fastapi.sfeos_helpers.database import build_source_filter
+
+    assert build_source_filter() is None
+    assert build_source_filter({"properties.datetime"}, set()) == {
+        "includes": ["collection", "id", "properties.datetime"]
+    }
+    # Fields needed to build links are never excluded from `_source`
+    assert build_source_filter(set(), {"id", "assets.B1"}) == {
+        "excludes": ["assets.B1"]
+    }
+    assert build_source_filter(set(), {"collection"}) is None
+    # Wildcards are literal keys for the Fields extension, so they are not pushed down
+    assert build_source_filter({"properties.eo:*"}, {"assets.*"}) is None
+
+    assert source_filtered_include({"properties.datetime", "assets.B1", "id"}) == {
+        "properties",
+        "assets.B1",
+        "id",
+    }
+    assert source_filtered_include({"properties.eo:*"}) == {"properties.eo:*"}
+    assert source_filtered_include(None) == set()
+
+
+def test_build_source_filter_with_indexed_assets(monkeypatch):
+    from stac_fastapi.core.serializers import ItemSerializer
+    from stac_fastapi.core.utilities import filter_fields, source_filtered_include
+    from stac_fastapi.sfeos_helpers.database import build_source_filter
+
+    monkeypatch.setenv("STAC_INDEX_ASSETS", "true")
+    include = {"assets.B1", "item_assets.B1", "properties.datetime"}
+    exclude = {"assets.B2.roles", "properties.eo:bands"}
+    # Assets are stored as lists, so sub-paths are only filtered after fetching
+    assert build_source_filter(include, exclude) == {
+        "includes": [
+            "assets",
+            "collection",
+            "id",
+            "item_assets",
+            "properties.datetime",
+        ],
+        "excludes": ["properties.eo:bands"],
+    }
+
+    item = ItemSerializer.db_to_stac(
+        {
+            "id": "item",
+            "collection": "collection",
+            "properties": {"datetime": "2020-01-01T00:00:00Z"},
+            "assets": [
+                {"es_key": "B1", "href": "b1.tif"},
+                {"es_key": "B2", "href": "b2.tif"},
+            ],
+        },
+        base_url="http://test/",
+    )
+    filtered = filter_fields(item, source_filtered_include(include), exclude)
+    assert filtered["assets"] == {"B1": {"href": "b1.tif"}}
+
+
+@pytest.mark.asyncio
+async def test_execute_search_source_filtering(ctx):
+    search = database.make_search()
+    search = database.apply_ids_filter(search, [ctx.item["id"]])
+
+    items, _, _ = await database.execute_search(
+        search=search,
+        limit=10,
+        token=None,
+        sort=None,
+        collection_ids=[ctx.collection["id"]],
+        datetime_search={"gte": None, "lte": None},
+        include={"properties.datetime"},
+        exclude={"collection"},
+    )
+    items = list(items)
+    assert len(items) == 1
+    assert items[0] == {
+        "id": ctx.item["id"],
+        "collection": ctx.collection["id"],
+        "properties": {"datetime": ctx.item["properties"]["datetime"]},
+    }
+
+
+def test_bulk_create_actions_and_conflicts():
+    items = [{"id": "a", "collection": "c"}, {"id": "b|x", "collection": "c"}]
+    assert {action["_op_type"] for action in mk_actions("c", items)} == {"index"}
+    actions = mk_actions("c", items, exist_ok=False)
+    assert [action["_op_type"] for action in actions] == ["create", "create"]
+
+    errors = [
+        {"create": {"_id": "a|c", "status": 409, "error": {}}},
+        {"create": {"_id": "b|x|c", "status": 409, "error": {}}},
+        {"create": {"_id": "d|c", "status": 400, "error": {}}},
+    ]
+    assert get_bulk_conflicts(errors) == ["a", "b|x"]
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.search_engine.selection import (
+    IndexAliasLoader,
+    IndexCacheManager,
+)
+
+
+class AliasClient:
+    """Client returning the aliases of `self.aliases`, once `self.release` is set."""
+
+    def __init__(self):
+        self.aliases = {"items_test": ["items_test_2020-01-01"]}
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+        self.indices = self
+
+    async def get_alias(self, index):
+        self.calls += 1
+        aliases = {base: [base, *aliases] for base, aliases in self.aliases.items()}
+        await self.release.wait()
+        return {
+            f"index-{i}": {"aliases": {alias: {} for alias in names}}
+            for i, names in enumerate(aliases.values())
+        }
+
+
+async def settle():
+    """Let the scheduled tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_alias_cache_loads_once_for_concurrent_reads():
+    client = AliasClient()
+    loader = IndexAliasLoader(client, IndexCacheManager())
+
+    results = await asyncio.gather(
+        *(loader.get_collection_indexes("test") for _ in range(20))
+    )
+    assert results == [["items_test_2020-01-01"]] * 20
+    assert client.calls == 1
+
+    # Readers share the snapshot instead of copying it
+    assert await loader.get_aliases() is await loader.get_aliases()
+
+
+@pytest.mark.asyncio
+async def test_alias_cache_serves_stale_snapshot_while_reloading():
+    client = AliasClient()
+    cache_manager = IndexCacheManager(cache_ttl_seconds=0)
+    loader = IndexAliasLoader(client, cache_manager)
+    await loader.get_aliases()
+
+    client.release.clear()
+    client.aliases = {"items_test": ["items_test_2020-01-01", "items_test_2021"]}
+
+    # Expired, the stale snapshot is returned without waiting for the reload
+    for _ in range(5):
+        assert await loader.get_collection_indexes("test") == ["items_test_2020-01-01"]
+    await settle()
+    assert client.calls == 2
+
+    client.release.set()
+    await settle()
+    assert cache_manager.snapshot.aliases["items_test"] == (
+        "items_test_2020-01-01",
+        "items_test_2021",
+    )
+
+
+@pytest.mark.asyncio
+async def test_alias_cache_refresh_waits_for_a_new_load():
+    client = AliasClient()
+    cache_manager = IndexCacheManager(cache_ttl_seconds=0)
+    loader = IndexAliasLoader(client, cache_manager)
+    await loader.get_aliases()
+
+    # A background reload starts before the aliases change
+    client.release.clear()
+    await loader.get_aliases()
+    await settle()
+    assert client.calls == 2
+    client.aliases = {"items_test": ["items_test_2020-01-01", "items_test_2021"]}
+
+    refresh = asyncio.ensure_future(loader.refresh_aliases())
+    await settle()
+    assert client.calls == 3
+    client.release.set()
+    assert (await refresh)["items_test"] == ["items_test_2020-01-01", "items_test_2021"]
+
+    # The older background reload does not overwrite the refreshed snapshot
+    await settle()
+    assert await loader.get_collection_indexes("test") == [
+        "items_test_2020-01-01",
+        "items_test_2021",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_alias_cache_keeps_snapshot_when_reload_fails():
+    client = AliasClient()
+    loader = IndexAliasLoader(client, IndexCacheManager())
+    await loader.get_aliases()
+
+    async def fail(index):
+        raise ConnectionError("unavailable")
+
+    client.get_alias = fail
+    loader.cache_manager.invalidate()
+    assert await loader.get_collection_indexes("test") == ["items_test_2020-01-01"]
+    await settle()
+    assert await loader.get_collection_indexes("test") == ["items_test_2020-01-01"]
+
+    with pytest.raises(ConnectionError):
+        await loader.refresh_aliases()
@@ -0,0 +1,102 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import (
+    IndexIntervals,
+    filter_indexes_by_datetime,
+    index_date_range,
+)
+from stac_fastapi.sfeos_helpers.search_engine.selection import (
+    IndexAliasLoader,
+    IndexCacheManager,
+)
+
+
+def test_index_date_range():
+    assert index_date_range("items_test_2020-01-01-2020-01-31") == (
+        date(2020, 1, 1),
+        date(2020, 1, 31),
+    )
+    assert index_date_range("items_test_2020-02-01") == (date(2020, 2, 1), date.max)
+    assert index_date_range("items_test") == (date.min, date.max)
+
+
+def test_index_intervals_select_matches_filter_indexes_by_datetime():
+    indexes = []
+    start = date(2020, 1, 1)
+    for _ in range(50):
+        end = start + timedelta(days=random.randint(0, 60))
+        indexes.append(f"items_test_{start}-{end}")
+        start = end + timedelta(days=1)
+    indexes.append(f"items_test_{start}")
+    # Overlapping ranges are selected too
+    indexes.append("items_test_2020-03-01-2022-01-01")
+    random.shuffle(indexes)
+
+    intervals = IndexIntervals(indexes)
+    assert len(intervals) == len(indexes)
+
+    bounds = [None] + [
+        f"{date(2019, 12, 1) + timedelta(days=days)}T12:00:00Z"
+        for days in range(0, 3000, 37)
+    ]
+    for _ in range(200):
+        gte, lte = random.choice(bounds), random.choice(bounds)
+        assert sorted(intervals.select(gte, lte)) == sorted(
+            filter_indexes_by_datetime(indexes, gte, lte)
+        )
+
+
+@pytest.mark.asyncio
+async def test_alias_loader_parses_intervals_once_per_refresh():
+    class Indices:
+        calls = 0
+
+        async def get_alias(self, index):
+            self.calls += 1
+            return {
+                "index-1": {
+                    "aliases": {
+                        "items_test": {},
+                        "items_test_2020-01-01-2020-01-31": {},
+                    }
+                },
+                "index-2": {"aliases": {"items_test": {}, "items_test_2020-02-01": {}}},
+            }
+
+    class Client:
+        indices = Indices()
+
+    loader = IndexAliasLoader(Client(), IndexCacheManager())
+    intervals = await loader.get_collection_intervals("test")
+    assert intervals.select("2020-02-10T00:00:00Z", None) == ["items_test_2020-02-01"]
+    assert await loader.get_collection_intervals("test") is intervals
+    assert Client.indices.calls == 1
+
+    assert len(await loader.get_collection_intervals("missing")) == 0
+
+
+def test_index_intervals_assign_matches_select():
+    indexes = [
+        "items_test_2020-01-01-2020-01-31",
+        "items_test_2020-02-01-2020-02-14",
+        "items_test_2020-02-15-2020-03-31",
+        "items_test_2020-04-01",
+    ]
+    intervals = IndexIntervals(reversed(indexes))
+    dates = sorted(
+        date(2020, 1, 1) + timedelta(days=random.randint(0, 400)) for _ in range(500)
+    )
+
+    assigned = intervals.assign(dates)
+    assert len(assigned) == len(dates)
+    for day, index in zip(dates, assigned):
+        assert intervals.select(str(day), str(day)) == [index]
+
+    # Dates before the first index go to the first index
+    assert intervals.assign([date(2019, 1, 1)]) == [indexes[0]]
+    assert intervals.assign([]) == []
+    with pytest.raises(ValueError):
+        IndexIntervals(()).assign([date(2020, 1, 1)])
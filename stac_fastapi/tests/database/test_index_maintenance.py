@@ -0,0 +1,85 @@
+import pytest
+
+from stac_fastapi.sfeos_helpers.search_engine import (
+    DatetimeBasedIndexSelector,
+    DatetimeIndexInserter,
+    IndexMaintenance,
+    IndexOperations,
+    SimpleIndexInserter,
+)
+
+
+@pytest.fixture
+def partition_client(indices_client, monkeypatch):
+    monkeypatch.setenv("DATETIME_INDEX_MAX_SIZE_GB", "10")
+    return indices_client(
+        {
+            "index-a": ["items_small", "items_small_2020-01-01"],
+            "index-b": ["items_big", "items_big_2019-01-01-2019-12-31"],
+            "index-c": ["items_big", "items_big_2020-01-01"],
+        },
+        {"index-a": 1e9, "index-b": 10e9, "index-c": 9.5e9},
+    )
+
+
+@pytest.mark.asyncio
+async def test_index_maintenance_rolls_over_indexes_close_to_limit(partition_client):
+    maintenance = IndexMaintenance(
+        DatetimeIndexInserter(partition_client, IndexOperations()),
+        interval_seconds=60,
+        rollover_threshold=0.9,
+    )
+    assert maintenance.enabled
+
+    assert await maintenance.run_once() == ["items_big_2020-03-05"]
+    assert partition_client.aliases["index-c"] == [
+        "items_big",
+        "items_big_2020-01-01-2020-03-04",
+    ]
+    assert partition_client.aliases["index-a"] == [
+        "items_small",
+        "items_small_2020-01-01",
+    ]
+    # Items written since the last refresh are accounted for
+    assert partition_client.refreshes == ["items_big_2020-01-01"]
+
+    # The aliases cache is refreshed, the new index is empty
+    assert await maintenance.run_once() == []
+    selector = DatetimeBasedIndexSelector(partition_client)
+    assert await selector.select_indexes(["big"], {"gte": "2020-03-05"}) == (
+        "items_big_2020-03-05"
+    )
+
+
+class ActiveIngestMode:
+    """Ingest mode holding every collection."""
+
+    async def status(self, collection_id):
+        return {"collection_id": collection_id, "active": True}
+
+
+@pytest.mark.asyncio
+async def test_index_maintenance_skips_collections_in_ingest_mode(partition_client):
+    maintenance = IndexMaintenance(
+        DatetimeIndexInserter(partition_client, IndexOperations()),
+        interval_seconds=60,
+        rollover_threshold=0.9,
+        ingest_mode=ActiveIngestMode(),
+    )
+
+    assert await maintenance.run_once() == []
+    assert partition_client.aliases["index-c"] == ["items_big", "items_big_2020-01-01"]
+
+
+def test_index_maintenance_disabled(partition_client, monkeypatch):
+    inserter = DatetimeIndexInserter(partition_client, IndexOperations())
+    assert not IndexMaintenance(inserter, interval_seconds=0).enabled
+    assert not IndexMaintenance(
+        SimpleIndexInserter(IndexOperations(), partition_client)
+    ).enabled
+
+    monkeypatch.setenv("DATETIME_INDEX_MAINTENANCE_INTERVAL", "invalid")
+    monkeypatch.setenv("DATETIME_INDEX_ROLLOVER_THRESHOLD", "2")
+    maintenance = IndexMaintenance(inserter)
+    assert maintenance.interval == 300
+    assert maintenance.rollover_threshold == 0.9
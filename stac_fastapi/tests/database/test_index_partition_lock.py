@@ -0,0 +1,170 @@
+import asyncio
+from copy import deepcopy
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.search_engine import (
+    DatetimeBasedIndexSelector,
+    DatetimeIndexInserter,
+    IndexOperations,
+)
+
+
+def make_item(day):
+    return {
+        "id": f"item-{day}",
+        "collection": "new-collection",
+        "properties": {"datetime": f"2020-02-{day:02d}T12:00:00Z"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_writes_create_one_partition(indices_client):
+    client = indices_client(delay=0.001)
+    inserter = DatetimeIndexInserter(client, IndexOperations())
+
+    targets = await asyncio.gather(
+        *(
+            inserter._get_target_index_internal(
+                DatetimeBasedIndexSelector(client),
+                "new-collection",
+                make_item(10),
+                check_size=False,
+            )
+            for _ in range(200)
+        )
+    )
+    assert client.creates == 1
+    assert set(targets) == {"items_new-collection_2020-02-10"}
+
+    # Earlier items rename the first partition once
+    targets = await asyncio.gather(
+        *(
+            inserter._get_target_index_internal(
+                DatetimeBasedIndexSelector(client),
+                "new-collection",
+                make_item(day),
+                check_size=False,
+            )
+            for day in [1, 2, 3] * 20
+        )
+    )
+    assert client.creates == 1
+    assert client.alias_updates == 1
+    assert set(targets) == {"items_new-collection_2020-02-01"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_bulk_writes_create_one_partition(
+    indices_client, monkeypatch
+):
+    monkeypatch.setenv("DATETIME_INDEX_MAX_SIZE_GB", "10")
+    client = indices_client(delay=0.001)
+    inserter = DatetimeIndexInserter(client, IndexOperations())
+
+    async def get_size(index_name):
+        return 0
+
+    monkeypatch.setattr(
+        inserter.datetime_manager.size_manager, "get_index_size_in_gb", get_size
+    )
+
+    actions = await asyncio.gather(
+        *(
+            inserter.prepare_bulk_actions(
+                "new-collection", deepcopy([make_item(10), make_item(11)])
+            )
+            for _ in range(200)
+        )
+    )
+    assert client.creates == 1
+    assert {action["_index"] for batch in actions for action in batch} == {
+        "items_new-collection_2020-02-10"
+    }
+
+
+def make_workers(client, monkeypatch):
+    """Get an inserter and an alias cache per worker, sharing the client."""
+    workers = []
+    for _ in range(2):
+        monkeypatch.setattr(DatetimeBasedIndexSelector, "_instance", None)
+        workers.append(
+            (
+                DatetimeIndexInserter(client, IndexOperations()),
+                DatetimeBasedIndexSelector(client),
+            )
+        )
+    return workers
+
+
+@pytest.mark.asyncio
+async def test_workers_creating_the_first_partition_reuse_it(
+    indices_client, monkeypatch
+):
+    client = indices_client(delay=0.001)
+    workers = make_workers(client, monkeypatch)
+
+    targets = await asyncio.gather(
+        *(
+            inserter._get_target_index_internal(
+                selector, "new-collection", make_item(day), check_size=False
+            )
+            for (inserter, selector), day in zip(workers, [10, 5])
+        )
+    )
+    assert client.creates == 2
+    assert list(client.aliases.values()) == [
+        ["items_new-collection", "items_new-collection_2020-02-05"]
+    ]
+    # The partition of the first worker was renamed for the earlier item since
+    assert targets[0] in (
+        "items_new-collection_2020-02-10",
+        "items_new-collection_2020-02-05",
+    )
+    assert targets[1] == "items_new-collection_2020-02-05"
+
+
+@pytest.mark.asyncio
+async def test_workers_rolling_over_a_partition_create_one(indices_client, monkeypatch):
+    client = indices_client(delay=0.001)
+    client.aliases["index-a"] = [
+        "items_new-collection",
+        "items_new-collection_2020-01-01",
+    ]
+    workers = make_workers(client, monkeypatch)
+
+    created = await asyncio.gather(
+        *(
+            inserter.datetime_manager.rollover_index(
+                "new-collection", "items_new-collection_2020-01-01"
+            )
+            for inserter, _ in workers
+        )
+    )
+    assert created == ["items_new-collection_2020-03-05"] * 2
+    assert sorted(client.aliases.values()) == [
+        ["items_new-collection", "items_new-collection_2020-01-01-2020-03-04"],
+        ["items_new-collection", "items_new-collection_2020-03-05"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_existing_partition_without_aliases_is_reattached(indices_client):
+    client = indices_client()
+    operations = IndexOperations()
+    index_name = operations.create_index_name(
+        "new-collection", "items_new-collection_2020-01-01"
+    )
+    client.aliases[index_name] = []
+
+    alias = await operations.create_datetime_index(
+        client,
+        "new-collection",
+        "2020-03-05",
+        previous_alias="items_new-collection_2020-01-01",
+    )
+    assert alias == "items_new-collection_2020-03-05"
+    assert client.aliases[index_name] == [
+        "items_new-collection",
+        "items_new-collection_2020-03-05",
+    ]
@@ -0,0 +1,74 @@
+import pytest
+
+from stac_fastapi.sfeos_helpers.search_engine.managers import IndexSizeManager
+
+
+class StatsClient:
+    """Client returning `self.size` as the size of every index."""
+
+    def __init__(self, size):
+        self.size = size
+        self.calls = 0
+        self.indices = self
+
+    async def stats(self, index):
+        self.calls += 1
+        return {"_all": {"primaries": {"store": {"size_in_bytes": self.size}}}}
+
+
+@pytest.fixture
+def size_manager(monkeypatch):
+    monkeypatch.setenv("DATETIME_INDEX_MAX_SIZE_GB", "10")
+    monkeypatch.delenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", raising=False)
+    return IndexSizeManager(StatsClient(2e9))
+
+
+@pytest.mark.asyncio
+async def test_index_size_is_estimated_between_stats(size_manager):
+    client = size_manager.client
+
+    assert not await size_manager.is_index_oversized("index")
+    assert client.calls == 1
+
+    # Written bytes are added to the last read size, until half of the room is used
+    size_manager.record_write("index", 3e9)
+    assert await size_manager.get_estimated_size_in_gb("index") == 5
+    assert client.calls == 1
+
+    client.size = 9e9
+    size_manager.record_write("index", 1e9)
+    assert await size_manager.get_estimated_size_in_gb("index") == 9
+    assert client.calls == 2
+
+    # Close to the limit, the size is read again after a smaller write
+    client.size = 11e9
+    size_manager.record_write("index", 0.5e9)
+    assert await size_manager.is_index_oversized("index")
+    assert client.calls == 3
+
+    # Writes to indexes never read are ignored
+    client.size = 2e9
+    size_manager.record_write("other", 1e12)
+    assert not await size_manager.is_index_oversized("other")
+
+
+@pytest.mark.asyncio
+async def test_index_size_is_read_again_after_interval(size_manager, monkeypatch):
+    client = size_manager.client
+
+    await size_manager.is_index_oversized("index")
+    await size_manager.is_index_oversized("index")
+    assert client.calls == 1
+
+    monkeypatch.setenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", "0")
+    await size_manager.is_index_oversized("index")
+    await size_manager.is_index_oversized("index")
+    assert client.calls == 3
+
+    monkeypatch.setenv("DATETIME_INDEX_SIZE_CHECK_INTERVAL", "invalid")
+    await size_manager.is_index_oversized("index")
+    assert client.calls == 3
+
+    size_manager.forget("index")
+    await size_manager.is_index_oversized("index")
+    assert client.calls == 4
@@ -0,0 +1,176 @@
+import asyncio
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import index_alias_by_collection_id
+from stac_fastapi.sfeos_helpers.search_engine import IngestMode
+from stac_fastapi.sfeos_helpers.search_engine import ingest_mode as ingest_mode_module
+
+
+class SettingsClient:
+    """Client holding the settings and mapping `_meta` of item indexes in memory."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.meta = {}
+        self.indices = self
+        self.calls = []
+        self.fail_forcemerge = False
+
+    async def get_settings(self, index):
+        assert index == index_alias_by_collection_id("test")
+        return {
+            name: {"settings": {"index": dict(settings)}}
+            for name, settings in self.settings.items()
+        }
+
+    async def get_mapping(self, index, filter_path, **kwargs):
+        assert filter_path == "*.mappings._meta"
+        return {
+            name: {"mappings": {"_meta": dict(meta)}}
+            for name, meta in self.meta.items()
+            if meta
+        }
+
+    async def put_mapping(self, index, body):
+        self.meta[index] = body["_meta"]
+
+    async def put_settings(self, index, body):
+        self.calls.append(("put_settings", index))
+        for name in index.split(","):
+            for key, value in body["index"].items():
+                if value is None:
+                    self.settings[name].pop(key, None)
+                else:
+                    self.settings[name][key] = str(value)
+
+    async def refresh(self, index):
+        self.calls.append(("refresh", index))
+
+    async def forcemerge(self, index):
+        self.calls.append(("forcemerge", index))
+        if self.fail_forcemerge:
+            raise TimeoutError("forcemerge timed out")
+
+
+@pytest.mark.asyncio
+async def test_ingest_mode_suspends_and_restores_settings(monkeypatch):
+    client = SettingsClient(
+        {
+            "index-a": {"refresh_interval": "30s", "number_of_replicas": "1"},
+            "index-b": {"number_of_replicas": "2"},
+        }
+    )
+    client.meta["index-a"] = {"owner": "someone"}
+    original = {name: dict(settings) for name, settings in client.settings.items()}
+    ingest_mode = IngestMode(client, timeout=60)
+
+    async with ingest_mode.session("test"):
+        assert ingest_mode.is_active("test")
+        assert all(
+            settings == {"refresh_interval": "-1", "number_of_replicas": "0"}
+            for settings in client.settings.values()
+        )
+        assert client.meta["index-a"]["owner"] == "someone"
+
+        # An index created while loading, e.g. by a rollover, is suspended too
+        client.settings["index-c"] = {
+            "refresh_interval": "1s",
+            "number_of_replicas": "1",
+        }
+        await ingest_mode.track("test")
+        assert client.settings["index-c"]["refresh_interval"] == "1s"
+        monkeypatch.setattr(ingest_mode_module, "TRACK_INTERVAL", 0)
+        await ingest_mode.track("test")
+        assert client.settings["index-c"]["refresh_interval"] == "-1"
+        assert (await ingest_mode.status("test"))["indexes"] == [
+            "index-a",
+            "index-b",
+            "index-c",
+        ]
+
+    original["index-c"] = {"refresh_interval": "1s", "number_of_replicas": "1"}
+    assert client.settings == original
+    assert client.meta["index-a"] == {"owner": "someone"}
+    assert not ingest_mode.is_active("test")
+    alias = index_alias_by_collection_id("test")
+    assert client.calls[-2:] == [("refresh", alias), ("forcemerge", alias)]
+
+
+@pytest.mark.asyncio
+async def test_ingest_mode_is_shared_by_workers(monkeypatch):
+    monkeypatch.setattr(ingest_mode_module, "TRACK_INTERVAL", 0)
+    client = SettingsClient({"index-a": {"number_of_replicas": "1"}})
+    worker_a = IngestMode(client, timeout=60)
+    worker_b = IngestMode(client, timeout=60)
+
+    await worker_a.enter("test")
+    status = await worker_b.status("test")
+    assert status["active"] and status["indexes"] == ["index-a"]
+    assert worker_b.is_active("test")
+
+    # Left through another worker, noticed by the first one on its next write
+    assert not (await worker_b.exit("test"))["active"]
+    assert client.settings == {"index-a": {"number_of_replicas": "1"}}
+    assert worker_a.is_active("test")
+    await worker_a.track("test")
+    assert not worker_a.is_active("test")
+    await worker_a.close()
+
+
+@pytest.mark.asyncio
+async def test_ingest_mode_restored_after_worker_stopped():
+    client = SettingsClient({"index-a": {"number_of_replicas": "1"}})
+    worker = IngestMode(client, timeout=60)
+    await worker.enter("test", timeout=0.01)
+    # The worker stops before the timeout, leaving the indexes suspended
+    await worker.close()
+    await asyncio.sleep(0.05)
+    assert client.settings == {
+        "index-a": {"refresh_interval": "-1", "number_of_replicas": "0"}
+    }
+
+    await IngestMode(client, timeout=60).recover()
+    assert client.settings == {"index-a": {"number_of_replicas": "1"}}
+    assert client.meta["index-a"] == {}
+
+
+@pytest.mark.asyncio
+async def test_ingest_mode_times_out():
+    client = SettingsClient({"index-a": {"number_of_replicas": "1"}})
+    ingest_mode = IngestMode(client, timeout=60)
+
+    status = await ingest_mode.enter("test", timeout=0.01)
+    assert status["active"] and status["expires_at"]
+    await asyncio.sleep(0.05)
+
+    assert not ingest_mode.is_active("test")
+    assert client.settings == {"index-a": {"number_of_replicas": "1"}}
+
+    # Entering again extends the timeout without suspending the indexes twice
+    await ingest_mode.enter("test")
+    await ingest_mode.enter("test")
+    assert [call for call, _ in client.calls].count("put_settings") == 3
+    await ingest_mode.close()
+    assert (await ingest_mode.status("test"))["active"]
+    await ingest_mode.exit("test")
+    assert client.settings == {"index-a": {"number_of_replicas": "1"}}
+
+
+@pytest.mark.asyncio
+async def test_ingest_mode_left_when_forcemerge_fails():
+    client = SettingsClient({"index-a": {"number_of_replicas": "1"}})
+    client.fail_forcemerge = True
+    ingest_mode = IngestMode(client, timeout=60)
+
+    await ingest_mode.enter("test")
+    assert not (await ingest_mode.exit("test"))["active"]
+    assert not ingest_mode.is_active("test")
+    assert client.settings == {"index-a": {"number_of_replicas": "1"}}
+
+
+def test_ingest_mode_timeout_from_env(monkeypatch):
+    monkeypatch.setenv("INGEST_MODE_TIMEOUT", "-1")
+    assert IngestMode(None).timeout == 3600
+    monkeypatch.setenv("INGEST_MODE_TIMEOUT", "120")
+    assert IngestMode(None).timeout == 120
@@ -0,0 +1,30 @@
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import (
+    decode_pagination_token,
+    encode_pagination_token,
+    get_pit_keep_alive,
+)
+from stac_fastapi.sfeos_helpers.database.pit import keep_alive_to_seconds
+
+
+def test_pagination_token_round_trip():
+    sort_values = [1577836800000, "item-1", "collection-1"]
+
+    legacy_token = encode_pagination_token(sort_values)
+    assert decode_pagination_token(legacy_token) == (sort_values, None, None)
+
+    pit_token = encode_pagination_token(sort_values, "pit-id", "1m")
+    assert decode_pagination_token(pit_token) == (sort_values, "pit-id", "1m")
+
+
+def test_pit_keep_alive(monkeypatch):
+    assert keep_alive_to_seconds("90s") == 90
+    assert keep_alive_to_seconds("2m") == 120
+    with pytest.raises(ValueError):
+        keep_alive_to_seconds("forever")
+
+    monkeypatch.setenv("PIT_KEEP_ALIVE", "5m")
+    assert get_pit_keep_alive() == "5m"
+    monkeypatch.setenv("PIT_KEEP_ALIVE", "five minutes")
+    assert get_pit_keep_alive() == "1m"
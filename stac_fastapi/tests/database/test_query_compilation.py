@@ -0,0 +1,156 @@
+import pytest
+
+from stac_fastapi.sfeos_helpers.database.query import compile_query
+
+from ..conftest import database
+
+
+def test_compile_query_empty():
+    assert compile_query(None) is None
+    assert compile_query({}) is None
+    assert compile_query({"match_all": {}}) is None
+    assert compile_query({"bool": {"must": [{"match_all": {}}]}}) is None
+
+
+def test_compile_query_moves_clauses_to_filter_context():
+    query = {"query_string": {"query": 'properties.\\*:"foo"'}}
+    assert compile_query(query) == {"bool": {"filter": [query]}}
+
+    compiled = compile_query(
+        {
+            "bool": {
+                "must": [{"term": {"a": 1}}, {"bool": {"must": [{"term": {"b": 1}}]}}],
+                "filter": [{"bool": {"filter": [{"term": {"c": 1}}]}}],
+            }
+        }
+    )
+    assert compiled == {
+        "bool": {"filter": [{"term": {"a": 1}}, {"term": {"b": 1}}, {"term": {"c": 1}}]}
+    }
+
+
+def test_compile_query_keeps_disjunctions_in_filter_context():
+    should = [{"term": {"a": 1}}, {"term": {"b": 1}}]
+    compiled = compile_query(
+        {
+            "bool": {
+                "filter": [{"term": {"c": 1}}],
+                "should": [
+                    {"bool": {"should": should, "minimum_should_match": 1}},
+                ],
+                "minimum_should_match": 1,
+            }
+        }
+    )
+    assert compiled == {
+        "bool": {
+            "filter": [
+                {"term": {"c": 1}},
+                {"bool": {"should": should, "minimum_should_match": 1}},
+            ]
+        }
+    }
+
+    # Without a minimum, should clauses next to a filter only affect the score
+    assert compile_query(
+        {"bool": {"filter": [{"term": {"c": 1}}], "should": should}}
+    ) == {"bool": {"filter": [{"term": {"c": 1}}]}}
+
+
+def test_compile_query_negations():
+    should = [{"term": {"a": 1}}, {"term": {"b": 1}}]
+    assert compile_query({"bool": {"must_not": [{"bool": {"should": should}}]}}) == {
+        "bool": {"must_not": should}
+    }
+    assert compile_query(
+        {"bool": {"must_not": [{"bool": {"filter": [{"term": {"a": 1}}]}}]}}
+    ) == {"bool": {"must_not": [{"term": {"a": 1}}]}}
+
+
+def test_compile_query_merges_ranges_and_duplicates():
+    terms = {"terms": {"collection": ["a"]}}
+    compiled = compile_query(
+        {
+            "bool": {
+                "filter": [
+                    terms,
+                    {"range": {"properties.eo:cloud_cover": {"gte": 10}}},
+                    {"range": {"properties.eo:cloud_cover": {"lte": 50}}},
+                    {"range": {"properties.gsd": {"gt": 1}}},
+                    {"range": {"properties.gsd": {"gt": 2}}},
+                    terms,
+                ]
+            }
+        }
+    )
+    assert compiled == {
+        "bool": {
+            "filter": [
+                terms,
+                {"range": {"properties.eo:cloud_cover": {"gte": 10, "lte": 50}}},
+                {"range": {"properties.gsd": {"gt": 1}}},
+                {"range": {"properties.gsd": {"gt": 2}}},
+            ]
+        }
+    }
+
+    # Ranges with different options are not merged
+    ranges = [
+        {"range": {"properties.datetime": {"gte": "2020", "format": "yyyy"}}},
+        {"range": {"properties.datetime": {"lte": "2021-01-01"}}},
+    ]
+    assert compile_query({"bool": {"filter": ranges}}) == {"bool": {"filter": ranges}}
+
+
+def test_compile_query_does_not_modify_input():
+    query = {
+        "bool": {
+            "must": [{"bool": {"filter": [{"term": {"a": 1}}]}}],
+            "filter": [{"range": {"x": {"gte": 1}}}, {"range": {"x": {"lte": 2}}}],
+        }
+    }
+    expected = {
+        "bool": {
+            "must": [{"bool": {"filter": [{"term": {"a": 1}}]}}],
+            "filter": [{"range": {"x": {"gte": 1}}}, {"range": {"x": {"lte": 2}}}],
+        }
+    }
+    compile_query(query)
+    assert query == expected
+
+
+def test_compile_query_for_search_filters():
+    search = database.make_search()
+    search = database.apply_collections_filter(search, ["a", "b"])
+    search = database.apply_stacql_filter(
+        search, op="gte", field="properties__eo:cloud_cover", value=10
+    )
+    search = database.apply_stacql_filter(
+        search, op="lte", field="properties__eo:cloud_cover", value=50
+    )
+    search = database.apply_free_text_filter(search, ["foo"])
+
+    compiled = compile_query(search.query.to_dict())
+    assert list(compiled["bool"]) == ["filter"]
+    assert {"range": {"properties.eo:cloud_cover": {"gte": 10, "lte": 50}}} in (
+        compiled["bool"]["filter"]
+    )
+    assert len(compiled["bool"]["filter"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_search_debug_returns_compiled_query(app_client, ctx, monkeypatch):
+    monkeypatch.setenv("ENABLE_SEARCH_DEBUG", "true")
+
+    resp = await app_client.get(
+        "/search", params={"collections": ctx.collection["id"], "debug": "true"}
+    )
+    assert resp.status_code == 200
+    debug = resp.json()["debug"]
+    assert list(debug["query"]["bool"]) == ["filter"]
+    assert debug["index"]
+    assert debug["sort"]
+
+    monkeypatch.delenv("ENABLE_SEARCH_DEBUG")
+    resp = await app_client.get("/search", params={"debug": "true"})
+    assert "debug" not in resp.json()
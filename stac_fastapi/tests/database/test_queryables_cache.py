@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.cache import QueryablesMappingCache
+
+
+class MappingLoader:
+    def __init__(self, mappings):
+        self.mappings = mappings
+        self.calls = []
+
+    async def __call__(self, collection_id):
+        self.calls.append(collection_id)
+        await asyncio.sleep(0)
+        return dict(self.mappings.get(collection_id, {}))
+
+
+@pytest.fixture
+def loader():
+    return MappingLoader(
+        {
+            "*": {
+                "id": "id",
+                "collection": "collection",
+                "cloud": "properties.cloud",
+                "gsd": "properties.gsd",
+            },
+            "a": {"id": "id", "collection": "collection", "cloud": "properties.cloud"},
+            "b": {"id": "id", "collection": "collection", "gsd": "properties.gsd"},
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_queryables_cache_loads_only_requested_collections(loader):
+    cache = QueryablesMappingCache(cache_ttl_seconds=60)
+
+    mapping = await cache.get_mapping(["a", "b"], loader)
+    assert mapping == loader.mappings["*"]
+    assert loader.calls == ["a", "b"]
+
+    await cache.get_mapping(["a"], loader)
+    await cache.get_mapping(None, loader)
+    assert loader.calls == ["a", "b", "*"]
+
+
+@pytest.mark.asyncio
+async def test_queryables_cache_coalesces_concurrent_misses(loader):
+    cache = QueryablesMappingCache(cache_ttl_seconds=60)
+
+    await asyncio.gather(*(cache.get_mapping(["a"], loader) for _ in range(10)))
+    assert loader.calls == ["a"]
+    # Locks do not outlive the loads
+    assert len(cache._locks) == 0
+
+
+@pytest.mark.asyncio
+async def test_queryables_cache_disabled_and_expired(loader, monkeypatch):
+    cache = QueryablesMappingCache(cache_ttl_seconds=0)
+    await cache.get_mapping(["a"], loader)
+    await cache.get_mapping(["a"], loader)
+    assert loader.calls == ["a", "a"]
+
+    monkeypatch.setenv("QUERYABLES_CACHE_TTL", "not-a-number")
+    cache = QueryablesMappingCache()
+    assert cache.enabled
+
+    cache = QueryablesMappingCache(cache_ttl_seconds=60)
+    await cache.get_mapping(["b"], loader)
+    timestamp, mapping = cache._entries["b"]
+    cache._entries["b"] = (timestamp - 61, mapping)
+    await cache.get_mapping(["b"], loader)
+    assert loader.calls == ["a", "a", "b", "b"]
+
+
+@pytest.mark.asyncio
+async def test_queryables_cache_invalidation(loader):
+    cache = QueryablesMappingCache(cache_ttl_seconds=60)
+    await cache.get_mapping(["a", "b"], loader)
+    await cache.get_mapping(None, loader)
+
+    # Known fields leave the cached mappings untouched
+    cache.invalidate_for_item(
+        {"id": "x", "collection": "a", "properties": {"cloud": 1, "gsd": None}}
+    )
+    assert set(cache._entries) == {"a", "b", "*"}
+
+    # An unknown property drops the collection entry and the catalog-wide entry
+    cache.invalidate_for_items(
+        [{"id": "y", "collection": "a", "properties": {"platform": "l8"}}]
+    )
+    assert set(cache._entries) == {"b"}
+
+    cache.invalidate("b")
+    assert cache._entries == {}
+
+    await cache.get_mapping(["a", "b"], loader)
+    cache.invalidate()
+    assert cache._entries == {}
+
+
+def test_queryables_cache_is_shared_between_database_instances():
+    from ..conftest import DatabaseLogic
+
+    assert DatabaseLogic().queryables_cache is DatabaseLogic().queryables_cache
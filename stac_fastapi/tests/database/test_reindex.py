@@ -0,0 +1,158 @@
+import asyncio
+
+import orjson
+import pytest
+
+from stac_fastapi.sfeos_helpers.search_engine import (
+    ReindexJob,
+    ReindexOrchestrator,
+    plan_reindex,
+)
+from stac_fastapi.sfeos_helpers.search_engine.reindex import next_index_name
+
+
+class ReindexClient:
+    """Client running reindex tasks that complete after a few polls."""
+
+    def __init__(self, aliases=None, polls=2, fail=()):
+        self.aliases = aliases or {}
+        self.polls = polls
+        self.fail = fail
+        self.indices = self
+        self.tasks = self
+        self.created = []
+        self.reindexed = []
+        self.alias_updates = []
+        self.running = 0
+        self.max_running = 0
+        self._tasks = {}
+
+    async def exists(self, index):
+        return index in self.created
+
+    async def create(self, index):
+        self.created.append(index)
+
+    async def get_alias(self, name):
+        prefix = name.rstrip("*")
+        return {
+            index: {"aliases": {alias: {} for alias in aliases}}
+            for index, aliases in self.aliases.items()
+            if (index.startswith(prefix) if name.endswith("*") else name in aliases)
+        }
+
+    async def update_aliases(self, body):
+        self.alias_updates.append(body["actions"])
+
+    async def reindex(self, body, wait_for_completion, slices, **params):
+        assert wait_for_completion is False
+        task = f"node:{len(self._tasks)}"
+        self._tasks[task] = [body["source"]["index"], 0]
+        self.reindexed.append((body, slices, params))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        return {"task": task}
+
+    async def get(self, task_id):
+        index, polls = self._tasks[task_id]
+        self._tasks[task_id][1] = polls = polls + 1
+        completed = polls > self.polls
+        if completed:
+            self.running -= 1
+        response = {
+            "completed": completed,
+            "task": {"status": {"total": 10, "created": min(10, 5 * polls)}},
+        }
+        if completed and index in self.fail:
+            response["error"] = {"type": "reindex_exception"}
+        return response
+
+
+def test_next_index_name():
+    assert next_index_name("collections-000001") == "collections-000002"
+    assert (
+        next_index_name("items_collection_74657374-000009")
+        == "items_collection_74657374-000010"
+    )
+    assert next_index_name("items_test_abc") == "items_test_abc-000002"
+
+
+@pytest.mark.asyncio
+async def test_reindex_runs_bounded_tasks_and_swaps_aliases_once():
+    client = ReindexClient(
+        {
+            "collections-000001": ["collections"],
+            **{f"items_c{n}-000001": [f"items_c{n}"] for n in range(5)},
+        }
+    )
+    jobs = await plan_reindex(client, "ctx.a = 1", "ctx.b = 2")
+    assert [job.script for job in jobs] == ["ctx.a = 1"] + ["ctx.b = 2"] * 5
+
+    orchestrator = ReindexOrchestrator(
+        client, workers=2, requests_per_second=500, poll_interval=0
+    )
+    assert await orchestrator.run(jobs)
+
+    assert client.max_running == 2
+    assert all(job.state == "reindexed" and job.done == 10 for job in jobs)
+    assert all(
+        slices == "auto" and params == {"requests_per_second": 500}
+        for _, slices, params in client.reindexed
+    )
+    assert len(client.alias_updates) == 1
+    assert {"add": {"index": "items_c3-000002", "alias": "items_c3"}} in (
+        client.alias_updates[0]
+    )
+    assert {"remove": {"index": "items_c3-000001", "alias": "items_c3"}} in (
+        client.alias_updates[0]
+    )
+
+
+@pytest.mark.asyncio
+async def test_reindex_failure_leaves_aliases(tmp_path):
+    client = ReindexClient(fail=("items_b-000001",))
+    jobs = [ReindexJob("items_a-000001", ["items_a"])]
+    jobs.append(ReindexJob("items_b-000001", ["items_b"]))
+    state_path = str(tmp_path / "state.json")
+    orchestrator = ReindexOrchestrator(client, poll_interval=0, state_path=state_path)
+
+    assert not await orchestrator.run(jobs)
+    assert client.alias_updates == []
+    assert [job.state for job in jobs] == ["reindexed", "failed"]
+
+    # The reindexed index is skipped when run again, the failed one is retried
+    client.fail = ()
+    jobs = [ReindexJob("items_a-000001", ["items_a"])]
+    jobs.append(ReindexJob("items_b-000001", ["items_b"]))
+    assert await orchestrator.run(jobs)
+    assert [body["source"]["index"] for body, _, _ in client.reindexed] == [
+        "items_a-000001",
+        "items_b-000001",
+        "items_b-000001",
+    ]
+    assert len(client.alias_updates) == 1
+
+
+@pytest.mark.asyncio
+async def test_reindex_resumes_running_task(tmp_path):
+    client = ReindexClient(polls=50)
+    state_path = str(tmp_path / "state.json")
+    orchestrator = ReindexOrchestrator(
+        client, poll_interval=0.001, state_path=state_path
+    )
+
+    run = asyncio.ensure_future(
+        orchestrator.run([ReindexJob("items_a-000001", ["items_a"])])
+    )
+    while not client.reindexed:
+        await asyncio.sleep(0.001)
+    await asyncio.sleep(0.01)
+    run.cancel()
+    with open(state_path, "rb") as file:
+        saved = orjson.loads(file.read())["jobs"][0]
+    assert saved["state"] == "running" and saved["task"] == "node:0"
+
+    # The task started by the interrupted run is waited for, not started again
+    assert await orchestrator.run([ReindexJob("items_a-000001", ["items_a"])])
+    assert len(client.reindexed) == 1
+    assert len(client.alias_updates) == 1
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.cache import RequestCoalescer, copy_json
+
+
+class SlowOperation:
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def run_concurrently(coalescer, operation, count, key="key"):
+    tasks = [
+        asyncio.ensure_future(coalescer.run("op", key, operation, copy=copy_json))
+        for _ in range(count)
+    ]
+    await asyncio.sleep(0)
+    operation.release.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_request_coalescer_shares_one_execution():
+    coalescer = RequestCoalescer(enabled=True)
+    operation = SlowOperation(result={"id": "a", "properties": {}})
+
+    results = await run_concurrently(coalescer, operation, 10)
+
+    assert operation.calls == 1
+    assert all(result == {"id": "a", "properties": {}} for result in results)
+    # Callers never share mutable results
+    assert len({id(result) for result in results}) == 10
+    assert coalescer.stats() == {
+        "op": {"calls": 10, "executions": 1, "coalesced": 9, "ratio": 0.9}
+    }
+
+    # Finished executions are not reused, and a lone caller gets a copy too, in
+    # case a later call joins the execution before it is forgotten
+    operation.release.clear()
+    (result,) = await run_concurrently(coalescer, operation, 1)
+    assert operation.calls == 2
+    assert result == operation.result and result is not operation.result
+
+
+@pytest.mark.asyncio
+async def test_request_coalescer_propagates_errors():
+    coalescer = RequestCoalescer(enabled=True)
+    operation = SlowOperation(error=ValueError("boom"))
+
+    results = await run_concurrently(coalescer, operation, 3)
+
+    assert operation.calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_request_coalescer_invalidate_and_disabled():
+    coalescer = RequestCoalescer(enabled=True)
+    operation = SlowOperation(result=1)
+
+    first = asyncio.ensure_future(coalescer.run("op", "key", operation))
+    await asyncio.sleep(0)
+    # A write happened, later reads must not join the read already in flight
+    coalescer.invalidate()
+    second = asyncio.ensure_future(coalescer.run("op", "key", operation))
+    await asyncio.sleep(0)
+    operation.release.set()
+    assert await asyncio.gather(first, second) == [1, 1]
+    assert operation.calls == 2
+
+    coalescer = RequestCoalescer(enabled=False)
+    operation = SlowOperation(result=1)
+    await run_concurrently(coalescer, operation, 3)
+    assert operation.calls == 3
+    assert coalescer.stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_request_coalescer_survives_cancelled_caller():
+    coalescer = RequestCoalescer(enabled=True)
+    operation = SlowOperation(result=1)
+
+    first = asyncio.ensure_future(coalescer.run("op", "key", operation))
+    second = asyncio.ensure_future(coalescer.run("op", "key", operation))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    operation.release.set()
+
+    assert await second == 1
+    assert first.cancelled()
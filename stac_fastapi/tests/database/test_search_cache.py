@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import uuid
+from copy import deepcopy
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.cache import (
+    InMemorySearchCacheBackend,
+    SearchResultCache,
+)
+
+from ..conftest import create_item, database
+
+
+def make_result(*ids):
+    return [{"id": item_id} for item_id in ids], len(ids), None
+
+
+@pytest.mark.asyncio
+async def test_search_cache_key_is_normalized():
+    key = SearchResultCache.make_key(
+        query={"bool": {"filter": [{"term": {"collection": "a"}}], "must": []}},
+        limit=10,
+    )
+    assert key == SearchResultCache.make_key(
+        limit=10,
+        query={"bool": {"must": [], "filter": [{"term": {"collection": "a"}}]}},
+    )
+    assert key != SearchResultCache.make_key(
+        query={"bool": {"filter": [{"term": {"collection": "a"}}], "must": []}},
+        limit=11,
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_cache_lru_and_ttl():
+    backend = InMemorySearchCacheBackend(max_entries=2)
+    cache = SearchResultCache(backend=backend, ttl_seconds=60, enabled=True)
+
+    for key in ("a", "b"):
+        await cache.set(key, make_result(key), ["c1"], cache.generation)
+    # Reading "a" makes "b" the least recently used entry
+    assert await cache.get("a") == make_result("a")
+    await cache.set("c", make_result("c"), ["c1"], cache.generation)
+
+    assert len(backend) == 2
+    assert await cache.get("b") is None
+    assert await cache.get("c") == make_result("c")
+
+    expires_at, value, tags = backend._entries["c"]
+    backend._entries["c"] = (expires_at - 61, value, tags)
+    assert await cache.get("c") is None
+    assert "c" not in backend._entries
+
+
+@pytest.mark.asyncio
+async def test_search_cache_invalidation_per_collection():
+    cache = SearchResultCache(ttl_seconds=60, enabled=True)
+    await cache.set("one", make_result("1"), ["c1"], cache.generation)
+    await cache.set("two", make_result("2"), ["c2"], cache.generation)
+    await cache.set("all", make_result("1", "2"), None, cache.generation)
+
+    await cache.invalidate_for_items([{"id": "3", "collection": "c1"}])
+    assert await cache.get("one") is None
+    assert await cache.get("all") is None
+    assert await cache.get("two") == make_result("2")
+
+    await cache.invalidate()
+    assert await cache.get("two") is None
+
+
+@pytest.mark.asyncio
+async def test_search_cache_skips_results_read_before_a_write():
+    cache = SearchResultCache(ttl_seconds=60, enabled=True)
+    generation = cache.generation
+    await cache.invalidate(["c1"])
+    await cache.set("one", make_result("1"), ["c1"], generation)
+    assert await cache.get("one") is None
+
+    # Synchronous invalidation from a thread without an event loop runs on the loop
+    # the cache is used from
+    threads = []
+    invalidate_tags = cache.backend.invalidate_tags
+
+    async def record_thread(tags):
+        threads.append(threading.get_ident())
+        await invalidate_tags(tags)
+
+    cache.backend.invalidate_tags = record_thread
+    await cache.set("one", make_result("1"), ["c1"], cache.generation)
+    await asyncio.get_running_loop().run_in_executor(
+        None, cache.invalidate_sync, ["c1"]
+    )
+    assert await cache.get("one") is None
+    assert threads == [threading.get_ident()]
+
+
+@pytest.mark.asyncio
+async def test_search_cache_disabled():
+    cache = SearchResultCache(ttl_seconds=60, enabled=False)
+    await cache.set("one", make_result("1"), ["c1"], cache.generation)
+    assert await cache.get("one") is None
+
+
+@pytest.mark.asyncio
+async def test_search_cache_invalidated_by_writes(
+    core_client, txn_client, ctx, monkeypatch
+):
+    from ..conftest import MockRequest
+
+    monkeypatch.setattr(
+        database, "search_cache", SearchResultCache(ttl_seconds=60, enabled=True)
+    )
+
+    async def search_ids():
+        search = database.make_search()
+        search = database.apply_collections_filter(search, [ctx.collection["id"]])
+        items, _, _ = await database.execute_search(
+            search=search,
+            limit=10,
+            token=None,
+            sort=None,
+            collection_ids=[ctx.collection["id"]],
+            datetime_search={"gte": None, "lte": None},
+        )
+        return {item["id"] for item in items}
+
+    assert await search_ids() == {ctx.item["id"]}
+    assert len(database.search_cache.backend) == 1
+
+    item = deepcopy(ctx.item)
+    item["id"] = str(uuid.uuid4())
+    await create_item(txn_client, item)
+    assert await search_ids() == {ctx.item["id"], item["id"]}
+
+    await txn_client.delete_item(item["id"], ctx.collection["id"], request=MockRequest)
+    assert await search_ids() == {ctx.item["id"]}
@@ -0,0 +1,70 @@
+import uuid
+from copy import deepcopy
+
+import pytest
+
+from ..conftest import create_item, refresh_indices
+
+
+@pytest.mark.asyncio
+async def test_batch_search_returns_results_in_order(app_client, txn_client, ctx):
+    item = deepcopy(ctx.item)
+    item["id"] = str(uuid.uuid4())
+    await create_item(txn_client, item)
+    await refresh_indices(txn_client)
+
+    resp = await app_client.post(
+        "/search/batch",
+        json={
+            "searches": [
+                {"ids": [item["id"]]},
+                {"ids": [ctx.item["id"]], "fields": {"include": ["id"]}},
+                {"collections": [ctx.collection["id"]], "limit": 1},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+
+    results = resp.json()["results"]
+    assert len(results) == 3
+    assert [feature["id"] for feature in results[0]["features"]] == [item["id"]]
+    assert [feature["id"] for feature in results[1]["features"]] == [ctx.item["id"]]
+    assert "properties" not in results[1]["features"][0]
+
+    assert results[2]["numberReturned"] == 1
+    next_link = next(link for link in results[2]["links"] if link["rel"] == "next")
+    assert next_link["method"] == "POST"
+    assert next_link["href"].endswith("/search")
+    assert next_link["body"]["collections"] == [ctx.collection["id"]]
+
+    resp = await app_client.post("/search", json=next_link["body"])
+    assert resp.status_code == 200
+    assert resp.json()["features"][0]["id"] != results[2]["features"][0]["id"]
+
+
+@pytest.mark.asyncio
+async def test_batch_search_reports_errors_per_search(app_client, ctx):
+    resp = await app_client.post(
+        "/search/batch",
+        json={
+            "searches": [
+                {"limit": "not-a-number"},
+                {"collections": ["batch-search-missing-collection"]},
+                {"ids": [ctx.item["id"]]},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+
+    invalid, missing, found = resp.json()["results"]
+    assert invalid["code"] == "ValidationError"
+    assert "description" in invalid
+    # Like `POST /search`, unknown collections match no items
+    assert missing["features"] == []
+    assert [feature["id"] for feature in found["features"]] == [ctx.item["id"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_search_too_many_searches(app_client):
+    resp = await app_client.post("/search/batch", json={"searches": [{}] * 101})
+    assert resp.status_code == 400
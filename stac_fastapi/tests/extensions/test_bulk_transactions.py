@@ -4,6 +4,7 @@ from copy import deepcopy
 
 import pytest
 from pydantic import ValidationError
+from stac_pydantic import api
 
 from stac_fastapi.extensions.third_party.bulk_transactions import Items
 from stac_fastapi.types.errors import ConflictError
@@ -43,8 +44,8 @@ async def test_bulk_item_insert_with_raise_on_error(
     Test bulk_item_insert behavior with RAISE_ON_BULK_ERROR set to true and false.
 
     This test verifies that when RAISE_ON_BULK_ERROR is set to true, a ConflictError
-    is raised for conflicting items. When set to false, the operation logs errors
-    and continues gracefully.
+    is raised for conflicting items. When set to false, conflicting items are reported
+    as errors and the operation continues gracefully.
     """
 
     # Insert an initial item to set up a conflict
@@ -73,13 +74,43 @@ async def test_bulk_item_insert_with_raise_on_error(
         Items(items=conflicting_items), refresh=True
     )
 
-    # Validate the results
+    # Validate the results, the existing item is not replaced
+    assert "Successfully added/updated 0 Items. 1 errors occurred." in result
+
+    # Upserts replace it
+    result = bulk_txn_client.bulk_item_insert(
+        Items(items=conflicting_items, method="upsert"), refresh=True
+    )
     assert "Successfully added/updated 1 Items" in result
 
     # Clean up the inserted item
     await txn_client.delete_item(initial_item["id"], ctx.item["collection"])
 
 
+@pytest.mark.asyncio
+async def test_async_bulk_item_insert(
+    ctx, core_client, txn_client, async_bulk_txn_client, monkeypatch
+):
+    items = {}
+    for _ in range(10):
+        _item = deepcopy(ctx.item)
+        _item["id"] = str(uuid.uuid4())
+        items[_item["id"]] = _item
+    items[ctx.item["id"]] = deepcopy(ctx.item)
+
+    # Not rejected with datetime index filtering, unlike the sync client
+    monkeypatch.setenv("ENABLE_DATETIME_INDEX_FILTERING", "true")
+    result = await async_bulk_txn_client.bulk_item_insert(
+        Items(items=items), chunk_size=3, refresh=True
+    )
+
+    # The existing item is reported, the other items are inserted
+    assert result.startswith("Successfully added/updated 10 Items. 1 errors occurred.")
+    assert f"{ctx.item['id']} (409" in result
+    fc = await core_client.item_collection(ctx.collection["id"], request=MockRequest())
+    assert len(fc["features"]) >= 11
+
+
 @pytest.mark.asyncio
 async def test_feature_collection_insert(
     core_client,
@@ -100,6 +131,30 @@ async def test_feature_collection_insert(
     assert len(fc["features"]) >= 10
 
 
+@pytest.mark.asyncio
+async def test_feature_collection_insert_reports_conflicts(
+    core_client,
+    txn_client,
+    ctx,
+):
+    features = []
+    for _ in range(3):
+        _item = deepcopy(ctx.item)
+        _item["id"] = str(uuid.uuid4())
+        features.append(_item)
+    features.append(deepcopy(ctx.item))
+
+    feature_collection = {"type": "FeatureCollection", "features": features}
+    result = await txn_client.create_item(
+        collection_id=ctx.collection["id"],
+        item=api.ItemCollection(**feature_collection),
+        request=MockRequest,
+        refresh=True,
+    )
+
+    assert result == "Successfully added 3 Items. 1 errors occurred."
+
+
 @pytest.mark.asyncio
 async def test_bulk_item_insert_validation_error(ctx, core_client, bulk_txn_client):
     items = {}
@@ -0,0 +1,85 @@
+import uuid
+from copy import deepcopy
+
+import orjson
+import pytest
+
+from stac_fastapi.core.extensions.export import (
+    GEOJSON_SEQ_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    RECORD_SEPARATOR,
+    encode_features,
+)
+
+from ..conftest import create_item, refresh_indices
+
+
+async def _features(count):
+    for i in range(count):
+        yield {"type": "Feature", "id": f"item-{i}"}
+
+
+@pytest.mark.asyncio
+async def test_encode_features_chunks_whole_lines():
+    chunks = [chunk async for chunk in encode_features(_features(100), chunk_size=256)]
+    assert len(chunks) > 1
+
+    lines = b"".join(chunks).splitlines()
+    assert [orjson.loads(line)["id"] for line in lines] == [
+        f"item-{i}" for i in range(100)
+    ]
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_encode_features_record_separator():
+    chunks = [
+        chunk
+        async for chunk in encode_features(
+            _features(3), record_separator=RECORD_SEPARATOR
+        )
+    ]
+    records = b"".join(chunks).split(RECORD_SEPARATOR)
+    assert records[0] == b""
+    assert [orjson.loads(record)["id"] for record in records[1:]] == [
+        "item-0",
+        "item-1",
+        "item-2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_search_streams_all_items(app_client, txn_client, ctx):
+    ids = {ctx.item["id"]}
+    for _ in range(5):
+        item = deepcopy(ctx.item)
+        item["id"] = str(uuid.uuid4())
+        await create_item(txn_client, item)
+        ids.add(item["id"])
+    await refresh_indices(txn_client)
+
+    resp = await app_client.post(
+        "/search/export",
+        json={"collections": [ctx.collection["id"]], "limit": 2},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith(NDJSON_MEDIA_TYPE)
+
+    features = [orjson.loads(line) for line in resp.content.splitlines()]
+    assert {feature["id"] for feature in features} == ids
+    assert all(feature["type"] == "Feature" for feature in features)
+
+
+@pytest.mark.asyncio
+async def test_export_search_geojson_seq(app_client, ctx):
+    resp = await app_client.post(
+        "/search/export",
+        json={"ids": [ctx.item["id"]], "fields": {"include": ["id"]}},
+        headers={"Accept": GEOJSON_SEQ_MEDIA_TYPE},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith(GEOJSON_SEQ_MEDIA_TYPE)
+    assert resp.content.startswith(RECORD_SEPARATOR)
+
+    feature = orjson.loads(resp.content[1:])
+    assert feature["id"] == ctx.item["id"]
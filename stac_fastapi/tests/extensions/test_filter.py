@@ -2,6 +2,7 @@ import json
 import logging
 import os
 import uuid
+from copy import deepcopy
 from os import listdir
 from os.path import isfile, join
 from typing import Callable, Dict
@@ -9,6 +10,8 @@ from typing import Callable, Dict
 import pytest
 from httpx import AsyncClient
 
+from ..conftest import create_item
+
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
@@ -674,3 +677,29 @@ async def test_queryables_enum_platform(
     # Clean up
     r = await app_client.delete(f"/collections/{collection_id}")
     r.raise_for_status()
+
+
+@pytest.mark.asyncio
+async def test_search_filter_on_new_property_after_cached_mapping(
+    app_client, txn_client, ctx
+):
+    """A property introduced by a new item is filterable once the item is indexed."""
+    collection_id = ctx.item["collection"]
+    _filter = {"op": "=", "args": [{"property": "new_property"}, "new-value"]}
+
+    resp = await app_client.post(
+        "/search", json={"collections": [collection_id], "filter": _filter}
+    )
+    assert resp.status_code == 200
+    assert len(resp.json()["features"]) == 0
+
+    item = deepcopy(ctx.item)
+    item["id"] = str(uuid.uuid4())
+    item["properties"]["new_property"] = "new-value"
+    await create_item(txn_client, item)
+
+    resp = await app_client.post(
+        "/search", json={"collections": [collection_id], "filter": _filter}
+    )
+    assert resp.status_code == 200
+    assert [feature["id"] for feature in resp.json()["features"]] == [item["id"]]
@@ -0,0 +1,169 @@
+import uuid
+from copy import deepcopy
+
+import orjson
+import pytest
+
+from stac_fastapi.core.core import AsyncBulkTransactionsClient
+from stac_fastapi.core.extensions.export import NDJSON_MEDIA_TYPE, RECORD_SEPARATOR
+from stac_fastapi.core.extensions.ingest import read_lines
+from stac_fastapi.core.serializers import ItemSerializer
+
+from ..conftest import MockRequest
+
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class ChunkingDatabase:
+    """Writes items in chunks of two, failing the items with a `conflict` id."""
+
+    def __init__(self, item_serializer=ItemSerializer):
+        self.item_serializer = item_serializer
+        self.written = []
+
+    async def check_collection_exists(self, collection_id):
+        pass
+
+    async def bulk_async(self, collection_id, processed_items, exist_ok, on_chunk):
+        chunk = []
+        async for item in processed_items:
+            chunk.append(item)
+            if len(chunk) == 2:
+                await self._write(chunk, on_chunk)
+                chunk = []
+        if chunk:
+            await self._write(chunk, on_chunk)
+
+    async def _write(self, chunk, on_chunk):
+        errors = [
+            {"create": {"_id": f"{item['id']}|test", "status": 409}}
+            for item in chunk
+            if item["id"] == "conflict"
+        ]
+        self.written.extend(item["id"] for item in chunk if item["id"] != "conflict")
+        await on_chunk(len(chunk) - len(errors), errors)
+
+
+def _feature(item_id, **fields):
+    return {"type": "Feature", "id": item_id, "properties": {}, **fields}
+
+
+@pytest.mark.asyncio
+async def test_read_lines_across_chunks():
+    lines = [
+        line
+        async for line in read_lines(
+            _stream(b'{"a": 1}\n{"b"', b": 2}\r\n\n", RECORD_SEPARATOR + b'{"c": 3}'),
+            max_line_bytes=100,
+        )
+    ]
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+    # Lines longer than the limit are dropped without being held
+    lines = [
+        line
+        async for line in read_lines(
+            _stream(b"x" * 6, b"x" * 6, b"\nshort\n", b"y" * 20), max_line_bytes=10
+        )
+    ]
+    assert lines == [(1, None), (2, b"short"), (3, None)]
+
+    # Including lines read whole within a chunk
+    lines = [
+        line
+        async for line in read_lines(
+            _stream(b"x" * 20 + b"\nshort\n" + b"y" * 20), max_line_bytes=10
+        )
+    ]
+    assert lines == [(1, None), (2, b"short"), (3, None)]
+
+
+@pytest.mark.asyncio
+async def test_stream_item_insert_reports_progress():
+    database = ChunkingDatabase()
+    client = AsyncBulkTransactionsClient(database=database, session=None, settings=None)
+    body = [
+        orjson.dumps(_feature("a")),
+        b"not json",
+        orjson.dumps(_feature("b", collection="test")),
+        orjson.dumps(_feature("c", collection="other")),
+        orjson.dumps(_feature("conflict")),
+        orjson.dumps(_feature("d")),
+    ]
+
+    records = await client.stream_item_insert(
+        "test", read_lines(_stream(b"\n".join(body)), max_line_bytes=1000)
+    )
+    records = [record async for record in records]
+
+    assert database.written == ["a", "b", "d"]
+    assert [(record["written"], record["failed"]) for record in records] == [
+        (2, 0),
+        (3, 1),
+        (3, 1),
+    ]
+    assert [line["line"] for line in records[0]["invalid_lines"]] == [2]
+    assert [line["line"] for line in records[1]["invalid_lines"]] == [4]
+    assert records[1]["errors"] == [{"id": "conflict", "status": 409, "reason": None}]
+    assert records[-1]["done"] and records[-1]["invalid"] == 2
+
+
+class BrokenItemSerializer(ItemSerializer):
+    """Fails to serialize the items with a `broken` id."""
+
+    @classmethod
+    def stac_to_db(cls, stac_data, base_url):
+        if stac_data["id"] == "broken":
+            raise KeyError("assets")
+        return super().stac_to_db(stac_data, base_url)
+
+
+@pytest.mark.asyncio
+async def test_stream_item_insert_uses_database_serializer():
+    database = ChunkingDatabase(BrokenItemSerializer)
+    client = AsyncBulkTransactionsClient(database=database, session=None, settings=None)
+    body = [orjson.dumps(_feature(item_id)) for item_id in ("a", "broken", "b")]
+
+    records = await client.stream_item_insert(
+        "test", read_lines(_stream(b"\n".join(body)), max_line_bytes=1000)
+    )
+    records = [record async for record in records]
+
+    assert database.written == ["a", "b"]
+    assert records[-1]["done"] and records[-1]["invalid"] == 1
+    assert [line["line"] for line in records[0]["invalid_lines"]] == [2]
+
+
+@pytest.mark.asyncio
+async def test_ingest_endpoint(app_client, ctx, core_client):
+    ids = [str(uuid.uuid4()) for _ in range(5)]
+    body = b""
+    for item_id in ids:
+        item = deepcopy(ctx.item)
+        item["id"] = item_id
+        body += orjson.dumps(item) + b"\n"
+
+    resp = await app_client.post(
+        f"/collections/{ctx.collection['id']}/ingest",
+        content=body,
+        headers={"content-type": NDJSON_MEDIA_TYPE},
+    )
+    assert resp.status_code == 200
+    summary = orjson.loads(resp.content.splitlines()[-1])
+    assert summary["done"] and summary["written"] == 5
+
+    for item_id in ids:
+        await core_client.get_item(item_id, ctx.collection["id"], request=MockRequest)
+
+    resp = await app_client.post(f"/collections/{ctx.collection['id']}/ingest", json=[])
+    assert resp.status_code == 415
+
+    resp = await app_client.post(
+        "/collections/missing/ingest",
+        content=body,
+        headers={"content-type": NDJSON_MEDIA_TYPE},
+    )
+    assert resp.status_code == 404
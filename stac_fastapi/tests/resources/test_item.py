@@ -14,7 +14,11 @@ from geojson_pydantic.geometries import Polygon
 from stac_pydantic import api
 
 from stac_fastapi.core.core import CoreClient
-from stac_fastapi.core.datetime_utils import datetime_to_str, now_to_rfc3339_str
+from stac_fastapi.core.datetime_utils import (
+    datetime_to_str,
+    now_to_rfc3339_str,
+    temporal_range,
+)
 from stac_fastapi.types.core import LandingPageMixin
 
 from ..conftest import create_collection, create_item, refresh_indices
@@ -687,6 +691,42 @@ async def test_pagination_links_behavior(app_client, ctx, txn_client):
     }, "Unexpected 'next' link on the last page"
 
 
+@pytest.mark.asyncio
+async def test_pagination_point_in_time(app_client, ctx, txn_client, monkeypatch):
+    """Test that point in time pagination returns a consistent snapshot"""
+    monkeypatch.setenv("ENABLE_PIT_PAGINATION", "true")
+    ids = {ctx.item["id"]}
+
+    for _ in range(3):
+        item = deepcopy(ctx.item)
+        item["id"] = str(uuid.uuid4())
+        await create_item(txn_client, item=item)
+        ids.add(item["id"])
+
+    page = await app_client.post(
+        "/search", json={"collections": [ctx.item["collection"]], "limit": 1}
+    )
+    assert page.status_code == 200
+    page_data = page.json()
+    seen = [feature["id"] for feature in page_data["features"]]
+
+    # Items created after the first page are not part of the snapshot
+    late_item = deepcopy(ctx.item)
+    late_item["id"] = str(uuid.uuid4())
+    await create_item(txn_client, item=late_item)
+
+    while next_link := next(
+        (link for link in page_data["links"] if link["rel"] == "next"), None
+    ):
+        page = await app_client.post(next_link["href"], json=next_link["body"])
+        assert page.status_code == 200
+        page_data = page.json()
+        seen.extend(feature["id"] for feature in page_data["features"])
+
+    assert len(seen) == len(ids)
+    assert set(seen) == ids
+
+
 @pytest.mark.asyncio
 async def test_pagination_item_collection(app_client, ctx, txn_client):
     """Test item collection pagination links (paging extension)"""
@@ -1163,3 +1203,27 @@ async def test_search_datetime_with_null_datetime(
         await txn_client.delete_collection(test_collection["id"])
     except Exception as e:
         logger.warning(f"Failed to delete collection: {e}")
+
+
+def test_temporal_range():
+    assert temporal_range({"datetime": "2020-01-01T00:00:00Z"}) == {
+        "gte": "2020-01-01T00:00:00Z",
+        "lte": "2020-01-01T00:00:00Z",
+    }
+    assert temporal_range(
+        {
+            "datetime": None,
+            "start_datetime": "2020-01-01T00:00:00Z",
+            "end_datetime": "2020-02-01T00:00:00Z",
+        }
+    ) == {"gte": "2020-01-01T00:00:00Z", "lte": "2020-02-01T00:00:00Z"}
+    assert temporal_range({"start_datetime": "2020-01-01T00:00:00Z"}) is None
+    assert (
+        temporal_range(
+            {
+                "start_datetime": "2020-02-01T00:00:00Z",
+                "end_datetime": "2020-01-01T00:00:00Z",
+            }
+        )
+        is None
+    )